@@ -0,0 +1,139 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The file entry classifier."""
+
+import logging
+import os
+
+
+class FileEntryClassifier(object):
+  """Class that classifies file entries based on parser format signatures.
+
+  The classifier reads the header and footer data of a file once and
+  matches it against the format signatures of the parsers. Only parsers
+  of which a format signature matches and parsers that do not define format
+  signatures are applied to the file.
+  """
+
+  def __init__(self, parser_objects, format_signatures):
+    """Initializes the file entry classifier.
+
+    Args:
+      parser_objects: a list of parser objects (instances of BaseParser).
+      format_signatures: a dictionary containing the format signatures
+                         (list of instances of FormatSignature) per parser
+                         name, as returned by ParsersManager.
+    """
+    super(FileEntryClassifier, self).__init__()
+    self._footer_size = 0
+    self._header_size = 0
+    self._parser_objects = []
+
+    for parser_object in parser_objects:
+      parser_format_signatures = format_signatures.get(
+          parser_object.NAME.lower(), None)
+      self._parser_objects.append((parser_object, parser_format_signatures))
+
+      for format_signature in parser_format_signatures or []:
+        if format_signature.offset < 0:
+          self._footer_size = max(
+              self._footer_size, -format_signature.offset)
+        else:
+          self._header_size = max(
+              self._header_size,
+              format_signature.offset + len(format_signature.pattern))
+
+    self.number_of_classified_files = 0
+    self.number_of_dispatched_parsers = 0
+    self.number_of_skipped_parsers = 0
+
+  def _ReadFileData(self, file_entry):
+    """Reads the header and footer data of a file entry.
+
+    Args:
+      file_entry: a file entry object (instance of dfvfs.FileEntry).
+
+    Returns:
+      A tuple containing the header and footer data (binary strings).
+
+    Raises:
+      IOError: if the file data cannot be read.
+    """
+    file_object = file_entry.GetFileObject()
+    if not file_object:
+      raise IOError(u'Unable to open file entry.')
+
+    try:
+      header_data = b''
+      if self._header_size:
+        file_object.seek(0, os.SEEK_SET)
+        header_data = file_object.read(self._header_size)
+
+      footer_data = b''
+      if self._footer_size:
+        file_size = file_object.get_size()
+        footer_offset = max(0, file_size - self._footer_size)
+        file_object.seek(footer_offset, os.SEEK_SET)
+        footer_data = file_object.read(self._footer_size)
+
+    finally:
+      file_object.close()
+
+    return header_data, footer_data
+
+  def Classify(self, file_entry):
+    """Determines the parsers to apply to a file entry.
+
+    Args:
+      file_entry: a file entry object (instance of dfvfs.FileEntry).
+
+    Returns:
+      A list of parser objects (instances of BaseParser) in the order they
+      were passed to the classifier.
+    """
+    try:
+      header_data, footer_data = self._ReadFileData(file_entry)
+    except IOError as exception:
+      logging.debug(
+          u'Unable to read signature data of: {0:s} with error: {1:s}'.format(
+              file_entry.name, exception))
+      return [parser_object for parser_object, _ in self._parser_objects]
+
+    parser_objects = []
+    for parser_object, parser_format_signatures in self._parser_objects:
+      if parser_format_signatures is None:
+        parser_objects.append(parser_object)
+        continue
+
+      for format_signature in parser_format_signatures:
+        if format_signature.Matches(header_data, footer_data):
+          parser_objects.append(parser_object)
+          break
+
+    number_of_skipped_parsers = len(self._parser_objects) - len(parser_objects)
+
+    self.number_of_classified_files += 1
+    self.number_of_dispatched_parsers += len(parser_objects)
+    self.number_of_skipped_parsers += number_of_skipped_parsers
+
+    logging.debug((
+        u'[Classify] file: {0:s} dispatched to {1:d} parsers, skipped '
+        u'{2:d} parsers.').format(
+            file_entry.name, len(parser_objects), number_of_skipped_parsers))
+
+    return parser_objects
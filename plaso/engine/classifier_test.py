@@ -0,0 +1,83 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests the file entry classifier."""
+
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso import parsers   # pylint: disable=unused-import
+from plaso.engine import classifier
+from plaso.engine import test_lib
+from plaso.parsers import manager as parsers_manager
+
+
+class FileEntryClassifierTest(test_lib.EngineTestCase):
+  """Tests for the file entry classifier object."""
+
+  def _Classify(self, file_entry_classifier, filename):
+    """Classifies a test file.
+
+    Args:
+      file_entry_classifier: the file entry classifier object (instance of
+                             FileEntryClassifier).
+      filename: the name of the file in the test data directory.
+
+    Returns:
+      A sorted list of the names of the parsers the file was dispatched to.
+    """
+    source_path = self._GetTestFilePath([filename])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    parser_objects = file_entry_classifier.Classify(file_entry)
+    return sorted([parser_object.NAME for parser_object in parser_objects])
+
+  def testClassify(self):
+    """Tests the Classify function."""
+    parser_filter_string = u'olecf,syslog,winevtx,winreg'
+    parser_objects = parsers_manager.ParsersManager.GetParserObjects(
+        parser_filter_string=parser_filter_string)
+    format_signatures = parsers_manager.ParsersManager.GetFormatSignatures(
+        parser_filter_string=parser_filter_string)
+
+    self.assertEquals(
+        sorted(format_signatures.keys()), [u'olecf', u'winevtx', u'winreg'])
+
+    file_entry_classifier = classifier.FileEntryClassifier(
+        parser_objects, format_signatures)
+
+    self.assertEquals(
+        self._Classify(file_entry_classifier, 'NTUSER.DAT'),
+        [u'syslog', u'winreg'])
+    self.assertEquals(
+        self._Classify(file_entry_classifier, 'Document.doc'),
+        [u'olecf', u'syslog'])
+    self.assertEquals(
+        self._Classify(file_entry_classifier, 'syslog'), [u'syslog'])
+
+    self.assertEquals(file_entry_classifier.number_of_classified_files, 3)
+    self.assertEquals(file_entry_classifier.number_of_dispatched_parsers, 5)
+    self.assertEquals(file_entry_classifier.number_of_skipped_parsers, 7)
+
+
+if __name__ == '__main__':
+  unittest.main()
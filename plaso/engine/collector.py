@@ -17,23 +17,163 @@
 # limitations under the License.
 """Generic collector that supports both file system and image files."""
 
-import hashlib
 import logging
 import os
+import Queue
+import threading
 
 from dfvfs.helpers import file_system_searcher
 from dfvfs.lib import definitions as dfvfs_definitions
 from dfvfs.lib import errors as dfvfs_errors
 from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import context
 from dfvfs.resolver import resolver as path_spec_resolver
 
+from plaso.engine import file_hashes
 from plaso.engine import queue
 from plaso.lib import errors
 
 
+class CollectionThreadQueue(queue.Queue):
+  """Class that implements the queue of the collection threads.
+
+     The queue is bounded so that a collection thread blocks when the
+     collector has not yet produced the previously collected path
+     specifications. The waiting threads are woken up in order, which
+     interleaves their path specifications on the process queue.
+  """
+
+  def __init__(self, maximum_number_of_queued_items):
+    """Initializes the queue.
+
+    Args:
+      maximum_number_of_queued_items: the maximum number of queued items.
+    """
+    super(CollectionThreadQueue, self).__init__()
+    self._queue = Queue.Queue(maxsize=maximum_number_of_queued_items)
+
+  def __len__(self):
+    """Returns the estimated current number of items in the queue."""
+    return self._queue.qsize()
+
+  def IsEmpty(self):
+    """Determines if the queue is empty."""
+    return self._queue.empty()
+
+  def PushItem(self, item):
+    """Pushes an item onto the queue, blocks while the queue is full."""
+    self._queue.put(item)
+
+  def PopItem(self):
+    """Pops an item off the queue, blocks while the queue is empty."""
+    return self._queue.get()
+
+
+class CollectionThread(threading.Thread):
+  """Class that implements a collection thread.
+
+     The collection thread collects the file entries of the directories
+     (tasks) on the task queue, with its own resolver context. The top-level
+     directories of a file system are added to the task queue as separate
+     tasks.
+  """
+
+  def __init__(self, task_queue, fs_collector, **kwargs):
+    """Initializes the collection thread.
+
+    Args:
+      task_queue: the task queue (instance of Queue.Queue) that contains
+                  tuples of the path specification (instance of
+                  dfvfs.PathSpec) of the directory, the list of find
+                  specifications (instances of dfvfs.FindSpec) or None and
+                  a boolean value to indicate the directory is the root of
+                  the file system.
+      fs_collector: the file system collector (instance of
+                    FileSystemCollector) of the thread.
+      kwargs: keyword arguments to pass to threading.Thread.
+    """
+    super(CollectionThread, self).__init__(**kwargs)
+    self._fs_collector = fs_collector
+    self._resolver_context = context.Context()
+    self._task_queue = task_queue
+
+  @property
+  def number_of_file_entries(self):
+    """The number of file entries collected by the thread."""
+    return self._fs_collector.number_of_file_entries
+
+  def _ProcessTask(self, path_spec, find_specs, is_root):
+    """Processes a task.
+
+    Args:
+      path_spec: the path specification (instance of dfvfs.PathSpec) of
+                 the directory.
+      find_specs: the list of find specifications (instances of
+                  dfvfs.FindSpec) or None.
+      is_root: boolean value to indicate the directory is the root of the
+               file system.
+    """
+    file_system = path_spec_resolver.Resolver.OpenFileSystem(
+        path_spec, resolver_context=self._resolver_context)
+
+    if find_specs:
+      self._fs_collector.Collect(file_system, path_spec, find_specs=find_specs)
+      return
+
+    file_entry = file_system.GetFileEntryByPathSpec(path_spec)
+
+    # pylint: disable=protected-access
+    try:
+      if not is_root:
+        self._fs_collector._ProcessDirectory(file_entry)
+        return
+
+      sub_directories = self._fs_collector._ProcessSubFileEntries(file_entry)
+
+    finally:
+      self._fs_collector.Flush()
+
+    for sub_file_entry in sub_directories:
+      self._task_queue.put((sub_file_entry.path_spec, None, False))
+
+  # This method part of the threading.Thread interface hence its name does
+  # not follow the style guide.
+  def run(self):
+    """The main loop of the collection thread."""
+    while True:
+      task = self._task_queue.get()
+      if task is None:
+        break
+
+      try:
+        self._ProcessTask(*task)
+      except (IOError, dfvfs_errors.AccessError,
+              dfvfs_errors.BackEndError) as exception:
+        logging.warning(u'{0:s}'.format(exception))
+
+      # Casting a wide net, catching all exceptions. Done to keep the thread
+      # running, otherwise the remaining tasks would never be processed.
+      except Exception as exception:
+        logging.warning(
+            u'Unable to collect from: {0:s} with error: {1:s}'.format(
+                task[0].comparable, exception))
+        logging.exception(exception)
+
+      finally:
+        self._task_queue.task_done()
+
+  def SignalAbort(self):
+    """Signals the collection thread to abort."""
+    self._fs_collector.SignalAbort()
+
+
 class Collector(queue.ItemQueueProducer):
   """Class that implements a collector object."""
 
+  # The maximum number of path specifications the collection threads
+  # can collect ahead of the collector.
+  _MAXIMUM_NUMBER_OF_QUEUED_PATH_SPECS = 64
+
   def __init__(
       self, process_queue, source_path, source_path_spec,
       resolver_context=None):
@@ -54,8 +194,11 @@ class Collector(queue.ItemQueueProducer):
                         The default is None.
     """
     super(Collector, self).__init__(process_queue)
+    self._collection_threads = []
+    self._file_hashes = None
     self._filter_find_specs = None
     self._fs_collector = FileSystemCollector(process_queue)
+    self._number_of_collection_threads = 0
     self._resolver_context = resolver_context
     # TODO: remove the need to pass source_path
     self._source_path = os.path.abspath(source_path)
@@ -70,6 +213,88 @@ class Collector(queue.ItemQueueProducer):
     """Exits a with statement."""
     return
 
+  def _CollectInThreads(self, path_specs, find_specs=None):
+    """Collects files from file systems in multiple collection threads.
+
+       The path specifications collected by the threads are produced onto
+       the process queue by the collector, in the order the threads collected
+       them.
+
+    Args:
+      path_specs: a list of the path specifications (instances of
+                  dfvfs.PathSpec) of the roots of the file systems.
+      find_specs: Optional list of find specifications (instances of
+                  dfvfs.FindSpec). The default is None.
+    """
+    collection_thread_queue = CollectionThreadQueue(
+        self._MAXIMUM_NUMBER_OF_QUEUED_PATH_SPECS)
+    file_hashes_lock = threading.Lock()
+    task_queue = Queue.Queue()
+
+    for path_spec in path_specs:
+      task_queue.put((path_spec, find_specs, True))
+
+    self._collection_threads = []
+    for thread_number in range(self._number_of_collection_threads):
+      fs_collector = self._fs_collector.CreateSharedCollector(
+          collection_thread_queue, file_hashes_lock)
+      collection_thread = CollectionThread(
+          task_queue, fs_collector,
+          name=u'CollectionThread{0:d}'.format(thread_number))
+      collection_thread.daemon = True
+      collection_thread.start()
+      self._collection_threads.append(collection_thread)
+
+    def _SignalEndOfCollection():
+      """Pushes the end of input marker once all tasks are processed."""
+      task_queue.join()
+      collection_thread_queue.PushItem(queue.QueueEndOfInput())
+
+    end_of_collection_thread = threading.Thread(target=_SignalEndOfCollection)
+    end_of_collection_thread.daemon = True
+    end_of_collection_thread.start()
+
+    while True:
+      item = collection_thread_queue.PopItem()
+      if isinstance(item, queue.QueueEndOfInput):
+        break
+
+      # The queue is drained after an abort so that the collection threads
+      # are not blocked.
+      if not self._abort:
+        self.ProduceItem(item)
+
+    for _ in self._collection_threads:
+      task_queue.put(None)
+
+    for collection_thread in self._collection_threads:
+      collection_thread.join()
+
+    self._fs_collector.number_of_file_entries += sum([
+        collection_thread.number_of_file_entries
+        for collection_thread in self._collection_threads])
+    self._collection_threads = []
+
+  def _GetVSSPathSpec(self, volume_path_spec, store_index):
+    """Retrieves the path specification of the file system in a VSS store.
+
+    Args:
+      volume_path_spec: The path specification of the volume containing
+                        the file system.
+      store_index: The index of the VSS store, where 0 represents the first
+                   store.
+
+    Returns:
+      The path specification (instance of dfvfs.PathSpec) of the root of
+      the file system.
+    """
+    vss_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_VSHADOW, store_index=store_index,
+        parent=volume_path_spec)
+    return path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=vss_path_spec)
+
   def _ProcessImage(self, volume_path_spec, find_specs=None):
     """Processes a volume within a storage media image.
 
@@ -90,6 +315,28 @@ class Collector(queue.ItemQueueProducer):
         dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
         parent=volume_path_spec)
 
+    if self._number_of_collection_threads > 1:
+      # The file system of the volume and of every VSS store are collected
+      # one after the other, so that the duplicate file check attributes
+      # a file to the volume or the earliest VSS store it is found in, as
+      # it does without collection threads.
+      self._CollectInThreads([path_spec], find_specs=find_specs)
+
+      if self._vss_stores:
+        logging.info(u'Processing VSS.')
+
+        # In plaso 1 represents the first store index in dfvfs and pyvshadow 0
+        # represents the first store index so 1 is subtracted.
+        for store_nr in self._vss_stores:
+          if self._abort:
+            return
+
+          vss_path_spec = self._GetVSSPathSpec(volume_path_spec, store_nr - 1)
+          self._CollectInThreads([vss_path_spec], find_specs=find_specs)
+
+      logging.debug(u'Collection from image in threads COMPLETED.')
+      return
+
     try:
       file_system = path_spec_resolver.Resolver.OpenFileSystem(
           path_spec, resolver_context=self._resolver_context)
@@ -157,12 +404,7 @@ class Collector(queue.ItemQueueProducer):
         logging.info(u'Collecting from VSS volume: {0:d} out of: {1:d}'.format(
             store_index + 1, number_of_vss))
 
-      vss_path_spec = path_spec_factory.Factory.NewPathSpec(
-          dfvfs_definitions.TYPE_INDICATOR_VSHADOW, store_index=store_index,
-          parent=volume_path_spec)
-      path_spec = path_spec_factory.Factory.NewPathSpec(
-          dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
-          parent=vss_path_spec)
+      path_spec = self._GetVSSPathSpec(volume_path_spec, store_index)
 
       file_system = path_spec_resolver.Resolver.OpenFileSystem(
           path_spec, resolver_context=self._resolver_context)
@@ -212,6 +454,10 @@ class Collector(queue.ItemQueueProducer):
       if source_file_entry.IsFile():
         self.ProduceItem(self._source_path_spec)
 
+      elif self._number_of_collection_threads > 1:
+        self._CollectInThreads(
+            [self._source_path_spec], find_specs=self._filter_find_specs)
+
       else:
         file_system = path_spec_resolver.Resolver.OpenFileSystem(
             self._source_path_spec, resolver_context=self._resolver_context)
@@ -228,6 +474,9 @@ class Collector(queue.ItemQueueProducer):
       self._ProcessImage(
           self._source_path_spec.parent, find_specs=self._filter_find_specs)
 
+    if self._file_hashes is not None:
+      self._file_hashes.Close()
+
     self.SignalEndOfInput()
 
   def SetCollectDirectoryMetadata(self, collect_directory_metadata):
@@ -239,6 +488,56 @@ class Collector(queue.ItemQueueProducer):
     """
     self._fs_collector.SetCollectDirectoryMetadata(collect_directory_metadata)
 
+  def SetCollectInInodeOrder(self, collect_in_inode_order):
+    """Sets the collect in inode order flag.
+
+       In inode order collection the path specifications of the file
+       entries of TSK file systems are produced in batches sorted by inode
+       number instead of in directory order.
+
+    Args:
+      collect_in_inode_order: Boolean value to indicate to collect the file
+                              entries of TSK file systems in inode order.
+    """
+    self._fs_collector.SetCollectInInodeOrder(collect_in_inode_order)
+
+  def SetDuplicateFileCheck(self, duplicate_file_check, file_hashes_path=None):
+    """Sets the duplicate file check.
+
+       The duplicate file check skips files with the same inode and
+       timestamps as a previously collected file, e.g. the same file in
+       multiple VSS stores.
+
+    Args:
+      duplicate_file_check: Boolean value to indicate to enable the duplicate
+                            file check.
+      file_hashes_path: Optional path of the database file that stores the
+                        file hashes. If the database file exists, files
+                        collected by previous runs are skipped. The default
+                        is None, which represents the hashes are kept in
+                        memory.
+    """
+    if duplicate_file_check:
+      self._file_hashes = file_hashes.FileHashSet(path=file_hashes_path)
+    else:
+      self._file_hashes = None
+
+    self._fs_collector.SetDuplicateFileCheck(self._file_hashes)
+
+  def SetFileEntryFingerprints(self, fingerprints, parser_names):
+    """Sets the file entry fingerprints of a previous run.
+
+       File entries of which the fingerprint is in the set are unchanged
+       since the previous run and are not collected.
+
+    Args:
+      fingerprints: The set of fingerprints of the file entries extracted
+                    by previous runs or None to collect all file entries.
+      parser_names: A list of the names of the parsers the file entries are
+                    extracted with.
+    """
+    self._fs_collector.SetFileEntryFingerprints(fingerprints, parser_names)
+
   def SetFilter(self, filter_find_specs):
     """Sets the collection filter find specifications.
 
@@ -248,6 +547,18 @@ class Collector(queue.ItemQueueProducer):
     """
     self._filter_find_specs = filter_find_specs
 
+  def SetNumberOfCollectionThreads(self, number_of_collection_threads):
+    """Sets the number of collection threads.
+
+       More than 1 collection thread enables collection of the file
+       systems of the volume and VSS stores, and of their top-level
+       directories, in parallel.
+
+    Args:
+      number_of_collection_threads: The number of collection threads.
+    """
+    self._number_of_collection_threads = number_of_collection_threads
+
   def SetVssInformation(self, vss_stores):
     """Sets the Volume Shadow Snapshots (VSS) information.
 
@@ -264,10 +575,17 @@ class Collector(queue.ItemQueueProducer):
     super(Collector, self).SignalAbort()
     self._fs_collector.SignalAbort()
 
+    for collection_thread in self._collection_threads:
+      collection_thread.SignalAbort()
+
 
 class FileSystemCollector(queue.ItemQueueProducer):
   """Class that implements a file system collector object."""
 
+  # The maximum number of path specifications that are buffered in inode
+  # order collection.
+  _MAXIMUM_NUMBER_OF_BUFFERED_PATH_SPECS = 10000
+
   def __init__(self, process_queue):
     """Initializes the collector object.
 
@@ -281,8 +599,12 @@ class FileSystemCollector(queue.ItemQueueProducer):
     """
     super(FileSystemCollector, self).__init__(process_queue)
     self._collect_directory_metadata = True
-    self._duplicate_file_check = False
-    self._hashlist = {}
+    self._collect_in_inode_order = False
+    self._file_hashes = None
+    self._file_hashes_lock = None
+    self._fingerprints = None
+    self._parser_names = None
+    self._path_specs = []
 
     self.number_of_file_entries = 0
 
@@ -294,46 +616,100 @@ class FileSystemCollector(queue.ItemQueueProducer):
     """Exits a with statement."""
     return
 
-  def _CalculateNTFSTimeHash(self, file_entry):
-    """Return a hash value calculated from a NTFS file's metadata.
+  def _IsDuplicateFile(self, file_entry):
+    """Determines if a file was previously collected, e.g. from another VSS.
 
     Args:
       file_entry: The file entry (instance of TSKFileEntry).
 
     Returns:
-      A hash value (string) that can be used to determine if a file's timestamp
-    value has changed.
+      A boolean value indicating the file has the same inode and timestamps
+      as a previously collected file. A file entry without an inode is never
+      considered a duplicate.
     """
-    stat_object = file_entry.GetStat()
-    ret_hash = hashlib.md5()
+    hash_value = file_hashes.CalculateFileEntryHash(file_entry)
+    if hash_value is None:
+      return False
 
-    ret_hash.update('atime:{0:d}.{1:d}'.format(
-        getattr(stat_object, 'atime', 0),
-        getattr(stat_object, 'atime_nano', 0)))
+    if self._file_hashes_lock:
+      self._file_hashes_lock.acquire()
 
-    ret_hash.update('crtime:{0:d}.{1:d}'.format(
-        getattr(stat_object, 'crtime', 0),
-        getattr(stat_object, 'crtime_nano', 0)))
+    try:
+      return not self._file_hashes.Add(hash_value)
 
-    ret_hash.update('mtime:{0:d}.{1:d}'.format(
-        getattr(stat_object, 'mtime', 0),
-        getattr(stat_object, 'mtime_nano', 0)))
+    finally:
+      if self._file_hashes_lock:
+        self._file_hashes_lock.release()
 
-    ret_hash.update('ctime:{0:d}.{1:d}'.format(
-        getattr(stat_object, 'ctime', 0),
-        getattr(stat_object, 'ctime_nano', 0)))
+  def _IsUnchangedFileEntry(self, file_entry):
+    """Determines if a file entry is unchanged since a previous run.
+
+    Args:
+      file_entry: The file entry (instance of dfvfs.FileEntry).
 
-    return ret_hash.hexdigest()
+    Returns:
+      A boolean value indicating the fingerprint of the file entry is in
+      the set of fingerprints of the previous run.
+    """
+    fingerprint = file_hashes.CalculateFileEntryFingerprint(
+        file_entry, self._parser_names)
+    return fingerprint in self._fingerprints
 
   def _ProcessDirectory(self, file_entry):
     """Processes a directory and extract its metadata if necessary."""
     # Need to do a breadth-first search otherwise we'll hit the Python
     # maximum recursion depth.
+    sub_directories = self._ProcessSubFileEntries(file_entry)
+
+    for sub_file_entry in sub_directories:
+      if self._abort:
+        return
+
+      try:
+        self._ProcessDirectory(sub_file_entry)
+      except (dfvfs_errors.AccessError, dfvfs_errors.BackEndError) as exception:
+        logging.warning(u'{0:s}'.format(exception))
+
+  def _ProducePathSpec(self, file_entry):
+    """Produces the path specification of a file entry.
+
+       In inode order collection the path specifications of TSK file entries
+       are buffered and produced by Flush.
+
+    Args:
+      file_entry: The file entry (instance of dfvfs.FileEntry).
+    """
+    if self._fingerprints is not None and self._IsUnchangedFileEntry(
+        file_entry):
+      return
+
+    self.number_of_file_entries += 1
+
+    if (not self._collect_in_inode_order or
+        file_entry.type_indicator != dfvfs_definitions.TYPE_INDICATOR_TSK):
+      self.ProduceItem(file_entry.path_spec)
+      return
+
+    self._path_specs.append(file_entry.path_spec)
+    if len(self._path_specs) >= self._MAXIMUM_NUMBER_OF_BUFFERED_PATH_SPECS:
+      self.Flush()
+
+  def _ProcessSubFileEntries(self, file_entry):
+    """Processes the sub file entries of a directory.
+
+    Args:
+      file_entry: The file entry (instance of dfvfs.FileEntry) of the
+                  directory.
+
+    Returns:
+      A list of the file entries (instances of dfvfs.FileEntry) of the
+      sub directories.
+    """
     sub_directories = []
 
     for sub_file_entry in file_entry.sub_file_entries:
       if self._abort:
-        return
+        return []
 
       try:
         if not sub_file_entry.IsAllocated() or sub_file_entry.IsLink():
@@ -355,8 +731,7 @@ class FileSystemCollector(queue.ItemQueueProducer):
         # This check is here to improve performance by not producing
         # path specifications that don't get processed.
         if self._collect_directory_metadata:
-          self.ProduceItem(sub_file_entry.path_spec)
-          self.number_of_file_entries += 1
+          self._ProducePathSpec(sub_file_entry)
 
         sub_directories.append(sub_file_entry)
 
@@ -365,27 +740,13 @@ class FileSystemCollector(queue.ItemQueueProducer):
         # value based on available timestamps and compare that to previously
         # calculated hash values, and only include the file into the queue if
         # the hash does not match.
-        if self._duplicate_file_check:
-          hash_value = self._CalculateNTFSTimeHash(sub_file_entry)
-
-          inode = getattr(sub_file_entry.path_spec, 'inode', 0)
-          if inode in self._hashlist:
-            if hash_value in self._hashlist[inode]:
-              continue
-
-          self._hashlist.setdefault(inode, []).append(hash_value)
-
-        self.ProduceItem(sub_file_entry.path_spec)
-        self.number_of_file_entries += 1
+        if self._file_hashes is not None and self._IsDuplicateFile(
+            sub_file_entry):
+          continue
 
-    for sub_file_entry in sub_directories:
-      if self._abort:
-        return
+        self._ProducePathSpec(sub_file_entry)
 
-      try:
-        self._ProcessDirectory(sub_file_entry)
-      except (dfvfs_errors.AccessError, dfvfs_errors.BackEndError) as exception:
-        logging.warning(u'{0:s}'.format(exception))
+    return sub_directories
 
   def Collect(self, file_system, path_spec, find_specs=None):
     """Collects files from the file system.
@@ -403,13 +764,66 @@ class FileSystemCollector(queue.ItemQueueProducer):
         if self._abort:
           return
 
+        if self._fingerprints is not None:
+          file_entry = file_system.GetFileEntryByPathSpec(path_spec)
+          if file_entry and self._IsUnchangedFileEntry(file_entry):
+            continue
+
         self.ProduceItem(path_spec)
         self.number_of_file_entries += 1
 
     else:
       file_entry = file_system.GetFileEntryByPathSpec(path_spec)
 
-      self._ProcessDirectory(file_entry)
+      # The path specifications buffered so far are also produced if the
+      # file system cannot be fully read, e.g. due to a dfvfs back-end error.
+      try:
+        self._ProcessDirectory(file_entry)
+      finally:
+        self.Flush()
+
+  def CreateSharedCollector(self, process_queue, file_hashes_lock):
+    """Creates a file system collector that shares the duplicate file check.
+
+    Args:
+      process_queue: The process queue (instance of Queue) of the new
+                     collector.
+      file_hashes_lock: The lock (instance of threading.Lock) that protects
+                        the file hash set of the duplicate file check.
+
+    Returns:
+      A file system collector (instance of FileSystemCollector) with the same
+      settings, that shares the file hash set of the duplicate file check.
+    """
+    self._file_hashes_lock = file_hashes_lock
+
+    fs_collector = FileSystemCollector(process_queue)
+    fs_collector.SetCollectDirectoryMetadata(self._collect_directory_metadata)
+    fs_collector.SetCollectInInodeOrder(self._collect_in_inode_order)
+    fs_collector.SetDuplicateFileCheck(self._file_hashes)
+    fs_collector.SetFileEntryFingerprints(
+        self._fingerprints, self._parser_names)
+    # pylint: disable=protected-access
+    fs_collector._file_hashes_lock = file_hashes_lock
+    return fs_collector
+
+  def Flush(self):
+    """Flushes the buffered path specifications onto the queue.
+
+       The path specifications are sorted by inode number, which for NTFS
+       is the index of the MFT entry. This makes the workers read the
+       metadata and, for files created around the same time, the data of
+       the file system in roughly sequential order.
+    """
+    path_specs = self._path_specs
+    self._path_specs = []
+
+    path_specs.sort(key=lambda path_spec: getattr(path_spec, 'inode', None))
+    for path_spec in path_specs:
+      if self._abort:
+        break
+
+      self.ProduceItem(path_spec)
 
   def SetCollectDirectoryMetadata(self, collect_directory_metadata):
     """Sets the collect directory metadata flag.
@@ -419,3 +833,37 @@ class FileSystemCollector(queue.ItemQueueProducer):
                                   directory metadata.
     """
     self._collect_directory_metadata = collect_directory_metadata
+
+  def SetCollectInInodeOrder(self, collect_in_inode_order):
+    """Sets the collect in inode order flag.
+
+    Args:
+      collect_in_inode_order: Boolean value to indicate to collect the file
+                              entries of TSK file systems in inode order.
+    """
+    self._collect_in_inode_order = collect_in_inode_order
+
+  def SetDuplicateFileCheck(self, file_hashes):
+    """Sets the duplicate file check.
+
+       The duplicate file check skips files with the same inode and
+       timestamps as a previously collected file, e.g. the same file in
+       multiple VSS stores.
+
+    Args:
+      file_hashes: The file hash set (instance of FileHashSet) or None to
+                   disable the duplicate file check.
+    """
+    self._file_hashes = file_hashes
+
+  def SetFileEntryFingerprints(self, fingerprints, parser_names):
+    """Sets the file entry fingerprints of a previous run.
+
+    Args:
+      fingerprints: The set of fingerprints of the file entries extracted
+                    by previous runs or None to collect all file entries.
+      parser_names: A list of the names of the parsers the file entries are
+                    extracted with.
+    """
+    self._fingerprints = fingerprints
+    self._parser_names = parser_names
@@ -30,6 +30,7 @@ from dfvfs.resolver import context
 from dfvfs.resolver import resolver as path_spec_resolver
 
 from plaso.engine import collector
+from plaso.engine import file_hashes
 from plaso.engine import queue
 from plaso.engine import single_process
 from plaso.engine import utils as engine_utils
@@ -142,6 +143,81 @@ class CollectorTest(CollectorTestCase):
 
       self.assertEquals(test_collector_queue_consumer.number_of_path_specs, 4)
 
+  def testFileSystemCollectionIncremental(self):
+    """Test incremental collection on the file system."""
+    test_files = [
+        self._GetTestFilePath([u'syslog.tgz']),
+        self._GetTestFilePath([u'syslog.zip']),
+        self._GetTestFilePath([u'syslog.bz2']),
+        self._GetTestFilePath([u'wtmp.1'])]
+
+    with TempDirectory() as dirname:
+      for a_file in test_files:
+        shutil.copy(a_file, dirname)
+
+      # The first two files are unchanged since a previous run.
+      fingerprints = set()
+      for a_file in test_files[:2]:
+        path_spec = path_spec_factory.Factory.NewPathSpec(
+            dfvfs_definitions.TYPE_INDICATOR_OS,
+            location=os.path.join(dirname, os.path.basename(a_file)))
+        file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+        fingerprints.add(file_hashes.CalculateFileEntryFingerprint(
+            file_entry, [u'syslog']))
+
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=dirname)
+
+      test_collection_queue = single_process.SingleProcessQueue()
+      resolver_context = context.Context()
+      test_collector = collector.Collector(
+          test_collection_queue, dirname, path_spec,
+          resolver_context=resolver_context)
+      test_collector.SetFileEntryFingerprints(fingerprints, [u'syslog'])
+      test_collector.Collect()
+
+      test_collector_queue_consumer = TestCollectorQueueConsumer(
+          test_collection_queue)
+      test_collector_queue_consumer.ConsumeItems()
+
+      self.assertEquals(test_collector_queue_consumer.number_of_path_specs, 2)
+
+  def testFileSystemCollectionInThreads(self):
+    """Test collection on the file system in multiple collection threads."""
+    with TempDirectory() as dirname:
+      for directory_name in [u'a', u'b', os.path.join(u'b', u'c')]:
+        os.mkdir(os.path.join(dirname, directory_name))
+
+      for file_name in [
+          u'file1', os.path.join(u'a', u'file2'), os.path.join(u'b', u'file3'),
+          os.path.join(u'b', u'c', u'file4')]:
+        with open(os.path.join(dirname, file_name), 'wb') as file_object:
+          file_object.write(b'data')
+
+      path_spec = path_spec_factory.Factory.NewPathSpec(
+          dfvfs_definitions.TYPE_INDICATOR_OS, location=dirname)
+
+      file_paths = []
+      for number_of_collection_threads in [0, 3]:
+        test_collection_queue = single_process.SingleProcessQueue()
+        resolver_context = context.Context()
+        test_collector = collector.Collector(
+            test_collection_queue, dirname, path_spec,
+            resolver_context=resolver_context)
+        test_collector.SetNumberOfCollectionThreads(
+            number_of_collection_threads)
+        test_collector.Collect()
+
+        test_collector_queue_consumer = TestCollectorQueueConsumer(
+            test_collection_queue)
+        test_collector_queue_consumer.ConsumeItems()
+
+        file_paths.append(sorted(test_collector_queue_consumer.GetFilePaths()))
+
+      # 3 directories and 4 files.
+      self.assertEquals(len(file_paths[0]), 7)
+      self.assertEquals(file_paths[1], file_paths[0])
+
   def testFileSystemWithFilterCollection(self):
     """Test collection on the file system with a filter."""
     dirname = u'.'
@@ -243,6 +319,35 @@ class CollectorTest(CollectorTestCase):
 
     self.assertEquals(test_collector_queue_consumer.number_of_path_specs, 3)
 
+  def testImageCollectionInInodeOrder(self):
+    """Test collection on a storage media image file in inode order."""
+    test_file = self._GetTestFilePath([u'syslog_image.dd'])
+
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=volume_path_spec)
+
+    test_collection_queue = single_process.SingleProcessQueue()
+    resolver_context = context.Context()
+    test_collector = collector.Collector(
+        test_collection_queue, test_file, path_spec,
+        resolver_context=resolver_context)
+    test_collector.SetCollectInInodeOrder(True)
+    test_collector.Collect()
+
+    test_collector_queue_consumer = TestCollectorQueueConsumer(
+        test_collection_queue)
+    test_collector_queue_consumer.ConsumeItems()
+
+    self.assertEquals(test_collector_queue_consumer.number_of_path_specs, 3)
+
+    inodes = [
+        path_spec.inode
+        for path_spec in test_collector_queue_consumer.path_specs]
+    self.assertEquals(inodes, sorted(inodes))
+
   def testImageWithFilterCollection(self):
     """Test collection on a storage media image file with a filter."""
     test_file = self._GetTestFilePath([u'ímynd.dd'])
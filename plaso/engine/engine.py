@@ -48,12 +48,15 @@ class BaseEngine(object):
     self._enable_profiling = False
     self._event_queue_producer = queue.ItemQueueProducer(storage_queue)
     self._filter_object = None
+    self._fingerprints = None
+    self._fingerprints_directory = None
     self._mount_path = None
     self._parse_error_queue = parse_error_queue
     self._parse_error_queue_producer = queue.ItemQueueProducer(
         parse_error_queue)
     self._process_archive_files = False
     self._profiling_sample_rate = 1000
+    self._serializer_format = None
     self._source = None
     self._source_path_spec = None
     self._source_file_entry = None
@@ -185,6 +188,29 @@ class BaseEngine(object):
     self._enable_profiling = enable_profiling
     self._profiling_sample_rate = profiling_sample_rate
 
+  def SetEventObjectSerializerFormat(self, serializer_format):
+    """Sets the format the extraction workers serialize event objects in.
+
+    Args:
+      serializer_format: a string containing the serializer format, either
+                         "proto" or "json", or None if the extraction workers
+                         should produce event objects that are not serialized.
+    """
+    self._serializer_format = serializer_format
+
+  def SetFileEntryFingerprints(self, fingerprints, fingerprints_directory):
+    """Sets the file entry fingerprints for incremental extraction.
+
+    Args:
+      fingerprints: The set of fingerprints of the file entries extracted
+                    by previous runs.
+      fingerprints_directory: The path of the directory in which the
+                              extraction workers store the fingerprints
+                              of the file entries they extract.
+    """
+    self._fingerprints = fingerprints
+    self._fingerprints_directory = fingerprints_directory
+
   def SetFilterObject(self, filter_object):
     """Sets the filter object.
 
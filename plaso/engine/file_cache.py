@@ -0,0 +1,349 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The file data cache.
+
+The file data cache is shared by the parsers of an extraction worker, so
+that the data of a file entry is read once from the underlying source
+(e.g. a storage media image) instead of once per parser.
+"""
+
+import collections
+import os
+
+
+class FileDataCache(object):
+  """Class that implements a size bounded least recently used (LRU) cache
+     of file data blocks.
+  """
+
+  DEFAULT_BLOCK_SIZE = 64 * 1024
+
+  # Approximately 64 MiB of cached file data.
+  DEFAULT_MAXIMUM_SIZE = 64 * 1024 * 1024
+
+  def __init__(self, block_size=None, maximum_size=None):
+    """Initializes the file data cache.
+
+    Args:
+      block_size: optional size of the cached file data blocks. The default
+                  is None, which represents DEFAULT_BLOCK_SIZE.
+      maximum_size: optional maximum size of the cached file data. The default
+                    is None, which represents DEFAULT_MAXIMUM_SIZE.
+    """
+    super(FileDataCache, self).__init__()
+    self._blocks = collections.OrderedDict()
+    self._file_sizes = {}
+    self._maximum_size = maximum_size or self.DEFAULT_MAXIMUM_SIZE
+
+    self.block_size = block_size or self.DEFAULT_BLOCK_SIZE
+    self.number_of_evictions = 0
+    self.number_of_hits = 0
+    self.number_of_misses = 0
+    self.size = 0
+
+  def Empty(self):
+    """Empties the cache."""
+    self._blocks = collections.OrderedDict()
+    self._file_sizes = {}
+    self.size = 0
+
+  def GetBlock(self, file_identifier, block_index):
+    """Retrieves a cached file data block.
+
+    Args:
+      file_identifier: a string that uniquely identifies the file, e.g. the
+                       comparable of the path specification.
+      block_index: the index of the block in the file.
+
+    Returns:
+      A binary string containing the block data or None if the block is not
+      cached.
+    """
+    key = (file_identifier, block_index)
+    block_data = self._blocks.pop(key, None)
+    if block_data is None:
+      self.number_of_misses += 1
+      return
+
+    # Re-insert the block to mark it as most recently used.
+    self._blocks[key] = block_data
+    self.number_of_hits += 1
+    return block_data
+
+  def GetFileSize(self, file_identifier):
+    """Retrieves the cached size of a file.
+
+    Args:
+      file_identifier: a string that uniquely identifies the file.
+
+    Returns:
+      The size of the file or None if the size is not cached.
+    """
+    return self._file_sizes.get(file_identifier, None)
+
+  def SetBlock(self, file_identifier, block_index, block_data):
+    """Caches a file data block.
+
+       The least recently used blocks are evicted if the size of the cache
+       exceeds its maximum size.
+
+    Args:
+      file_identifier: a string that uniquely identifies the file.
+      block_index: the index of the block in the file.
+      block_data: a binary string containing the block data.
+    """
+    key = (file_identifier, block_index)
+    previous_block_data = self._blocks.pop(key, None)
+    if previous_block_data is not None:
+      self.size -= len(previous_block_data)
+
+    self._blocks[key] = block_data
+    self.size += len(block_data)
+
+    while self.size > self._maximum_size and len(self._blocks) > 1:
+      _, evicted_block_data = self._blocks.popitem(last=False)
+      self.size -= len(evicted_block_data)
+      self.number_of_evictions += 1
+
+  def SetFileSize(self, file_identifier, file_size):
+    """Caches the size of a file.
+
+    Args:
+      file_identifier: a string that uniquely identifies the file.
+      file_size: the size of the file.
+    """
+    self._file_sizes[file_identifier] = file_size
+
+
+class CachedFileObject(object):
+  """Class that implements a file-like object that reads through a file data
+     cache.
+
+  The underlying file-like object is only opened when data or the file size
+  is not available in the cache.
+  """
+
+  def __init__(self, file_data_cache, file_entry):
+    """Initializes the file-like object.
+
+    Args:
+      file_data_cache: the file data cache (instance of FileDataCache).
+      file_entry: the file entry object (instance of dfvfs.FileEntry).
+    """
+    super(CachedFileObject, self).__init__()
+    self._current_offset = 0
+    self._file_data_cache = file_data_cache
+    self._file_entry = file_entry
+    self._file_identifier = file_entry.path_spec.comparable
+    self._file_object = None
+    self._file_size = None
+
+  def _GetBlock(self, block_index):
+    """Retrieves a file data block.
+
+    Args:
+      block_index: the index of the block in the file.
+
+    Returns:
+      A binary string containing the block data.
+
+    Raises:
+      IOError: if the file entry cannot be opened.
+    """
+    block_data = self._file_data_cache.GetBlock(
+        self._file_identifier, block_index)
+    if block_data is not None:
+      return block_data
+
+    file_object = self._GetFileObject()
+    block_size = self._file_data_cache.block_size
+    file_object.seek(block_index * block_size, os.SEEK_SET)
+    block_data = file_object.read(block_size)
+
+    self._file_data_cache.SetBlock(
+        self._file_identifier, block_index, block_data)
+    return block_data
+
+  def _GetFileObject(self):
+    """Retrieves the underlying file-like object.
+
+    Returns:
+      The file-like object (instance of dfvfs.FileIO).
+
+    Raises:
+      IOError: if the file entry cannot be opened.
+    """
+    if not self._file_object:
+      self._file_object = self._file_entry.GetFileObject()
+      if not self._file_object:
+        raise IOError(u'Unable to open file entry: {0:s}.'.format(
+            self._file_identifier))
+
+    return self._file_object
+
+  def close(self):
+    """Closes the file-like object."""
+    if self._file_object:
+      self._file_object.close()
+      self._file_object = None
+
+  def get_offset(self):
+    """Returns the current offset into the file-like object."""
+    return self._current_offset
+
+  def get_size(self):
+    """Returns the size of the file-like object."""
+    if self._file_size is None:
+      self._file_size = self._file_data_cache.GetFileSize(
+          self._file_identifier)
+
+    if self._file_size is None:
+      self._file_size = self._GetFileObject().get_size()
+      self._file_data_cache.SetFileSize(
+          self._file_identifier, self._file_size)
+
+    return self._file_size
+
+  def read(self, size=None):
+    """Reads a byte string from the file-like object at the current offset.
+
+    Args:
+      size: optional number of bytes to read, where None or a negative
+            value represents all remaining data. The default is None.
+
+    Returns:
+      A byte string containing the data read.
+    """
+    remaining_size = self.get_size() - self._current_offset
+    if size is None or size < 0 or size > remaining_size:
+      size = remaining_size
+
+    if size <= 0:
+      return b''
+
+    block_size = self._file_data_cache.block_size
+    end_offset = self._current_offset + size
+
+    data = []
+    while self._current_offset < end_offset:
+      block_index, block_offset = divmod(self._current_offset, block_size)
+      block_data = self._GetBlock(block_index)
+
+      data_size = min(end_offset - self._current_offset, block_size)
+      block_data = block_data[block_offset:block_offset + data_size]
+      if not block_data:
+        break
+
+      data.append(block_data)
+      self._current_offset += len(block_data)
+
+    return b''.join(data)
+
+  def readline(self, size=None):
+    """Reads a line from the file-like object at the current offset.
+
+    Args:
+      size: optional maximum number of bytes to read. The default is None,
+            which represents no limit.
+
+    Returns:
+      A byte string containing the line, including the end-of-line character.
+    """
+    remaining_size = self.get_size() - self._current_offset
+    if size is None or size < 0 or size > remaining_size:
+      size = remaining_size
+
+    block_size = self._file_data_cache.block_size
+    end_offset = self._current_offset + size
+
+    data = []
+    while self._current_offset < end_offset:
+      block_index, block_offset = divmod(self._current_offset, block_size)
+      block_data = self._GetBlock(block_index)
+
+      data_size = min(end_offset - self._current_offset, block_size)
+      block_data = block_data[block_offset:block_offset + data_size]
+      if not block_data:
+        break
+
+      end_of_line_index = block_data.find(b'\n')
+      if end_of_line_index >= 0:
+        block_data = block_data[:end_of_line_index + 1]
+
+      data.append(block_data)
+      self._current_offset += len(block_data)
+
+      if end_of_line_index >= 0:
+        break
+
+    return b''.join(data)
+
+  def seek(self, offset, whence=os.SEEK_SET):
+    """Seeks an offset within the file-like object.
+
+    Args:
+      offset: the offset to seek.
+      whence: optional value that indicates whether offset is an absolute
+              or relative position within the file. The default is
+              os.SEEK_SET.
+
+    Raises:
+      IOError: if the seek failed.
+    """
+    if whence == os.SEEK_CUR:
+      offset += self._current_offset
+    elif whence == os.SEEK_END:
+      offset += self.get_size()
+    elif whence != os.SEEK_SET:
+      raise IOError(u'Unsupported whence.')
+
+    if offset < 0:
+      raise IOError(u'Invalid offset value out of bounds.')
+
+    self._current_offset = offset
+
+  def tell(self):
+    """Returns the current offset into the file-like object."""
+    return self._current_offset
+
+
+class CachedFileEntry(object):
+  """Class that wraps a file entry to read its data through a file data cache.
+
+  All attributes except for GetFileObject are provided by the wrapped file
+  entry.
+  """
+
+  def __init__(self, file_data_cache, file_entry):
+    """Initializes the file entry.
+
+    Args:
+      file_data_cache: the file data cache (instance of FileDataCache).
+      file_entry: the file entry object (instance of dfvfs.FileEntry).
+    """
+    super(CachedFileEntry, self).__init__()
+    self._file_data_cache = file_data_cache
+    self._file_entry = file_entry
+
+  def __getattr__(self, attribute_name):
+    """Retrieves an attribute of the wrapped file entry."""
+    return getattr(self._file_entry, attribute_name)
+
+  def GetFileObject(self):
+    """Retrieves the file-like object (instance of CachedFileObject)."""
+    return CachedFileObject(self._file_data_cache, self._file_entry)
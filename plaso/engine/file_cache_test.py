@@ -0,0 +1,102 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests the file data cache."""
+
+import os
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.engine import file_cache
+from plaso.engine import test_lib
+
+
+class FileDataCacheTest(unittest.TestCase):
+  """Tests for the file data cache object."""
+
+  def testGetSetBlock(self):
+    """Tests the GetBlock and SetBlock functions."""
+    file_data_cache = file_cache.FileDataCache(block_size=4, maximum_size=8)
+
+    file_data_cache.SetBlock(u'file', 0, b'abcd')
+    file_data_cache.SetBlock(u'file', 1, b'efgh')
+    self.assertEquals(file_data_cache.GetBlock(u'file', 0), b'abcd')
+
+    # Block 1 is the least recently used block and is evicted.
+    file_data_cache.SetBlock(u'file', 2, b'ijkl')
+    self.assertEquals(file_data_cache.GetBlock(u'file', 1), None)
+    self.assertEquals(file_data_cache.GetBlock(u'file', 2), b'ijkl')
+
+    self.assertEquals(file_data_cache.size, 8)
+    self.assertEquals(file_data_cache.number_of_evictions, 1)
+    self.assertEquals(file_data_cache.number_of_hits, 2)
+    self.assertEquals(file_data_cache.number_of_misses, 1)
+
+    file_data_cache.Empty()
+    self.assertEquals(file_data_cache.size, 0)
+    self.assertEquals(file_data_cache.GetBlock(u'file', 0), None)
+
+
+class CachedFileObjectTest(test_lib.EngineTestCase):
+  """Tests for the cached file-like object."""
+
+  def testRead(self):
+    """Tests the read, readline and seek functions."""
+    source_path = self._GetTestFilePath(['syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    with open(source_path, 'rb') as file_object:
+      expected_data = file_object.read()
+
+    file_data_cache = file_cache.FileDataCache(block_size=64)
+    cached_file_entry = file_cache.CachedFileEntry(file_data_cache, file_entry)
+    self.assertEquals(cached_file_entry.name, file_entry.name)
+
+    file_object = cached_file_entry.GetFileObject()
+    self.assertEquals(file_object.get_size(), len(expected_data))
+    self.assertEquals(file_object.read(), expected_data)
+    self.assertEquals(file_object.read(), b'')
+
+    file_object.seek(100, os.SEEK_SET)
+    self.assertEquals(file_object.read(200), expected_data[100:300])
+    self.assertEquals(file_object.tell(), 300)
+
+    # A negative size reads all remaining data.
+    self.assertEquals(file_object.read(-1), expected_data[300:])
+
+    file_object.seek(0, os.SEEK_SET)
+    expected_line, _, _ = expected_data.partition(b'\n')
+    self.assertEquals(file_object.readline(), expected_line + b'\n')
+    file_object.close()
+
+    number_of_misses = file_data_cache.number_of_misses
+
+    # A second file-like object reads the data from the cache.
+    file_object = cached_file_entry.GetFileObject()
+    self.assertEquals(file_object.read(), expected_data)
+    file_object.close()
+
+    self.assertEquals(file_data_cache.number_of_misses, number_of_misses)
+
+
+if __name__ == '__main__':
+  unittest.main()
@@ -0,0 +1,203 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""The file hashes used by the duplicate file check and incremental extraction.
+
+The duplicate file check of the collector uses the file entry hash, which
+identifies the same file in multiple VSS stores. Incremental extraction uses
+the file entry fingerprint, which identifies a file entry that is unchanged
+since a previous run.
+"""
+
+import hashlib
+import sqlite3
+import struct
+
+
+def CalculateFileEntryHash(file_entry):
+  """Calculates a 64-bit hash of the inode and timestamps of a file entry.
+
+  Args:
+    file_entry: the file entry (instance of dfvfs.FileEntry).
+
+  Returns:
+    An integer containing the 64-bit hash value or None if the path
+    specification of the file entry has no inode.
+  """
+  # Without an inode different files with the same timestamps would have
+  # the same hash.
+  inode = getattr(file_entry.path_spec, 'inode', None)
+  if inode is None:
+    return
+
+  stat_object = file_entry.GetStat()
+  md5_context = hashlib.md5()
+
+  md5_context.update('inode:{0:d}'.format(inode))
+
+  for name in ['atime', 'crtime', 'mtime', 'ctime']:
+    md5_context.update('{0:s}:{1:d}.{2:d}'.format(
+        name, getattr(stat_object, name, None) or 0,
+        getattr(stat_object, u'{0:s}_nano'.format(name), None) or 0))
+
+  hash_value, = struct.unpack('>Q', md5_context.digest()[:8])
+  return hash_value
+
+
+def CalculateFileEntryFingerprint(file_entry, parser_names):
+  """Calculates a 64-bit fingerprint of a file entry.
+
+     The fingerprint covers the path specification, the size, the
+     modification, change and creation timestamps and the names of the
+     parsers the file entry is extracted with. The access time is not
+     included since reading a file can change it.
+
+  Args:
+    file_entry: the file entry (instance of dfvfs.FileEntry).
+    parser_names: a list of the names of the parsers.
+
+  Returns:
+    An integer containing the 64-bit fingerprint.
+  """
+  stat_object = file_entry.GetStat()
+  md5_context = hashlib.md5()
+
+  md5_context.update(file_entry.path_spec.comparable.encode('utf-8'))
+  md5_context.update('size:{0:d}'.format(
+      getattr(stat_object, 'size', None) or 0))
+
+  for name in ['crtime', 'mtime', 'ctime']:
+    md5_context.update('{0:s}:{1:d}.{2:d}'.format(
+        name, getattr(stat_object, name, None) or 0,
+        getattr(stat_object, u'{0:s}_nano'.format(name), None) or 0))
+
+  md5_context.update('parsers:{0:s}'.format(','.join(sorted(parser_names))))
+
+  fingerprint, = struct.unpack('>Q', md5_context.digest()[:8])
+  return fingerprint
+
+
+class FileHashSet(object):
+  """Class that implements a set of 64-bit file hashes.
+
+  The set is kept in memory or, if a path is provided, in a SQLite database,
+  which bounds the memory usage for very large volumes and allows repeated
+  runs to skip the files that were collected before.
+  """
+
+  # The number of additions after which the SQLite database is committed.
+  _COMMIT_INTERVAL = 10000
+
+  _CREATE_TABLE_QUERY = (
+      u'CREATE TABLE IF NOT EXISTS file_hashes (hash INTEGER PRIMARY KEY)')
+
+  def __init__(self, path=None):
+    """Initializes the file hash set.
+
+    Args:
+      path: optional path of the SQLite database file. The default is None,
+            which represents an in-memory set.
+    """
+    super(FileHashSet, self).__init__()
+    self._connection = None
+    self._cursor = None
+    self._hashes = None
+    self._number_of_uncommitted_hashes = 0
+    self._path = path
+
+    if not path:
+      self._hashes = set()
+
+  def __len__(self):
+    """Returns the number of hashes in the set."""
+    if self._hashes is not None:
+      return len(self._hashes)
+
+    self._Open()
+    self._cursor.execute(u'SELECT COUNT(*) FROM file_hashes')
+    number_of_hashes, = self._cursor.fetchone()
+    return number_of_hashes
+
+  def __iter__(self):
+    """Iterates over the hashes in the set."""
+    if self._hashes is not None:
+      for hash_value in self._hashes:
+        yield hash_value
+      return
+
+    self._Open()
+    cursor = self._connection.cursor()
+    for hash_value, in cursor.execute(u'SELECT hash FROM file_hashes'):
+      if hash_value < 0:
+        hash_value += 0x10000000000000000
+      yield hash_value
+
+  def _Open(self):
+    """Opens the SQLite database if not already open.
+
+       The database is opened on first use, so that the connection is
+       created in the process that uses it.
+    """
+    if self._connection:
+      return
+
+    self._connection = sqlite3.connect(self._path, check_same_thread=False)
+    self._cursor = self._connection.cursor()
+    self._cursor.execute(self._CREATE_TABLE_QUERY)
+
+  def Add(self, hash_value):
+    """Adds a hash to the set.
+
+    Args:
+      hash_value: an integer containing the 64-bit hash value.
+
+    Returns:
+      A boolean value indicating the hash was added, that is it was not
+      already in the set.
+    """
+    if self._hashes is not None:
+      if hash_value in self._hashes:
+        return False
+
+      self._hashes.add(hash_value)
+      return True
+
+    self._Open()
+
+    # SQLite integers are signed 64-bit values.
+    if hash_value >= 0x8000000000000000:
+      hash_value -= 0x10000000000000000
+
+    self._cursor.execute(
+        u'INSERT OR IGNORE INTO file_hashes (hash) VALUES (?)', (hash_value, ))
+    if not self._cursor.rowcount:
+      return False
+
+    self._number_of_uncommitted_hashes += 1
+    if self._number_of_uncommitted_hashes >= self._COMMIT_INTERVAL:
+      self._connection.commit()
+      self._number_of_uncommitted_hashes = 0
+
+    return True
+
+  def Close(self):
+    """Closes the file hash set, which commits the SQLite database."""
+    if self._connection:
+      self._connection.commit()
+      self._connection.close()
+      self._connection = None
+      self._cursor = None
@@ -0,0 +1,136 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests the file hash set."""
+
+import os
+import shutil
+import tempfile
+import unittest
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso.engine import file_hashes
+from plaso.engine import test_lib
+
+
+class CalculateFileEntryHashTest(test_lib.EngineTestCase):
+  """Tests for the CalculateFileEntryHash function."""
+
+  def testCalculateFileEntryHash(self):
+    """Tests the CalculateFileEntryHash function."""
+    source_path = self._GetTestFilePath(['syslog_image.dd'])
+    volume_path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_TSK, location=u'/',
+        parent=volume_path_spec)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    hash_values = set()
+    for sub_file_entry in file_entry.sub_file_entries:
+      hash_value = file_hashes.CalculateFileEntryHash(sub_file_entry)
+      self.assertTrue(0 <= hash_value < 2 ** 64)
+      self.assertEquals(
+          file_hashes.CalculateFileEntryHash(sub_file_entry), hash_value)
+      hash_values.add(hash_value)
+
+    # The sub file entries have different inodes.
+    self.assertTrue(len(hash_values) > 1)
+
+    # A file entry without an inode has no hash.
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(volume_path_spec)
+    self.assertEquals(file_hashes.CalculateFileEntryHash(file_entry), None)
+
+
+class CalculateFileEntryFingerprintTest(test_lib.EngineTestCase):
+  """Tests for the CalculateFileEntryFingerprint function."""
+
+  def testCalculateFileEntryFingerprint(self):
+    """Tests the CalculateFileEntryFingerprint function."""
+    source_path = self._GetTestFilePath(['syslog'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    fingerprint = file_hashes.CalculateFileEntryFingerprint(
+        file_entry, ['syslog', 'filestat'])
+    self.assertTrue(0 <= fingerprint < 2 ** 64)
+
+    # The order of the parser names does not matter.
+    self.assertEquals(file_hashes.CalculateFileEntryFingerprint(
+        file_entry, ['filestat', 'syslog']), fingerprint)
+
+    self.assertNotEquals(file_hashes.CalculateFileEntryFingerprint(
+        file_entry, ['syslog']), fingerprint)
+
+    source_path = self._GetTestFilePath(['syslog.zip'])
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=source_path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    self.assertNotEquals(file_hashes.CalculateFileEntryFingerprint(
+        file_entry, ['syslog', 'filestat']), fingerprint)
+
+
+class FileHashSetTest(unittest.TestCase):
+  """Tests for the file hash set object."""
+
+  def testAdd(self):
+    """Tests the Add function."""
+    file_hash_set = file_hashes.FileHashSet()
+
+    self.assertTrue(file_hash_set.Add(0x0123456789abcdef))
+    self.assertTrue(file_hash_set.Add(0xfedcba9876543210))
+    self.assertFalse(file_hash_set.Add(0x0123456789abcdef))
+    self.assertEquals(len(file_hash_set), 2)
+
+    file_hash_set.Close()
+
+  def testAddWithDatabase(self):
+    """Tests the Add function with a database file."""
+    temporary_directory = tempfile.mkdtemp()
+    path = os.path.join(temporary_directory, u'file_hashes.db')
+
+    try:
+      file_hash_set = file_hashes.FileHashSet(path=path)
+      self.assertTrue(file_hash_set.Add(0x0123456789abcdef))
+      self.assertTrue(file_hash_set.Add(0xfedcba9876543210))
+      self.assertFalse(file_hash_set.Add(0xfedcba9876543210))
+      self.assertEquals(len(file_hash_set), 2)
+      file_hash_set.Close()
+
+      # The hashes of a previous run are stored in the database file.
+      file_hash_set = file_hashes.FileHashSet(path=path)
+      self.assertFalse(file_hash_set.Add(0x0123456789abcdef))
+      self.assertFalse(file_hash_set.Add(0xfedcba9876543210))
+      self.assertTrue(file_hash_set.Add(0x0011223344556677))
+      self.assertEquals(len(file_hash_set), 3)
+
+      expected_hashes = set([
+          0x0123456789abcdef, 0xfedcba9876543210, 0x0011223344556677])
+      self.assertEquals(set(file_hash_set), expected_hashes)
+      file_hash_set.Close()
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
+
+if __name__ == '__main__':
+  unittest.main()
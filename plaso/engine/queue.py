@@ -26,6 +26,8 @@ scalability.
 """
 
 import abc
+import cPickle
+import struct
 
 from plaso.lib import errors
 
@@ -34,6 +36,67 @@ class QueueEndOfInput(object):
   """Class that implements a queue end of input."""
 
 
+class QueueItemBatch(object):
+  """Class that implements a batch of queue items.
+
+     The batch stores the items as a single string of length-prefixed pickled
+     items, so that a batch crosses a process boundary as one message instead
+     of an individually pickled message per item.
+  """
+
+  _ITEM_SIZE_STRUCT = struct.Struct('<I')
+
+  def __init__(self):
+    """Initializes the queue item batch."""
+    super(QueueItemBatch, self).__init__()
+    self._item_data = []
+    self.data_size = 0
+    self.number_of_items = 0
+
+  def __getstate__(self):
+    """Returns the state of the batch used for pickling."""
+    return {
+        'data': b''.join(self._item_data),
+        'number_of_items': self.number_of_items}
+
+  def __setstate__(self, state):
+    """Restores the state of the batch after unpickling."""
+    data = state['data']
+    self._item_data = [data]
+    self.data_size = len(data)
+    self.number_of_items = state['number_of_items']
+
+  def AppendItem(self, item):
+    """Appends an item to the batch.
+
+    Args:
+      item: the item object.
+    """
+    item_data = cPickle.dumps(item, cPickle.HIGHEST_PROTOCOL)
+    item_data_size = len(item_data)
+
+    self._item_data.append(self._ITEM_SIZE_STRUCT.pack(item_data_size))
+    self._item_data.append(item_data)
+    self.data_size += self._ITEM_SIZE_STRUCT.size + item_data_size
+    self.number_of_items += 1
+
+  def GetItems(self):
+    """Retrieves the items in the batch.
+
+    Yields:
+      The item objects in the order they were appended.
+    """
+    data = b''.join(self._item_data)
+    data_offset = 0
+    data_size = len(data)
+    while data_offset < data_size:
+      item_data_size, = self._ITEM_SIZE_STRUCT.unpack_from(data, data_offset)
+      data_offset += self._ITEM_SIZE_STRUCT.size
+
+      yield cPickle.loads(data[data_offset:data_offset + item_data_size])
+      data_offset += item_data_size
+
+
 class Queue(object):
   """Class that implements the queue interface."""
 
@@ -95,6 +158,10 @@ class QueueProducer(object):
     self._abort = False
     self._queue = queue_object
 
+  def Flush(self):
+    """Flushes items the producer has buffered onto the queue."""
+    return
+
   def SignalAbort(self):
     """Signals the producer to abort."""
     self._abort = True
@@ -135,6 +202,11 @@ class EventObjectQueueConsumer(QueueConsumer):
         self._queue.PushItem(item)
         break
 
+      if isinstance(item, QueueItemBatch):
+        for event_object in item.GetItems():
+          self._ConsumeEventObject(event_object, **kwargs)
+        continue
+
       self._ConsumeEventObject(item, **kwargs)
 
     self._abort = False
@@ -146,6 +218,15 @@ class ItemQueueConsumer(QueueConsumer):
      The consumer subscribes to updates on the queue.
   """
 
+  def __init__(self, queue_object):
+    """Initializes the item queue consumer.
+
+    Args:
+      queue_object: the queue object (instance of Queue).
+    """
+    super(ItemQueueConsumer, self).__init__(queue_object)
+    self._retire_event = None
+
   @abc.abstractmethod
   def _ConsumeItem(self, item):
     """Consumes an item callback for ConsumeItems.
@@ -157,6 +238,11 @@ class ItemQueueConsumer(QueueConsumer):
   def ConsumeItems(self):
     """Consumes the items that are pushed on the queue."""
     while not self._abort:
+      # The retire event stops this consumer only, before it pops the next
+      # item, while the other consumers continue to consume the items.
+      if self._retire_event is not None and self._retire_event.is_set():
+        break
+
       try:
         item = self._queue.PopItem()
       except errors.QueueEmpty:
@@ -168,10 +254,25 @@ class ItemQueueConsumer(QueueConsumer):
         self._queue.PushItem(item)
         break
 
+      if isinstance(item, QueueItemBatch):
+        for batch_item in item.GetItems():
+          self._ConsumeItem(batch_item)
+        continue
+
       self._ConsumeItem(item)
 
     self._abort = False
 
+  def SetRetireEvent(self, retire_event):
+    """Sets the event that signals the consumer to stop consuming items.
+
+    Args:
+      retire_event: the event (instance of threading.Event or
+                    multiprocessing.Event) that is set to retire the consumer
+                    or None.
+    """
+    self._retire_event = retire_event
+
 
 class ItemQueueProducer(QueueProducer):
   """Class that implements an item queue producer.
@@ -202,3 +303,73 @@ class ItemQueueProducer(QueueProducer):
     """
     for item in items:
       self.ProduceItem(item)
+
+
+class ItemQueueBatchProducer(ItemQueueProducer):
+  """Class that implements an item queue producer that batches items.
+
+     The producer buffers items and pushes them onto the queue as a single
+     batch (instance of QueueItemBatch) once either the number of items or
+     the size of the batch data reaches its maximum. This reduces the per
+     item overhead of a queue that crosses a process boundary.
+  """
+
+  DEFAULT_MAXIMUM_NUMBER_OF_ITEMS = 256
+
+  # Approximately 1 MiB of pickled item data per batch.
+  DEFAULT_MAXIMUM_BATCH_SIZE = 1024 * 1024
+
+  def __init__(
+      self, queue_object, maximum_number_of_items=None,
+      maximum_batch_size=None):
+    """Initializes the queue producer.
+
+    Args:
+      queue_object: the queue object (instance of Queue).
+      maximum_number_of_items: optional maximum number of items per batch.
+                               The default is None, which represents
+                               DEFAULT_MAXIMUM_NUMBER_OF_ITEMS.
+      maximum_batch_size: optional maximum size of the batch data in bytes.
+                          The default is None, which represents
+                          DEFAULT_MAXIMUM_BATCH_SIZE.
+    """
+    super(ItemQueueBatchProducer, self).__init__(queue_object)
+    self._batch = None
+    self._maximum_batch_size = (
+        maximum_batch_size or self.DEFAULT_MAXIMUM_BATCH_SIZE)
+    self._maximum_number_of_items = (
+        maximum_number_of_items or self.DEFAULT_MAXIMUM_NUMBER_OF_ITEMS)
+
+  def Flush(self):
+    """Flushes the buffered batch of items onto the queue."""
+    if self._batch is None:
+      return
+
+    batch = self._batch
+    self._batch = None
+    try:
+      self._queue.PushItem(batch)
+    except errors.QueueFull:
+      self._FlushQueue()
+
+  def ProduceItem(self, item):
+    """Produces an item onto the queue.
+
+       The item is buffered until the batch is full.
+
+    Args:
+      item: the item object.
+    """
+    if self._batch is None:
+      self._batch = QueueItemBatch()
+
+    self._batch.AppendItem(item)
+
+    if (self._batch.number_of_items >= self._maximum_number_of_items or
+        self._batch.data_size >= self._maximum_batch_size):
+      self.Flush()
+
+  def SignalEndOfInput(self):
+    """Signals the queue no input remains."""
+    self.Flush()
+    super(ItemQueueBatchProducer, self).SignalEndOfInput()
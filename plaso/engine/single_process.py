@@ -19,6 +19,7 @@
 
 import collections
 import logging
+import os
 import pdb
 
 from plaso.engine import collector
@@ -176,6 +177,13 @@ class SingleProcessEngine(engine.BaseEngine):
     if self._filter_object:
       extraction_worker.SetFilterObject(self._filter_object)
 
+    if self._fingerprints_directory:
+      fingerprints_path = os.path.join(
+          self._fingerprints_directory, u'worker_{0:d}.db'.format(
+              worker_number))
+      extraction_worker.SetFileEntryFingerprints(
+          self._fingerprints, fingerprints_path)
+
     if self._mount_path:
       extraction_worker.SetMountPath(self._mount_path)
 
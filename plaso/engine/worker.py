@@ -31,7 +31,10 @@ try:
 except ImportError:
   hpy = None
 
+from plaso.engine import classifier
 from plaso.engine import collector
+from plaso.engine import file_cache
+from plaso.engine import file_hashes
 from plaso.engine import queue
 from plaso.lib import errors
 from plaso.parsers import manager as parsers_manager
@@ -48,6 +51,22 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
   are pushed on a storage queue for further processing.
   """
 
+  # The signatures of the archive and compressed stream formats, as tuples
+  # of the offset and the signature. These are checked against the file data
+  # in the file data cache, so that only the file entries that contain one of
+  # the signatures need to be analyzed by dfvfs, which reads the file entry
+  # from the source.
+  _ARCHIVE_SIGNATURES = [
+      (0, b'PK\x03\x04'),
+      (0, b'PK\x05\x06'),
+      (0, b'PK\x07\x08'),
+      (257, b'ustar\x00'),
+      (257, b'ustar  \x00')]
+
+  _COMPRESSED_STREAM_SIGNATURES = [
+      (0, b'BZh'),
+      (0, b'\x1f\x8b')]
+
   def __init__(
       self, identifier, process_queue, event_queue_producer,
       parse_error_queue_producer, parser_context):
@@ -65,10 +84,15 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     super(BaseEventExtractionWorker, self).__init__(process_queue)
     self._enable_debug_output = False
+    self._file_data_cache = file_cache.FileDataCache()
+    self._file_entry_classifier = None
+    self._file_entry_fingerprints = None
     self._identifier = identifier
     self._filestat_parser_object = None
     self._parser_context = parser_context
+    self._parser_names = []
     self._parser_objects = None
+    self._previous_fingerprints = None
     self._process_archive_files = False
 
     # We need a resolver context per process to prevent multi processing
@@ -79,6 +103,7 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
     # Attributes that contain the current status of the worker.
     self._current_working_file = u''
+    self._is_processing_file_entry = False
     self._is_running = False
 
     # Attributes for profiling.
@@ -102,11 +127,14 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
           path_spec.comparable))
       return
 
+    self._is_processing_file_entry = True
     try:
       self.ParseFileEntry(file_entry)
     except IOError as exception:
       logging.warning(u'Unable to parse file: {0:s} with error: {1:s}'.format(
           path_spec.comparable, exception))
+    finally:
+      self._is_processing_file_entry = False
 
   def _DebugParseFileEntry(self):
     """Callback for debugging file entry parsing failures."""
@@ -154,15 +182,47 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
       if self._enable_debug_output:
         self._DebugParseFileEntry()
 
+  def _HasSignature(self, file_entry, signatures):
+    """Determines if the data of a file entry contains one of the signatures.
+
+    Args:
+      file_entry: A file entry object (instance of CachedFileEntry).
+      signatures: A list of tuples of the offset and the signature.
+
+    Returns:
+      A boolean indicating if the file entry contains one of the signatures.
+    """
+    header_size = max([
+        offset + len(signature) for offset, signature in signatures])
+
+    file_object = file_entry.GetFileObject()
+    try:
+      file_object.seek(0, os.SEEK_SET)
+      header_data = file_object.read(header_size)
+    except IOError:
+      # Leave it up to dfvfs to determine the format of the file entry.
+      return True
+    finally:
+      file_object.close()
+
+    for offset, signature in signatures:
+      if header_data[offset:offset + len(signature)] == signature:
+        return True
+
+    return False
+
   def _ProcessArchiveFile(self, file_entry):
     """Processes an archive file (file that contains file entries).
 
     Args:
-      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      file_entry: A file entry object (instance of CachedFileEntry).
 
     Returns:
       A boolean indicating if the file is an archive file.
     """
+    if not self._HasSignature(file_entry, self._ARCHIVE_SIGNATURES):
+      return False
+
     type_indicators = analyzer.Analyzer.GetArchiveTypeIndicators(
         file_entry.path_spec)
 
@@ -216,11 +276,14 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """Processes an compressed stream file (file that contains file entries).
 
     Args:
-      file_entry: A file entry object (instance of dfvfs.FileEntry).
+      file_entry: A file entry object (instance of CachedFileEntry).
 
     Returns:
       A boolean indicating if the file is a compressed stream file.
     """
+    if not self._HasSignature(file_entry, self._COMPRESSED_STREAM_SIGNATURES):
+      return False
+
     type_indicators = analyzer.Analyzer.GetCompressedStreamTypeIndicators(
         file_entry.path_spec)
 
@@ -285,12 +348,28 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
   def GetStatus(self):
     """Returns a status dictionary."""
-    return {
+    status = {
         'is_running': self._is_running,
         'identifier': u'Worker_{0:d}'.format(self._identifier),
         'current_file': self._current_working_file,
+        'is_processing_file_entry': self._is_processing_file_entry,
         'counter': self._parser_context.number_of_events}
 
+    status['file_data_cache_hits'] = self._file_data_cache.number_of_hits
+    status['file_data_cache_misses'] = self._file_data_cache.number_of_misses
+    status['file_data_cache_evictions'] = (
+        self._file_data_cache.number_of_evictions)
+
+    if self._file_entry_classifier:
+      status['number_of_classified_files'] = (
+          self._file_entry_classifier.number_of_classified_files)
+      status['number_of_dispatched_parsers'] = (
+          self._file_entry_classifier.number_of_dispatched_parsers)
+      status['number_of_skipped_parsers'] = (
+          self._file_entry_classifier.number_of_skipped_parsers)
+
+    return status
+
   def InitalizeParserObjects(self, parser_filter_string=None):
     """Initializes the parser objects.
 
@@ -307,12 +386,19 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     """
     self._parser_objects = parsers_manager.ParsersManager.GetParserObjects(
         parser_filter_string=parser_filter_string)
+    self._parser_names = [
+        parser_object.NAME for parser_object in self._parser_objects]
 
     for parser_object in self._parser_objects:
       if parser_object.NAME == 'filestat':
         self._filestat_parser_object = parser_object
         break
 
+    format_signatures = parsers_manager.ParsersManager.GetFormatSignatures(
+        parser_filter_string=parser_filter_string)
+    self._file_entry_classifier = classifier.FileEntryClassifier(
+        self._parser_objects, format_signatures)
+
   def ParseFileEntry(self, file_entry):
     """Parses a file entry.
 
@@ -325,23 +411,40 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     self._current_working_file = getattr(
         file_entry.path_spec, u'location', file_entry.name)
 
+    fingerprint = None
+    if self._file_entry_fingerprints is not None:
+      fingerprint = file_hashes.CalculateFileEntryFingerprint(
+          file_entry, self._parser_names)
+
+      if fingerprint in self._previous_fingerprints:
+        logging.debug(u'[ParseFileEntry] Skipping unchanged: {0:s}'.format(
+            file_entry.path_spec.comparable))
+        return
+
     is_archive = False
     is_compressed_stream = False
     is_file = file_entry.IsFile()
 
     if is_file:
-      is_compressed_stream = self._ProcessCompressedStreamFile(file_entry)
+      # The signature probes and the parsers share the file data cache so
+      # that the file data is only read once from the source.
+      cached_file_entry = file_cache.CachedFileEntry(
+          self._file_data_cache, file_entry)
+
+      is_compressed_stream = self._ProcessCompressedStreamFile(
+          cached_file_entry)
       if not is_compressed_stream:
-        is_archive = self._ProcessArchiveFile(file_entry)
+        is_archive = self._ProcessArchiveFile(cached_file_entry)
 
     if is_file and not is_archive and not is_compressed_stream:
-      # TODO: Not go through all parsers, just the ones
-      # that the classifier classifies the file as.
-      for parser_object in self._parser_objects:
+      # Only apply the parsers that the classifier classifies the file as
+      # and the parsers that do not define format signatures.
+      for parser_object in self._file_entry_classifier.Classify(
+          cached_file_entry):
         logging.debug(u'Trying to parse: {0:s} with parser: {1:s}'.format(
             file_entry.name, parser_object.NAME))
 
-        self._ParseFileEntryWithParser(parser_object, file_entry)
+        self._ParseFileEntryWithParser(parser_object, cached_file_entry)
 
     elif self._filestat_parser_object:
       # TODO: for archive and compressed stream files is the desired behavior
@@ -351,6 +454,9 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     logging.debug(u'[ParseFileEntry] Done parsing: {0:s}'.format(
         file_entry.path_spec.comparable))
 
+    if fingerprint is not None:
+      self._file_entry_fingerprints.Add(fingerprint)
+
     if self._enable_profiling:
       self._ProfilingUpdate()
 
@@ -369,6 +475,12 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
 
     self.ConsumeItems()
 
+    # Make sure event objects buffered by a batching producer are not lost.
+    self._event_queue_producer.Flush()
+
+    if self._file_entry_fingerprints is not None:
+      self._file_entry_fingerprints.Close()
+
     logging.info(
         u'Worker {0:d} (PID: {1:d}) stopped monitoring process queue.'.format(
             self._identifier, os.getpid()))
@@ -380,6 +492,7 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     if self._enable_profiling:
       self._ProfilingStop()
 
+    self._file_data_cache.Empty()
     self._resolver_context.Empty()
 
   def SetEnableDebugOutput(self, enable_debug_output):
@@ -408,6 +521,24 @@ class BaseEventExtractionWorker(queue.ItemQueueConsumer):
     if self._enable_profiling and not self._heapy:
       self._heapy = hpy()
 
+  def SetFileEntryFingerprints(self, previous_fingerprints, fingerprints_path):
+    """Sets the file entry fingerprints for incremental extraction.
+
+       File entries of which the fingerprint is in the set of the previous
+       run are skipped, the fingerprints of the other file entries are
+       stored after they are parsed.
+
+    Args:
+      previous_fingerprints: The set of fingerprints of the file entries
+                             extracted by previous runs.
+      fingerprints_path: The path of the database file that stores the
+                         fingerprints of the file entries extracted by
+                         the worker.
+    """
+    self._previous_fingerprints = previous_fingerprints
+    self._file_entry_fingerprints = file_hashes.FileHashSet(
+        path=fingerprints_path)
+
   def SetFilterObject(self, filter_object):
     """Sets the filter object.
 
@@ -16,12 +16,15 @@
 # limitations under the License.
 """This file contains definition for a list of ObjectFilter."""
 import os
+import re
 import yaml
 import logging
 
 from plaso.lib import errors
 from plaso.lib import filter_interface
+from plaso.lib import objectfilter
 from plaso.lib import pfilter
+from plaso.lib import utils
 
 
 def IncludeKeyword(loader, node):
@@ -38,6 +41,233 @@ def IncludeKeyword(loader, node):
   return data
 
 
+def BuildSubstringPattern(terms):
+  """Builds a regular expression that matches any of the terms.
+
+  The terms are stored in a trie that is converted into nested alternations,
+  so that the regular expression engine matches the common prefixes of the
+  terms once instead of trying every term at every offset.
+
+  Args:
+    terms: a list of Unicode strings.
+
+  Returns:
+    A Unicode string containing the regular expression pattern.
+  """
+  trie = {}
+  for term in terms:
+    node = trie
+    for character in term:
+      # A shorter term with the same prefix already matches.
+      if u'' in node:
+        break
+      node = node.setdefault(character, {})
+
+    else:
+      node.clear()
+      node[u''] = True
+
+  return _BuildTriePattern(trie)
+
+
+def _BuildTriePattern(node):
+  """Builds the regular expression pattern of a trie node.
+
+  Args:
+    node: a dictionary containing the child nodes per character, where the
+          empty string marks the end of a term.
+
+  Returns:
+    A Unicode string containing the regular expression pattern.
+  """
+  pattern = []
+  while len(node) == 1 and u'' not in node:
+    character, node = node.items()[0]
+    pattern.append(re.escape(character))
+
+  if u'' not in node:
+    alternatives = [
+        re.escape(character) + _BuildTriePattern(node[character])
+        for character in sorted(node.keys())]
+    pattern.append(u'(?:{0:s})'.format(u'|'.join(alternatives)))
+
+  return u''.join(pattern)
+
+
+class AttributePatternMatcher(object):
+  """Class that matches the patterns of many filters on a single attribute.
+
+  The equals terms are looked up in a dictionary. The contains terms and
+  regular expressions are combined into regular expressions that are used
+  to determine if any of them can match, so that the attribute value is
+  scanned once instead of once per filter.
+  """
+
+  # The maximum number of regular expressions per combined regular expression.
+  _MAXIMUM_NUMBER_OF_REGEXPS = 100
+
+  # Python 2 limits the number of groups in a regular expression to 100.
+  _MAXIMUM_NUMBER_OF_GROUPS = 99
+
+  # Regular expressions with global flags or back references cannot be
+  # combined with other regular expressions.
+  _UNCOMBINABLE_REGEXP = re.compile(r'\(\?[iLmsux]+\)|\\[1-9]|\(\?P=')
+
+  def __init__(self, value_expander, attribute_name):
+    """Initializes the attribute pattern matcher.
+
+    Args:
+      value_expander: the value expander (instance of PlasoValueExpander).
+      attribute_name: the lower case name of the attribute.
+    """
+    super(AttributePatternMatcher, self).__init__()
+    self._contains_filters = []
+    self._contains_regexp = None
+    self._equals_filters = {}
+    self._get_value = pfilter.CompiledFilter.CompileValueGetter(
+        value_expander, attribute_name)
+    self._regexp_filters = []
+    self._regexp_groups = []
+
+    self.attribute_name = attribute_name
+
+  def _CompileRegexpGroups(self):
+    """Combines the regular expressions into groups."""
+    self._regexp_groups = []
+
+    regexp_filters_per_flags = {}
+    for index, filter_object in self._regexp_filters:
+      if self._UNCOMBINABLE_REGEXP.search(filter_object.compiled_re.pattern):
+        self._regexp_groups.append((None, [(index, filter_object)]))
+        continue
+
+      regexp_filters = regexp_filters_per_flags.setdefault(
+          filter_object.compiled_re.flags, [[]])
+      number_of_groups = sum([
+          regexp_filter.compiled_re.groups
+          for _, regexp_filter in regexp_filters[-1]])
+      number_of_groups += filter_object.compiled_re.groups
+
+      if (len(regexp_filters[-1]) >= self._MAXIMUM_NUMBER_OF_REGEXPS or
+          number_of_groups > self._MAXIMUM_NUMBER_OF_GROUPS):
+        regexp_filters.append([])
+      regexp_filters[-1].append((index, filter_object))
+
+    for flags, regexp_filters_list in regexp_filters_per_flags.iteritems():
+      for regexp_filters in regexp_filters_list:
+        if len(regexp_filters) == 1:
+          self._regexp_groups.append((None, regexp_filters))
+          continue
+
+        pattern = u'|'.join([
+            u'(?:{0:s})'.format(regexp_filter.compiled_re.pattern)
+            for _, regexp_filter in regexp_filters])
+        try:
+          combined_regexp = re.compile(pattern, flags)
+        except (AssertionError, re.error):
+          combined_regexp = None
+
+        self._regexp_groups.append((combined_regexp, regexp_filters))
+
+  def _Operate(self, filter_object, value):
+    """Determines if the operation of a filter matches a value.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+      value: the attribute value.
+
+    Returns:
+      A boolean value indicating the value matches.
+    """
+    try:
+      return bool(filter_object.Operation(value, filter_object.right_operand))
+    except (ValueError, TypeError):
+      return False
+
+  def AddFilter(self, index, filter_object):
+    """Adds a filter.
+
+    Args:
+      index: the index of the filter in the filter list.
+      filter_object: the filter object (instance of objectfilter.Contains,
+                     objectfilter.Equals or objectfilter.Regexp).
+    """
+    if isinstance(filter_object, objectfilter.Regexp):
+      self._regexp_filters.append((index, filter_object))
+
+    elif isinstance(filter_object, objectfilter.Contains):
+      self._contains_filters.append((index, filter_object))
+
+    else:
+      self._equals_filters.setdefault(filter_object.right_operand, []).append(
+          index)
+
+  def Compile(self):
+    """Compiles the combined regular expressions of the filters."""
+    self._contains_regexp = None
+    if self._contains_filters:
+      terms = [
+          unicode(filter_object.right_operand).lower()
+          for _, filter_object in self._contains_filters]
+      self._contains_regexp = re.compile(BuildSubstringPattern(terms))
+
+    self._CompileRegexpGroups()
+
+  def GetMatchingIndexes(self, event_object, cache):
+    """Determines the filters that match an event object.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+      cache: a dictionary that caches the formatted strings of the event
+             object.
+
+    Returns:
+      A set containing the indexes of the matching filters.
+    """
+    matching_indexes = set()
+
+    value = self._get_value(event_object, cache)
+    if value is None:
+      return matching_indexes
+
+    if self._equals_filters:
+      try:
+        matching_indexes.update(self._equals_filters.get(value, []))
+      except TypeError:
+        pass
+
+    if self._contains_filters:
+      if type(value) not in (str, unicode):
+        contains_filters = self._contains_filters
+      elif self._contains_regexp.search(value.lower()):
+        contains_filters = self._contains_filters
+      else:
+        contains_filters = []
+
+      for index, filter_object in contains_filters:
+        if index not in matching_indexes and self._Operate(
+            filter_object, value):
+          matching_indexes.add(index)
+
+    if self._regexp_groups:
+      try:
+        unicode_value = utils.GetUnicodeString(value)
+      except (ValueError, TypeError):
+        return matching_indexes
+
+      for combined_regexp, regexp_filters in self._regexp_groups:
+        if combined_regexp and not combined_regexp.search(unicode_value):
+          continue
+
+        for index, filter_object in regexp_filters:
+          if index not in matching_indexes and filter_object.compiled_re.search(
+              unicode_value):
+            matching_indexes.add(index)
+
+    return matching_indexes
+
+
 class ObjectFilterList(filter_interface.FilterObject):
   """A series of Pfilter filters along with metadata."""
 
@@ -60,6 +290,9 @@ class ObjectFilterList(filter_interface.FilterObject):
             u'Unable to parse YAML file with error: {0:s}.'.format(exception))
 
     self.filters = []
+    self._attribute_pattern_matchers = {}
+    self._other_filter_indexes = []
+
     if type(results) is dict:
       self._ParseEntry(results)
     elif type(results) is list:
@@ -74,6 +307,122 @@ class ObjectFilterList(filter_interface.FilterObject):
           u'Wrong format of YAML file, entry not a dict ({})'.format(
               type(result)))
 
+    self._CompilePatternMatchers()
+
+  def _CompilePatternMatchers(self):
+    """Groups the pattern filters per attribute.
+
+    Filters that consist of contains, equals and regular expression
+    conditions on single attributes, optionally combined with OR, are
+    matched by attribute pattern matchers. All other filters are matched
+    one by one.
+    """
+    for index, (_, matcher, _) in enumerate(self.filters):
+      pattern_filters = self._GetPatternFilters(
+          getattr(matcher, 'filter_object', matcher))
+      if pattern_filters is None:
+        self._other_filter_indexes.append(index)
+        continue
+
+      for filter_object in pattern_filters:
+        attribute_name = filter_object.left_operand.lower()
+        if attribute_name not in self._attribute_pattern_matchers:
+          self._attribute_pattern_matchers[attribute_name] = (
+              AttributePatternMatcher(
+                  filter_object.value_expander, attribute_name))
+
+        self._attribute_pattern_matchers[attribute_name].AddFilter(
+            index, filter_object)
+
+    for attribute_pattern_matcher in self._attribute_pattern_matchers.values():
+      attribute_pattern_matcher.Compile()
+
+  def _GetMatchingIndexes(self, event_object, first_only=False):
+    """Determines the filters that match an event object.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+      first_only: optional boolean value to indicate only the first matching
+                  filter should be determined. The default is False.
+
+    Returns:
+      A sorted list containing the indexes of the matching filters.
+    """
+    cache = {}
+    matching_indexes = set()
+    for attribute_pattern_matcher in self._attribute_pattern_matchers.values():
+      matching_indexes.update(attribute_pattern_matcher.GetMatchingIndexes(
+          event_object, cache))
+
+    if first_only and matching_indexes:
+      first_index = min(matching_indexes)
+      matching_indexes = set([first_index])
+    else:
+      first_index = len(self.filters)
+
+    for index in self._other_filter_indexes:
+      if first_only and index > first_index:
+        break
+
+      _, matcher, _ = self.filters[index]
+      if matcher.Matches(event_object):
+        matching_indexes.add(index)
+        if first_only:
+          return [index]
+
+    return sorted(matching_indexes)
+
+  def _GetPatternFilters(self, filter_object):
+    """Retrieves the pattern filters of a filter.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter).
+
+    Returns:
+      A list of pattern filter objects (instances of objectfilter.Contains,
+      objectfilter.Equals or objectfilter.Regexp) that are combined with OR
+      or None if the filter is not only made up of pattern filters.
+    """
+    if isinstance(filter_object, objectfilter.OrFilter):
+      pattern_filters = []
+      for child_filter in filter_object.args:
+        child_pattern_filters = self._GetPatternFilters(child_filter)
+        if child_pattern_filters is None:
+          return
+        pattern_filters.extend(child_pattern_filters)
+
+      return pattern_filters or None
+
+    if type(filter_object) not in (
+        objectfilter.Contains, objectfilter.Equals, objectfilter.Regexp,
+        objectfilter.RegexpInsensitive):
+      return
+
+    attribute_name = filter_object.left_operand
+    if (not filter_object.bool_value or
+        type(filter_object.value_expander) != pfilter.PlasoValueExpander or
+        not isinstance(attribute_name, basestring) or
+        filter_object.value_expander.FIELD_SEPARATOR in attribute_name):
+      return
+
+    right_operand = filter_object.right_operand
+    if isinstance(filter_object, objectfilter.Contains):
+      if type(right_operand) not in (str, unicode):
+        return
+
+      try:
+        unicode(right_operand)
+      except UnicodeDecodeError:
+        return
+
+    elif isinstance(filter_object, objectfilter.Equals):
+      try:
+        hash(right_operand)
+      except TypeError:
+        return
+
+    return [filter_object]
+
   def _ParseEntry(self, entry):
     """Parse a single YAML filter entry."""
     # A single file with a list of filters to parse.
@@ -96,14 +445,29 @@ class ObjectFilterList(filter_interface.FilterObject):
     if not self.filters:
       return True
 
-    for name, matcher, meta in self.filters:
-      self._decision = matcher.Matches(event_object)
-      if self._decision:
-        self._reason = u'[{}] {} {}'.format(
-            name, meta.get('description', 'N/A'), u' - '.join(
-                meta.get('urls', [])))
-        return True
+    matching_indexes = self._GetMatchingIndexes(event_object, first_only=True)
+    self._decision = bool(matching_indexes)
+    if not self._decision:
+      return False
+
+    name, _, meta = self.filters[matching_indexes[0]]
+    self._reason = u'[{}] {} {}'.format(
+        name, meta.get('description', 'N/A'), u' - '.join(
+            meta.get('urls', [])))
+    return True
+
+  def GetMatchingFilterNames(self, event_object):
+    """Determines the names of all filters that match an event object.
+
+    Args:
+      event_object: the event object (instance of EventObject).
 
-    return False
+    Returns:
+      A list of the names of the matching filters, in the order the filters
+      are defined.
+    """
+    return [
+        self.filters[index][0]
+        for index in self._GetMatchingIndexes(event_object)]
 
 
@@ -24,6 +24,7 @@ import unittest
 
 from plaso.filters import filterlist
 from plaso.filters import test_helper
+from plaso.lib import event
 
 
 class ObjectFilterTest(test_helper.FilterTestHelper):
@@ -93,6 +94,81 @@ class ObjectFilterTest(test_helper.FilterTestHelper):
 
     self.CreateFileAndTest(collection)
 
+  def testBuildSubstringPattern(self):
+    """Tests the BuildSubstringPattern function."""
+    pattern = filterlist.BuildSubstringPattern(
+        [u'evil', u'evilcorp', u'bad', u'ba', u'a.b'])
+    self.assertEquals(pattern, u'(?:a\\.b|ba|evil)')
+
+  def testMatch(self):
+    """Tests the Match and GetMatchingFilterNames functions."""
+    collection = u'\n'.join([
+        u'Parser_And_Inode:',
+        u'  description: Not a pattern filter.',
+        u'  filter: parser is "Weirdo" and inode is 1245',
+        u'',
+        u'Evil_Path:',
+        u'  description: Known bad path.',
+        u'  urls: [example.com]',
+        u'  filter: filename contains "hideout" or filename contains "lair"',
+        u'',
+        u'Evil_Host:',
+        u'  description: Known bad host.',
+        u'  filter: hostname is "Agrabah"',
+        u'',
+        u'Evil_Text:',
+        u'  description: Known bad text.',
+        u'  filter: text iregexp "DR\\.? EVIL"',
+        u'',
+        u'Other_Text:',
+        u'  description: Not matching.',
+        u'  filter: text regexp "dr evil" or text contains "mini-me"'])
+
+    with tempfile.NamedTemporaryFile(delete=False) as file_object:
+      name = file_object.name
+      file_object.write(collection)
+
+    try:
+      self.test_filter.CompileFilter(name)
+    finally:
+      os.remove(name)
+
+    event_object = event.EventObject()
+    event_object.filename = (
+        u'/My Documents/goodfella/Documents/Hideout/myfile.txt')
+    event_object.hostname = 'Agrabah'
+    event_object.inode = 1245
+    event_object.parser = 'Weirdo'
+    event_object.text = (
+        u'User did a very bad thing, bad, bad thing that awoke Dr. Evil.')
+
+    self.assertTrue(self.test_filter.Match(event_object))
+    self.assertEquals(
+        self.test_filter.last_reason,
+        u'[Parser_And_Inode] Not a pattern filter. ')
+    self.assertEquals(
+        self.test_filter.GetMatchingFilterNames(event_object),
+        [u'Parser_And_Inode', u'Evil_Path', u'Evil_Host', u'Evil_Text'])
+
+    event_object.parser = 'Other'
+    self.assertTrue(self.test_filter.Match(event_object))
+    self.assertEquals(
+        self.test_filter.last_reason,
+        u'[Evil_Path] Known bad path. example.com')
+
+    event_object = event.EventObject()
+    event_object.filename = u'/tmp/file.txt'
+    event_object.text = u'Mini-Me'
+
+    self.assertTrue(self.test_filter.Match(event_object))
+    self.assertEquals(
+        self.test_filter.GetMatchingFilterNames(event_object), [u'Other_Text'])
+
+    event_object.text = u'Mini Me'
+    self.assertFalse(self.test_filter.Match(event_object))
+    self.assertEquals(
+        self.test_filter.GetMatchingFilterNames(event_object), [])
+
 
 if __name__ == '__main__':
   unittest.main()
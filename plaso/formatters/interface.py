@@ -18,10 +18,98 @@
 """This file contains the event formatters interface classes."""
 
 import re
+import string
 
 from plaso.lib import errors
 
 
+# The maximum number of compiled format strings that are cached.
+_MAXIMUM_NUMBER_OF_COMPILED_FORMAT_STRINGS = 4096
+
+# Dictionary containing the compiled format strings, the format string
+# is used as the key.
+_compiled_format_strings = {}
+
+_ATTRIBUTE_NAME_RE = re.compile(r'^[a-zA-Z_][a-zA-Z0-9_]*$')
+
+_STRING_FORMATTER = string.Formatter()
+
+
+def _CompileFormatString(format_string):
+  """Compiles a format string into a format function.
+
+     The format string is parsed only once instead of every time it is used.
+     Format strings that use positional, indexed or nested fields are not
+     compiled and fall back to format().
+
+  Args:
+    format_string: the format string.
+
+  Returns:
+    A function that takes a dictionary containing the attribute values
+    and returns the formatted string. The function raises KeyError if
+    an attribute is missing, similar to format().
+  """
+  def _FallbackFormat(event_values):
+    """Formats the format string with format()."""
+    return format_string.format(**event_values)
+
+  try:
+    parsed_format_string = list(_STRING_FORMATTER.parse(format_string))
+  except ValueError:
+    return _FallbackFormat
+
+  for _, field_name, format_spec, conversion in parsed_format_string:
+    if field_name is None:
+      continue
+    if (not _ATTRIBUTE_NAME_RE.match(field_name) or u'{' in format_spec or
+        conversion not in (None, u's', u'r')):
+      return _FallbackFormat
+
+  def _Format(event_values):
+    """Formats the parsed format string."""
+    string_pieces = []
+    for literal_text, field_name, format_spec, conversion in (
+        parsed_format_string):
+      if literal_text:
+        string_pieces.append(literal_text)
+      if field_name is None:
+        continue
+
+      value = event_values[field_name]
+      if conversion == u's':
+        value = unicode(value)
+      elif conversion == u'r':
+        value = repr(value)
+      string_pieces.append(format(value, format_spec))
+
+    return u''.join(string_pieces)
+
+  return _Format
+
+
+def GetFormatFunction(format_string):
+  """Retrieves the compiled format function of a format string.
+
+  Args:
+    format_string: the format string.
+
+  Returns:
+    A function that takes a dictionary containing the attribute values
+    and returns the formatted string, see _CompileFormatString.
+  """
+  format_function = _compiled_format_strings.get(format_string, None)
+  if not format_function:
+    if len(_compiled_format_strings) >= (
+        _MAXIMUM_NUMBER_OF_COMPILED_FORMAT_STRINGS):
+      _compiled_format_strings.clear()
+
+    format_function = _CompileFormatString(format_string)
+    _compiled_format_strings[format_string] = format_function
+
+  return format_function
+
+
 class EventFormatter(object):
   """Base class to format event type specific data using a format string.
 
@@ -83,7 +171,7 @@ class EventFormatter(object):
     event_values = event_object.GetValues()
 
     try:
-      msg = self.format_string.format(**event_values)
+      msg = GetFormatFunction(self.format_string)(event_values)
     except KeyError as exception:
       msgs = []
       msgs.append(u'Format error: [{0:s}] for: <{1:s}>'.format(
@@ -102,7 +190,7 @@ class EventFormatter(object):
       msg_short = msg
     else:
       try:
-        msg_short = self.format_string_short.format(**event_values)
+        msg_short = GetFormatFunction(self.format_string_short)(event_values)
         # Using replace function here because it is faster
         # than re.sub() or string.strip().
         msg_short = msg_short.replace('\r', u'').replace('\n', u'')
@@ -150,12 +238,15 @@ class ConditionalEventFormatter(EventFormatter):
     """Initializes the conditional formatter.
 
        A map is build of the string pieces and their corresponding attribute
-       name to optimize conditional string formatting.
+       name to optimize conditional string formatting. The format strings
+       are cached per separator and set of format string pieces used.
 
     Raises:
       RuntimeError: when an invalid format string piece is encountered.
     """
     super(ConditionalEventFormatter, self).__init__()
+    self._format_strings = {}
+    self._format_strings_short = {}
 
     # The format string can be defined as:
     # {name}, {name:format}, {name!conversion}, {name!conversion:format}
@@ -215,26 +306,38 @@ class ConditionalEventFormatter(EventFormatter):
 
     # Using getattr here to make sure the attribute is not set to None.
     # if A.b = None, hasattr(A, b) is True but getattr(A, b, None) is False.
-    string_pieces = []
+    map_indexes = []
     for map_index, attribute_name in enumerate(self._format_string_pieces_map):
-      if not attribute_name or hasattr(event_object, attribute_name):
-        if attribute_name:
-          attribute = getattr(event_object, attribute_name, None)
-          # If an attribute is an int, yet has zero value we want to include
-          # that in the format string, since that is still potentially valid
-          # information. Otherwise we would like to skip it.
-          if type(attribute) not in (bool, int, long, float) and not attribute:
-            continue
-        string_pieces.append(self.FORMAT_STRING_PIECES[map_index])
-    self.format_string = unicode(
-        self.FORMAT_STRING_SEPARATOR.join(string_pieces))
-
-    string_pieces = []
+      if attribute_name:
+        attribute = getattr(event_object, attribute_name, None)
+        # If an attribute is an int, yet has zero value we want to include
+        # that in the format string, since that is still potentially valid
+        # information. Otherwise we would like to skip it.
+        if type(attribute) not in (bool, int, long, float) and not attribute:
+          continue
+      map_indexes.append(map_index)
+
+    key = (self.FORMAT_STRING_SEPARATOR, tuple(map_indexes))
+    format_string = self._format_strings.get(key, None)
+    if format_string is None:
+      format_string = unicode(self.FORMAT_STRING_SEPARATOR.join([
+          self.FORMAT_STRING_PIECES[map_index] for map_index in map_indexes]))
+      self._format_strings[key] = format_string
+    self.format_string = format_string
+
+    map_indexes = []
     for map_index, attribute_name in enumerate(
         self._format_string_short_pieces_map):
       if not attribute_name or getattr(event_object, attribute_name, None):
-        string_pieces.append(self.FORMAT_STRING_SHORT_PIECES[map_index])
-    self.format_string_short = unicode(
-        self.FORMAT_STRING_SEPARATOR.join(string_pieces))
+        map_indexes.append(map_index)
+
+    key = (self.FORMAT_STRING_SEPARATOR, tuple(map_indexes))
+    format_string = self._format_strings_short.get(key, None)
+    if format_string is None:
+      format_string = unicode(self.FORMAT_STRING_SEPARATOR.join([
+          self.FORMAT_STRING_SHORT_PIECES[map_index]
+          for map_index in map_indexes]))
+      self._format_strings_short[key] = format_string
+    self.format_string_short = format_string
 
     return super(ConditionalEventFormatter, self).GetMessages(event_object)
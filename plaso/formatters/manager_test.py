@@ -184,6 +184,49 @@ class ConditionalEventFormatterUnitTest(unittest.TestCase):
         u'Text: but we\'re still trying to say something about the event')
     self.assertEquals(msg, expected_msg)
 
+    # The format string is cached per set of attributes that is present.
+    msg, _ = event_formatter.GetMessages(self.event_object)
+    self.assertEquals(msg, expected_msg)
+
+    self.event_object.optional = u'present'
+    msg, _ = event_formatter.GetMessages(self.event_object)
+    self.assertEquals(msg, (
+        u'Description: this is beyond words Comment Value: 0x0c '
+        u'Optional: present Text: but we\'re still trying to say something '
+        u'about the event'))
+
+    event_formatter.FORMAT_STRING_SEPARATOR = u'<|>'
+    msg, _ = event_formatter.GetMessages(self.event_object)
+    self.assertEquals(msg, (
+        u'Description: this is beyond words<|>Comment<|>Value: 0x0c<|>'
+        u'Optional: present<|>Text: but we\'re still trying to say something '
+        u'about the event'))
+
+
+class GetFormatFunctionTest(unittest.TestCase):
+  """Tests for the GetFormatFunction function."""
+
+  def testGetFormatFunction(self):
+    """Test that the format function formats the same as format()."""
+    event_values = {
+        'flags': 0x1f, 'name': u'\xe9vil', 'number': 3, 'text': 'text'}
+
+    for format_string in [
+        u'', u'Text only', u'{name}', u'Name: {name} number: {number:d}',
+        u'{flags:08x} {{escaped}} {name!r} {number!s} {text:>8}',
+        u'{name[0]}']:
+      format_function = interface.GetFormatFunction(format_string)
+      self.assertEquals(
+          format_function(event_values), format_string.format(**event_values))
+
+    self.assertEquals(
+        interface.GetFormatFunction(u'{name}'),
+        interface.GetFormatFunction(u'{name}'))
+
+    format_function = interface.GetFormatFunction(u'{missing}')
+    with self.assertRaises(KeyError):
+      format_function(event_values)
+
 
 if __name__ == '__main__':
   unittest.main()
@@ -22,7 +22,9 @@ import locale
 import logging
 import os
 import pdb
+import shutil
 import sys
+import tempfile
 import traceback
 
 from dfvfs.helpers import source_scanner
@@ -34,6 +36,8 @@ from dfvfs.volume import vshadow_volume_system
 
 import plaso
 from plaso import parsers   # pylint: disable=unused-import
+from plaso.engine import file_hashes
+from plaso.engine import queue
 from plaso.engine import single_process
 from plaso.engine import utils as engine_utils
 from plaso.engine import worker
@@ -618,6 +622,21 @@ class StorageMediaFrontend(Frontend):
             u'separated values). Ranges and lists can also be combined as: '
             u'\'1,3..5\'. The first store is 1.'))
 
+    argument_group.add_argument(
+        '--vss_skip_duplicates', '--vss-skip-duplicates',
+        dest='vss_skip_duplicates', action='store_true', default=False,
+        help=(
+            u'Skip files in Volume Shadow Snapshots (VSS) that have the same '
+            u'inode and timestamps as a previously collected file.'))
+
+    argument_group.add_argument(
+        '--vss_file_hashes', '--vss-file-hashes', dest='vss_file_hashes',
+        action='store', type=unicode, default=None, metavar='PATH', help=(
+            u'Path of a database file to store the inode and timestamp '
+            u'hashes of the collected files in. Implies '
+            u'--vss_skip_duplicates. If the file exists, the files collected '
+            u'by a previous run are skipped.'))
+
   # TODO: remove this when support to handle multiple partitions is added.
   def GetSourcePathSpec(self):
     """Retrieves the source path specification.
@@ -852,6 +871,8 @@ class ExtractionFrontend(StorageMediaFrontend):
     self._engine = None
     self._filter_expression = None
     self._filter_object = None
+    self._fingerprints_directory = None
+    self._incremental_extraction = False
     self._mount_path = None
     self._number_of_worker_processes = 0
     self._old_preprocess = False
@@ -861,6 +882,7 @@ class ExtractionFrontend(StorageMediaFrontend):
     self._preprocess = False
     self._process_archive_files = False
     self._profiling_sample_rate = self._DEFAULT_PROFILING_SAMPLE_RATE
+    self._queue_batch_size = None
     self._queue_size = self._DEFAULT_QUEUE_SIZE
     self._run_foreman = True
     self._single_process_mode = False
@@ -911,6 +933,10 @@ class ExtractionFrontend(StorageMediaFrontend):
     if self._engine:
       self._engine.SignalAbort()
 
+    if self._fingerprints_directory:
+      shutil.rmtree(self._fingerprints_directory, True)
+      self._fingerprints_directory = None
+
   def _DebugPrintCollector(self, options):
     """Prints debug information about the collector.
 
@@ -1100,11 +1126,18 @@ class ExtractionFrontend(StorageMediaFrontend):
     start_collection_process = True
 
     self._number_of_worker_processes = getattr(options, 'workers', 0)
+    minimum_number_of_workers = getattr(options, 'minimum_workers', None)
+    maximum_number_of_workers = getattr(options, 'maximum_workers', None)
+
+    worker_timeout = getattr(options, 'worker_timeout', None)
+    if worker_timeout:
+      worker_timeout = int(worker_timeout * 60)
 
     logging.info(u'Starting extraction in multi process mode.')
 
     self._engine = multi_process.MultiProcessEngine(
-        maximum_number_of_queued_items=self._queue_size)
+        maximum_number_of_queued_items=self._queue_size,
+        maximum_number_of_batched_events=self._queue_batch_size)
 
     self._engine.SetEnableDebugOutput(self._debug_mode)
     self._engine.SetEnableProfiling(
@@ -1160,6 +1193,9 @@ class ExtractionFrontend(StorageMediaFrontend):
         include_directory_stat, vss_stores=self._vss_stores,
         filter_find_specs=filter_find_specs, resolver_context=resolver_context)
 
+    self._SetCollectorOptions(options)
+    self._SetFileEntryFingerprints()
+
     self._DebugPrintCollector(options)
 
     if self._output_module:
@@ -1172,6 +1208,11 @@ class ExtractionFrontend(StorageMediaFrontend):
           buffer_size=self._buffer_size, pre_obj=pre_obj,
           serializer_format=self._storage_serializer_format)
 
+      # The storage file writer appends event objects serialized by the
+      # workers without having to serialize them itself.
+      self._engine.SetEventObjectSerializerFormat(
+          self._storage_serializer_format)
+
     try:
       self._engine.ProcessSource(
           self._collector, storage_writer,
@@ -1179,12 +1220,17 @@ class ExtractionFrontend(StorageMediaFrontend):
           number_of_extraction_workers=self._number_of_worker_processes,
           have_collection_process=start_collection_process,
           have_foreman_process=self._run_foreman,
-          show_memory_usage=self._show_worker_memory_information)
+          show_memory_usage=self._show_worker_memory_information,
+          minimum_number_of_extraction_workers=minimum_number_of_workers,
+          maximum_number_of_extraction_workers=maximum_number_of_workers,
+          worker_timeout=worker_timeout)
 
     except KeyboardInterrupt:
       self._CleanUpAfterAbort()
       raise errors.UserAbort(u'Process source aborted.')
 
+    self._StoreFileEntryFingerprints()
+
   def _ProcessSourceSingleProcessMode(self, options):
     """Processes the source in a single process.
 
@@ -1204,6 +1250,55 @@ class ExtractionFrontend(StorageMediaFrontend):
       if self._debug_mode:
         pdb.post_mortem()
 
+  def _SetCollectorOptions(self, options):
+    """Sets the collector options.
+
+    Args:
+      options: the command line arguments (instance of argparse.Namespace).
+    """
+    if getattr(options, 'inode_order', False):
+      self._collector.SetCollectInInodeOrder(True)
+
+    number_of_collection_threads = getattr(options, 'collection_threads', 0)
+    if number_of_collection_threads > 1:
+      self._collector.SetNumberOfCollectionThreads(
+          number_of_collection_threads)
+
+    file_hashes_path = getattr(options, 'vss_file_hashes', None)
+    if getattr(options, 'vss_skip_duplicates', False) or file_hashes_path:
+      self._collector.SetDuplicateFileCheck(
+          True, file_hashes_path=file_hashes_path)
+
+  def _SetFileEntryFingerprints(self):
+    """Sets the file entry fingerprints for incremental extraction.
+
+       The fingerprints of the file entries extracted by previous runs are
+       read from the storage file, so that the collector and the extraction
+       workers skip the file entries that are unchanged.
+    """
+    if not self._incremental_extraction:
+      return
+
+    if self._output_module:
+      logging.warning(
+          u'Incremental extraction is not supported with an output module.')
+      return
+
+    fingerprints = set()
+    if os.path.isfile(self._storage_file_path):
+      with storage.StorageFile(
+          self._storage_file_path, read_only=True) as store:
+        fingerprints = store.GetFileEntryFingerprints()
+
+    logging.info((
+        u'Incremental extraction, skipping file entries that match one of '
+        u'{0:d} fingerprints of previous runs.').format(len(fingerprints)))
+
+    self._fingerprints_directory = tempfile.mkdtemp()
+    self._engine.SetFileEntryFingerprints(
+        fingerprints, self._fingerprints_directory)
+    self._collector.SetFileEntryFingerprints(fingerprints, self._parser_names)
+
   def _StartSingleThread(self, options):
     """Starts everything up in a single process.
 
@@ -1275,6 +1370,9 @@ class ExtractionFrontend(StorageMediaFrontend):
         filter_find_specs=filter_find_specs,
         resolver_context=self._resolver_context)
 
+    self._SetCollectorOptions(options)
+    self._SetFileEntryFingerprints()
+
     self._DebugPrintCollector(options)
 
     if self._output_module:
@@ -1299,6 +1397,35 @@ class ExtractionFrontend(StorageMediaFrontend):
     finally:
       self._resolver_context.Empty()
 
+    self._StoreFileEntryFingerprints()
+
+  def _StoreFileEntryFingerprints(self):
+    """Stores the fingerprints of the extracted file entries.
+
+       The fingerprints stored by the extraction workers are combined
+       and stored in the storage file.
+    """
+    if not self._fingerprints_directory:
+      return
+
+    try:
+      fingerprints = set()
+      for filename in os.listdir(self._fingerprints_directory):
+        file_hash_set = file_hashes.FileHashSet(path=os.path.join(
+            self._fingerprints_directory, filename))
+        fingerprints.update(file_hash_set)
+        file_hash_set.Close()
+
+      with storage.StorageFile(self._storage_file_path) as store:
+        store.StoreFileEntryFingerprints(fingerprints)
+
+      logging.info(u'Stored {0:d} file entry fingerprints.'.format(
+          len(fingerprints)))
+
+    finally:
+      shutil.rmtree(self._fingerprints_directory, True)
+      self._fingerprints_directory = None
+
   def AddExtractionOptions(self, argument_group):
     """Adds the extraction options to the argument group.
 
@@ -1315,6 +1442,15 @@ class ExtractionFrontend(StorageMediaFrontend):
             u'the storage file is used. This can be handy when parsing an '
             u'image that contains more than a single partition.'))
 
+    argument_group.add_argument(
+        '--incremental', dest='incremental', action='store_true',
+        default=False, help=(
+            u'Incremental extraction, store fingerprints of the extracted '
+            u'file entries in the storage file and skip the file entries '
+            u'that are unchanged since a previous incremental extraction '
+            u'into the same storage file. The fingerprint covers the path, '
+            u'size, timestamps and the parsers used.'))
+
   def AddInformationalOptions(self, argument_group):
     """Adds the informational options to the argument group.
 
@@ -1346,6 +1482,14 @@ class ExtractionFrontend(StorageMediaFrontend):
             u'The maximum number of queued items per worker '
             u'(defaults to {0:d})').format(self._DEFAULT_QUEUE_SIZE))
 
+    argument_group.add_argument(
+        '--queue_batch_size', '--queue-batch-size', dest='queue_batch_size',
+        action='store', default=0, help=(
+            u'The maximum number of event objects a worker sends to the '
+            u'storage process in a single batch in multi process mode '
+            u'(defaults to {0:d})').format(
+                queue.ItemQueueBatchProducer.DEFAULT_MAXIMUM_NUMBER_OF_ITEMS))
+
     if worker.BaseEventExtractionWorker.SupportsProfiling():
       argument_group.add_argument(
           '--profile', dest='enable_profiling', action='store_true',
@@ -1404,6 +1548,14 @@ class ExtractionFrontend(StorageMediaFrontend):
         raise errors.BadConfigOption(
             u'Invalid queue size: {0:s}.'.format(queue_size))
 
+    queue_batch_size = getattr(options, 'queue_batch_size', None)
+    if queue_batch_size:
+      try:
+        self._queue_batch_size = int(queue_batch_size, 10)
+      except ValueError:
+        raise errors.BadConfigOption(
+            u'Invalid queue batch size: {0:s}.'.format(queue_batch_size))
+
     self._enable_profiling = getattr(options, 'enable_profiling', False)
 
     profile_sample_rate = getattr(options, 'profile_sample_rate', None)
@@ -1434,6 +1586,7 @@ class ExtractionFrontend(StorageMediaFrontend):
     self._debug_mode = getattr(options, 'debug', False)
 
     self._old_preprocess = getattr(options, 'old_preprocess', False)
+    self._incremental_extraction = getattr(options, 'incremental', False)
 
     timezone_string = getattr(options, 'timezone', None)
     if timezone_string:
@@ -248,6 +248,43 @@ def Main():
       help=(u'The number of worker threads [defaults to available system '
             u'CPU\'s minus three].'))
 
+  performance_group.add_argument(
+      '--min_workers', '--min-workers', dest='minimum_workers',
+      action='store', type=int, default=None, help=(
+          u'The minimum number of worker processes. Setting a minimum or '
+          u'maximum number of worker processes enables adding and retiring '
+          u'worker processes during collection based on the process queue, '
+          u'the storage queue and the host load [defaults to 2 if '
+          u'enabled].'))
+
+  performance_group.add_argument(
+      '--max_workers', '--max-workers', dest='maximum_workers',
+      action='store', type=int, default=None, help=(
+          u'The maximum number of worker processes, see --min_workers '
+          u'[defaults to 15 if enabled].'))
+
+  performance_group.add_argument(
+      '--worker_timeout', '--worker-timeout', dest='worker_timeout',
+      action='store', type=float, default=None, help=(
+          u'The number of minutes after which a worker process that made no '
+          u'progress on a file is terminated and replaced by a new worker '
+          u'process. This requires the worker monitor [defaults to no '
+          u'timeout].'))
+
+  performance_group.add_argument(
+      '--collection_threads', '--collection-threads',
+      dest='collection_threads', action='store', type=int, default=0,
+      help=(u'The number of threads used to collect the files of the file '
+            u'systems of the source and VSS stores in parallel [defaults to '
+            u'collecting in a single thread].'))
+
+  performance_group.add_argument(
+      '--inode_order', '--inode-order', dest='inode_order',
+      action='store_true', default=False, help=(
+          u'Collect the files of storage media images in batches sorted by '
+          u'inode number, e.g. the MFT entry for NTFS, instead of in '
+          u'directory order. This reduces seeking in the image.'))
+
   # TODO: seems to be no longer used, remove.
   # function_group.add_argument(
   #     '-i', '--image', dest='image', action='store_true', default=False,
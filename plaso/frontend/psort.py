@@ -265,7 +265,20 @@ class PsortFrontend(frontend.AnalysisFrontend):
               self._storage_file_path, exception))
 
     with storage_file:
-      storage_file.SetStoreLimit(self._filter_object)
+      if self._filter_buffer:
+        # The time slice requires the events that do not match the filter,
+        # hence the filter cannot be used to skip events in the storage.
+        storage_file.SetStoreLimit()
+      else:
+        storage_file.SetStoreLimit(self._filter_object)
+
+      # Only decode the attributes of the event objects that are used by
+      # the filter and the output module.
+      storage_file.EnableLazyEventObjects()
+
+      prefetch = getattr(options, 'prefetch', None)
+      if prefetch:
+        storage_file.EnablePrefetching(use_processes=prefetch == 'processes')
 
       try:
         output_module = self._output_module_class(
@@ -355,12 +368,29 @@ class PsortFrontend(frontend.AnalysisFrontend):
       else:
         event_queue_producers = []
 
-      output_buffer = output_interface.EventBuffer(output_module, options.dedup)
+      # The output module is still used to read the sorted event objects
+      # from the storage when the events are formatted in parallel.
+      event_formatter = output_module
+      formatting_processes = getattr(options, 'formatting_processes', 0)
+      if formatting_processes > 1:
+        if output_interface.SupportsParallelFormatting(output_module):
+          event_formatter = output_interface.ParallelEventFormatter(
+              output_module, formatting_processes)
+        else:
+          logging.warning(
+              u'Output module does not support parallel formatting, '
+              u'formatting in a single process.')
+
+      output_buffer = output_interface.EventBuffer(
+          event_formatter, options.dedup)
       with output_buffer:
         counter = ProcessOutput(
             output_buffer, output_module, self._filter_object,
             self._filter_buffer, event_queue_producers)
 
+      # Events skipped by the storage based on the filter are filtered out.
+      counter['Events Filtered Out'] += storage_file.number_of_filtered_entries
+
       for information in storage_file.GetStorageInformation():
         if hasattr(information, 'counter'):
           counter['Stored Events'] += information.counter['total']
@@ -564,6 +594,11 @@ def ProcessOutput(
   if output_buffer.duplicate_counter:
     counter['Duplicate Removals'] = output_buffer.duplicate_counter
 
+  for parser_name, duplicate_counter in (
+      output_buffer.duplicate_counters.iteritems()):
+    counter[u'Duplicate Removals: {0:s}'.format(parser_name)] = (
+        duplicate_counter)
+
   if my_limit:
     counter['Limited By'] = my_limit
   return counter
@@ -648,6 +683,20 @@ def Main(arguments=None):
           'the result set. The default value is 5]. See --slice or --slicer '
           'for more details about this option.'))
 
+  tool_group.add_argument(
+      '--prefetch', metavar='MODE', dest='prefetch', type=str,
+      choices=['threads', 'processes'], default=None, action='store', help=(
+          'Read and decode every store of the storage file in a separate '
+          'worker while merging the stores, where MODE is either "threads" '
+          'or "processes".'))
+
+  tool_group.add_argument(
+      '--formatting_processes', metavar='NUMBER',
+      dest='formatting_processes', type=int, default=0, action='store', help=(
+          'The number of processes used to format the events. The events '
+          'are still written in sorted order. Currently supported by the '
+          'l2t_csv, dynamic and sql4n6 output modules.'))
+
   tool_group.add_argument(
       '-v', '--version', dest='version', action='version',
       version='log2timeline - psort version {0:s}'.format(plaso.GetVersion()),
@@ -18,6 +18,7 @@
 """The core object definitions, e.g. the event object."""
 
 import collections
+import hashlib
 import logging
 import uuid
 
@@ -134,16 +135,11 @@ class EventObject(object):
     if self.DATA_TYPE:
       self.data_type = self.DATA_TYPE
 
-  def EqualityString(self):
-    """Return a string describing the EventObject in terms of object equality.
-
-    The details of this function must match the logic of __eq__. EqualityStrings
-    of two event objects should be the same if and only if the EventObjects are
-    equal as described in __eq__.
+  def _GetEqualityIdentity(self):
+    """Retrieves the values that describe the event object in terms of equality.
 
     Returns:
-      String: will match another EventObject's Equality String if and only if
-              the EventObjects are equal
+      A list of the values used by EqualityString and EqualityDigest.
     """
     fields = sorted(list(self.GetAttributes().difference(self.COMPARE_EXCLUDE)))
 
@@ -181,7 +177,38 @@ class EventObject(object):
       identity.append('inode')
       identity.append(inode)
 
-    return u'|'.join(map(unicode, identity))
+    return identity
+
+  def EqualityDigest(self):
+    """Return a digest describing the EventObject in terms of object equality.
+
+    The digest is the MD5 of the UTF-8 encoded EqualityString, which is
+    calculated without building the string. Two event objects have the same
+    digest if and only if they have the same EqualityString.
+
+    Returns:
+      A string containing the 128-bit digest.
+    """
+    md5_context = hashlib.md5()
+    for index, value in enumerate(self._GetEqualityIdentity()):
+      if index:
+        md5_context.update(b'|')
+      md5_context.update(unicode(value).encode('utf-8'))
+
+    return md5_context.digest()
+
+  def EqualityString(self):
+    """Return a string describing the EventObject in terms of object equality.
+
+    The details of this function must match the logic of __eq__. EqualityStrings
+    of two event objects should be the same if and only if the EventObjects are
+    equal as described in __eq__.
+
+    Returns:
+      String: will match another EventObject's Equality String if and only if
+              the EventObjects are equal
+    """
+    return u'|'.join(map(unicode, self._GetEqualityIdentity()))
 
   def __eq__(self, event_object):
     """Return a boolean indicating if two EventObject are considered equal.
@@ -315,6 +342,44 @@ class EventObject(object):
     return part_1 + part_2
 
 
+class SerializedEventObject(object):
+  """Class that contains an event object in serialized form.
+
+  A serialized event object is produced by the extraction workers so that
+  the storage can append the event object data without having to serialize
+  it itself. Besides the serialized data it contains the attribute values
+  the storage needs for its indexes and counters.
+  """
+
+  def __init__(
+      self, timestamp, data, serializer_format, data_type=None, parser=None,
+      plugin=None, hostname=None, filename=None):
+    """Initializes the serialized event object.
+
+    Args:
+      timestamp: the timestamp of the event object.
+      data: a binary string containing the serialized event object.
+      serializer_format: a string containing the format of the serialized
+                         data, either "proto" or "json".
+      data_type: optional data type of the event object. The default is None.
+      parser: optional name of the parser that produced the event object.
+              The default is None.
+      plugin: optional name of the plugin that produced the event object.
+              The default is None.
+      hostname: optional hostname of the event object. The default is None.
+      filename: optional filename of the event object. The default is None.
+    """
+    super(SerializedEventObject, self).__init__()
+    self.data = data
+    self.data_type = data_type
+    self.filename = filename
+    self.hostname = hostname
+    self.parser = parser
+    self.plugin = plugin
+    self.serializer_format = serializer_format
+    self.timestamp = timestamp
+
+
 class EventTag(object):
   """A native Python object for the EventTagging protobuf.
 
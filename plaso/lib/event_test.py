@@ -26,6 +26,7 @@ Error handling. The following tests are performed for error handling:
  + Access attributes that are not set.
 """
 
+import hashlib
 import unittest
 
 from plaso.events import text_events
@@ -263,6 +264,15 @@ class EventObjectTest(unittest.TestCase):
     self.assertNotEquals(event_c.EqualityString(), event_d.EqualityString())
     self.assertNotEquals(event_d.EqualityString(), event_f.EqualityString())
 
+    self.assertEquals(event_a.EqualityDigest(), event_b.EqualityDigest())
+    self.assertNotEquals(event_a.EqualityDigest(), event_c.EqualityDigest())
+    self.assertEquals(event_a.EqualityDigest(), event_e.EqualityDigest())
+    self.assertNotEquals(event_c.EqualityDigest(), event_d.EqualityDigest())
+    self.assertNotEquals(event_d.EqualityDigest(), event_f.EqualityDigest())
+    self.assertEquals(
+        event_a.EqualityDigest(),
+        hashlib.md5(event_a.EqualityString().encode('utf-8')).digest())
+
   def testEqualityFileStatParserMissingInode(self):
     """Test that FileStatParser files with missing inodes are distinct"""
     event_a = event.EventObject()
@@ -42,7 +42,17 @@ class Token(object):
     """
     self.state_regex = re.compile(
         state_regex, re.DOTALL | re.M | re.S | re.U | flags)
-    self.regex = re.compile(regex, re.DOTALL | re.M | re.S | re.U | flags)
+
+    # The lexer matches the regular expression at the current position in
+    # its buffer, where "^" only matches after a new line. Since the match
+    # is anchored at the current position a leading "^" is redundant.
+    if regex.startswith('^'):
+      regex_without_caret = regex[1:]
+    else:
+      regex_without_caret = regex
+
+    self.regex = re.compile(
+        regex_without_caret, re.DOTALL | re.M | re.S | re.U | flags)
     self.re_str = regex
     self.actions = []
     if actions:
@@ -63,7 +73,12 @@ class ParseError(Error):
 
 
 class Lexer(object):
-  """A generic feed lexer."""
+  """A generic feed lexer.
+
+  The lexer does not consume the data off its buffer for every token,
+  instead it keeps a cursor to the current position in the buffer. The data
+  before the cursor is discarded when the buffer is fed.
+  """
   _CONTINUE_STATE = 'CONTINUE'
   _INITIAL_STATE = 'INITIAL'
 
@@ -75,15 +90,59 @@ class Lexer(object):
   def __init__(self, data=''):
     """Initializes the lexer object."""
     super(Lexer, self).__init__()
-    self.buffer = data
+    self._buffer = data
+    self._buffer_offset = 0
+    self._processed_buffer = []
+
+    # If debug is set all the data processed by the lexer is kept in
+    # the processed buffer.
+    self.debug = False
     self.error = 0
     self.flags = 0
     self.processed = 0
-    self.processed_buffer = ''
     self.state = self._INITIAL_STATE
     self.state_stack = []
     self.verbose = 0
 
+  @property
+  def buffer(self):
+    """The data in the buffer that has not been processed."""
+    return self._buffer[self._buffer_offset:]
+
+  @buffer.setter
+  def buffer(self, data):
+    """Sets the data in the buffer."""
+    self._buffer = data
+    self._buffer_offset = 0
+
+  @property
+  def processed_buffer(self):
+    """The processed data.
+
+    If debug is not set only the processed data that is still in the buffer
+    is available.
+    """
+    if self.debug:
+      return ''.join(self._processed_buffer)
+    return self._buffer[:self._buffer_offset]
+
+  def _ConsumeBuffer(self, size):
+    """Consumes data off the buffer by moving the cursor.
+
+    Args:
+      size: the number of characters to consume.
+    """
+    if self.debug:
+      self._processed_buffer.append(
+          self._buffer[self._buffer_offset:self._buffer_offset + size])
+
+    self._buffer_offset += size
+    self.processed += size
+
+  def GetBufferSize(self):
+    """Retrieves the size of the data in the buffer that is not processed."""
+    return len(self._buffer) - self._buffer_offset
+
   def NextToken(self):
     """Fetch the next token by trying to match any of the regexes in order."""
     current_state = self.state
@@ -93,16 +152,13 @@ class Lexer(object):
         continue
 
       # Try to match the rule
-      m = token.regex.match(self.buffer)
+      m = token.regex.match(self._buffer, self._buffer_offset)
       if not m:
         continue
 
       # The match consumes the data off the buffer (the handler can put it back
       # if it likes)
-      # TODO: using joins might be more efficient here.
-      self.processed_buffer += self.buffer[:m.end()]
-      self.buffer = self.buffer[m.end():]
-      self.processed += m.end()
+      self._ConsumeBuffer(m.end() - self._buffer_offset)
 
       next_state = token.next_state
       for action in token.actions:
@@ -130,17 +186,18 @@ class Lexer(object):
     # Check that we are making progress - if we are too full, we assume we are
     # stuck.
     self.Error(u'Expected {0:s}'.format(self.state))
-    self.processed_buffer += self.buffer[:1]
-    self.buffer = self.buffer[1:]
+    if self._buffer_offset < len(self._buffer):
+      self._ConsumeBuffer(1)
     return self._ERROR_TOKEN
 
   def Feed(self, data):
     """Feed the buffer with data."""
-    self.buffer = ''.join([self.buffer, data])
+    self._buffer = ''.join([self._buffer[self._buffer_offset:], data])
+    self._buffer_offset = 0
 
   def Empty(self):
     """Return a boolean indicating if the buffer is empty."""
-    return not self.buffer
+    return self._buffer_offset >= len(self._buffer)
 
   def Default(self, **kwarg):
     """The default callback handler."""
@@ -170,13 +227,27 @@ class Lexer(object):
 
   def PushBack(self, string='', **_):
     """Push the match back on the stream."""
-    self.buffer = string + self.buffer
-    self.processed_buffer = self.processed_buffer[:-len(string)]
+    if not string:
+      return
+
+    string_size = len(string)
+    string_offset = self._buffer_offset - string_size
+    if (string_offset >= 0 and
+        self._buffer[string_offset:self._buffer_offset] == string):
+      # The string was just consumed hence only the cursor needs to move back.
+      self._buffer_offset = string_offset
+    else:
+      self._buffer = ''.join([string, self._buffer[self._buffer_offset:]])
+      self._buffer_offset = 0
+
+    if self.debug:
+      processed_buffer = ''.join(self._processed_buffer)
+      self._processed_buffer = [processed_buffer[:-string_size]]
 
   def Close(self):
     """A convenience function to force us to parse all the data."""
     while self.NextToken():
-      if not self.buffer:
+      if self.Empty():
         return
 
 
@@ -186,6 +257,9 @@ class SelfFeederMixIn(Lexer):
   Note that self.file_object must be the file object we read from.
   """
 
+  # The number of bytes read from the file object when the buffer is fed.
+  _FEED_SIZE = 64 * 1024
+
   # TODO: fix this, file object either needs to be set or not passed here.
   def __init__(self, file_object=None):
     """Initializes the lexer feeder min object.
@@ -200,15 +274,23 @@ class SelfFeederMixIn(Lexer):
     """Return the next token."""
     # If we don't have enough data - feed ourselves: We assume
     # that we must have at least one sector in our buffer.
-    if len(self.buffer) < 512:
-      if self.Feed() == 0 and not self.buffer:
+    if self.GetBufferSize() < 512:
+      if self.Feed() == 0 and self.Empty():
         return None
 
     return Lexer.NextToken(self)
 
-  def Feed(self, size=512):
-    """Feed data into the buffer."""
-    data = self.file_object.read(size)
+  def Feed(self, size=None):
+    """Feed data into the buffer.
+
+    Args:
+      size: optional number of bytes to read from the file object. The
+            default is None, which represents _FEED_SIZE.
+
+    Returns:
+      The number of bytes read from the file object.
+    """
+    data = self.file_object.read(size or self._FEED_SIZE)
     Lexer.Feed(self, data)
     return len(data)
 
@@ -0,0 +1,166 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the lexer."""
+
+import StringIO
+import unittest
+
+from plaso.lib import lexer
+
+
+class TestLexer(lexer.Lexer):
+  """Lexer for testing."""
+
+  tokens = [
+      lexer.Token('INITIAL', r'(\w+) ', 'PushBackWord', 'WORD'),
+      lexer.Token('WORD', r'(\w+) ', 'ParseWord', 'INITIAL'),
+      ]
+
+  def __init__(self, data=''):
+    """Initializes the lexer object."""
+    super(TestLexer, self).__init__(data=data)
+    self.words = []
+
+  def ParseWord(self, match=None, **unused_kwargs):
+    """Parses a word."""
+    self.words.append(match.group(1))
+
+  def PushBackWord(self, string='', **unused_kwargs):
+    """Pushes a word back onto the buffer."""
+    self.PushBack(string=string)
+
+
+class TestSelfFeeder(lexer.SelfFeederMixIn):
+  """Self feeding lexer for testing."""
+
+  _FEED_SIZE = 4
+
+
+class LexerTest(unittest.TestCase):
+  """Tests for the lexer."""
+
+  def testConsumeBuffer(self):
+    """Tests the _ConsumeBuffer and GetBufferSize functions."""
+    lexer_object = lexer.Lexer(data='abcdef')
+    self.assertEquals(lexer_object.GetBufferSize(), 6)
+
+    # pylint: disable=protected-access
+    lexer_object._ConsumeBuffer(2)
+    self.assertEquals(lexer_object.GetBufferSize(), 4)
+    self.assertEquals(lexer_object.buffer, 'cdef')
+    self.assertEquals(lexer_object.processed_buffer, 'ab')
+    self.assertEquals(lexer_object.processed, 2)
+    self.assertFalse(lexer_object.Empty())
+
+    lexer_object._ConsumeBuffer(4)
+    self.assertEquals(lexer_object.GetBufferSize(), 0)
+    self.assertEquals(lexer_object.buffer, '')
+    self.assertEquals(lexer_object.processed, 6)
+    self.assertTrue(lexer_object.Empty())
+
+  def testConsumeBufferDebug(self):
+    """Tests the _ConsumeBuffer function with debug set."""
+    lexer_object = lexer.Lexer(data='abcdef')
+    lexer_object.debug = True
+
+    # pylint: disable=protected-access
+    lexer_object._ConsumeBuffer(2)
+    lexer_object.Feed('gh')
+    lexer_object._ConsumeBuffer(3)
+    self.assertEquals(lexer_object.processed_buffer, 'abcde')
+    self.assertEquals(lexer_object.buffer, 'fgh')
+
+  def testFeed(self):
+    """Tests the Feed function."""
+    lexer_object = lexer.Lexer(data='abcdef')
+
+    # pylint: disable=protected-access
+    lexer_object._ConsumeBuffer(4)
+    lexer_object.Feed('gh')
+    self.assertEquals(lexer_object._buffer, 'efgh')
+    self.assertEquals(lexer_object._buffer_offset, 0)
+    self.assertEquals(lexer_object.GetBufferSize(), 4)
+    self.assertEquals(lexer_object.processed_buffer, '')
+
+    lexer_object.buffer = 'ij'
+    self.assertEquals(lexer_object.GetBufferSize(), 2)
+    self.assertEquals(lexer_object.buffer, 'ij')
+
+  def testPushBack(self):
+    """Tests the PushBack function."""
+    lexer_object = lexer.Lexer(data='abcdef')
+
+    # pylint: disable=protected-access
+    lexer_object._ConsumeBuffer(4)
+    lexer_object.PushBack(string='cd')
+    self.assertEquals(lexer_object._buffer, 'abcdef')
+    self.assertEquals(lexer_object.buffer, 'cdef')
+
+    # A string that was not consumed is prepended to the buffer.
+    lexer_object.PushBack(string='xy')
+    self.assertEquals(lexer_object._buffer_offset, 0)
+    self.assertEquals(lexer_object.buffer, 'xycdef')
+
+  def testNextToken(self):
+    """Tests the NextToken function."""
+    lexer_object = TestLexer(data='one two three ')
+
+    token = lexer_object.NextToken()
+    self.assertEquals(token.next_state, 'WORD')
+    self.assertEquals(lexer_object.GetBufferSize(), 14)
+
+    lexer_object.NextToken()
+    self.assertEquals(lexer_object.GetBufferSize(), 10)
+    self.assertEquals(lexer_object.words, ['one'])
+
+    lexer_object.Close()
+    self.assertTrue(lexer_object.Empty())
+    self.assertEquals(lexer_object.words, ['one', 'two', 'three'])
+
+    lexer_object = TestLexer(data='?')
+    # pylint: disable=protected-access
+    token = lexer_object.NextToken()
+    self.assertEquals(token, lexer_object._ERROR_TOKEN)
+    self.assertEquals(lexer_object.error, 1)
+    self.assertTrue(lexer_object.Empty())
+
+
+class SelfFeederMixInTest(unittest.TestCase):
+  """Tests for the self feeder mix-in."""
+
+  def testFeed(self):
+    """Tests the Feed function."""
+    lexer_object = TestSelfFeeder(
+        file_object=StringIO.StringIO('abcdefghij'))
+
+    self.assertEquals(lexer_object.Feed(), 4)
+    self.assertEquals(lexer_object.GetBufferSize(), 4)
+
+    # pylint: disable=protected-access
+    lexer_object._ConsumeBuffer(3)
+    self.assertEquals(lexer_object.Feed(size=2), 2)
+    self.assertEquals(lexer_object.buffer, 'def')
+
+    self.assertEquals(lexer_object.Feed(), 4)
+    self.assertEquals(lexer_object.buffer, 'defghij')
+    self.assertEquals(lexer_object.Feed(), 0)
+    self.assertEquals(lexer_object.GetBufferSize(), 7)
+
+
+if __name__ == '__main__':
+  unittest.main()
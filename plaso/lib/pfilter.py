@@ -451,12 +451,380 @@ class TimeRangeCache(object):
       return last, first
 
 
+class CompiledFilter(object):
+  """Class that implements a filter compiled into Python closures.
+
+  The filter tree (instances of objectfilter.Filter) is interpreted object
+  by object, where every attribute value is expanded by the value expander.
+  The compiled filter resolves the attribute names and prepares the operands
+  once, evaluates the cheaper conditions of AND and OR filters first and
+  formats the message and source strings of an event object at most once.
+  """
+
+  # The relative costs of evaluating filters, used to determine the order
+  # in which the conditions of AND and OR filters are evaluated.
+  _COST_ATTRIBUTE = 1
+  _COST_REGEXP = 5
+  _COST_INTERPRETED = 50
+  _COST_FORMATTED_ATTRIBUTE = 100
+
+  # The attributes of which the value is determined by the event formatters.
+  FORMATTED_ATTRIBUTE_NAMES = frozenset([
+      'message', 'source', 'source_long', 'source_short', 'sourcetype'])
+
+  def __init__(self, filter_object):
+    """Initializes the compiled filter.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter).
+    """
+    super(CompiledFilter, self).__init__()
+    self._matches, _ = self._CompileFilter(filter_object)
+    self.filter_object = filter_object
+
+  def __str__(self):
+    """Return a string representation of the filter."""
+    return str(self.filter_object)
+
+  def _CompileAndOrFilter(self, filter_object):
+    """Compiles an AND or OR filter.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.AndFilter
+                     or objectfilter.OrFilter).
+
+    Returns:
+      A tuple of the compiled function and its relative cost.
+    """
+    compiled_filters = [
+        self._CompileFilter(child_filter)
+        for child_filter in filter_object.args]
+
+    if not compiled_filters:
+      return lambda unused_event_object, unused_cache: True, 0
+
+    compiled_filters.sort(key=lambda compiled_filter: compiled_filter[1])
+    functions = [function for function, _ in compiled_filters]
+    cost = sum([cost for _, cost in compiled_filters])
+
+    if len(functions) == 1:
+      return functions[0], cost
+
+    if isinstance(filter_object, objectfilter.AndFilter):
+      def _MatchesAll(event_object, cache):
+        for function in functions:
+          if not function(event_object, cache):
+            return False
+        return True
+
+      return _MatchesAll, cost
+
+    def _MatchesAny(event_object, cache):
+      for function in functions:
+        if function(event_object, cache):
+          return True
+      return False
+
+    return _MatchesAny, cost
+
+  def _CompileFilter(self, filter_object):
+    """Compiles a filter.
+
+    Filters that cannot be compiled are interpreted.
+
+    Args:
+      filter_object: the filter object (instance of objectfilter.Filter).
+
+    Returns:
+      A tuple of the compiled function and its relative cost.
+    """
+    if isinstance(filter_object, objectfilter.IdentityFilter):
+      return lambda unused_event_object, unused_cache: True, 0
+
+    if isinstance(filter_object, (
+        objectfilter.AndFilter, objectfilter.OrFilter)):
+      return self._CompileAndOrFilter(filter_object)
+
+    if isinstance(filter_object, objectfilter.GenericBinaryOperator):
+      compiled_filter = self._CompileOperator(filter_object)
+      if compiled_filter:
+        return compiled_filter
+
+    def _MatchesInterpreted(event_object, unused_cache):
+      return filter_object.Matches(event_object)
+
+    return _MatchesInterpreted, self._COST_INTERPRETED
+
+  def _CompileOperation(self, filter_object):
+    """Compiles the operation of an operator with its right operand.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+
+    Returns:
+      A function that takes the attribute value and returns the result of
+      the operation.
+    """
+    right_operand = filter_object.right_operand
+    operation = filter_object.Operation
+
+    if isinstance(right_operand, DateCompareObject):
+      # Compare integer timestamps directly instead of by the comparison
+      # methods of the date compare object.
+      timestamp = right_operand.data
+      integer_operations = {
+          objectfilter.Equals: lambda value: value == timestamp,
+          objectfilter.Greater: lambda value: value > timestamp,
+          objectfilter.GreaterEqual: lambda value: value >= timestamp,
+          objectfilter.Less: lambda value: value < timestamp,
+          objectfilter.LessEqual: lambda value: value <= timestamp}
+
+      # Note that NotEquals is a subclass of Equals.
+      integer_operation = integer_operations.get(type(filter_object), None)
+      if isinstance(filter_object, objectfilter.NotEquals):
+        integer_operation = integer_operations[objectfilter.Equals]
+
+      if integer_operation:
+        def _DateOperation(value):
+          if type(value) in (int, long):
+            return integer_operation(value)
+          return operation(value, right_operand)
+
+        return _DateOperation
+
+    elif type(filter_object) in (objectfilter.Equals, objectfilter.NotEquals):
+      return lambda value: value == right_operand
+
+    elif (type(filter_object) == objectfilter.Contains and
+          type(right_operand) in (str, unicode)):
+      lower_right_operand = right_operand.lower()
+
+      def _ContainsOperation(value):
+        if type(value) in (str, unicode):
+          return lower_right_operand in value.lower()
+        return right_operand in value
+
+      return _ContainsOperation
+
+    elif (type(filter_object) == ParserList and
+          filter_object.left_operand == 'parser'):
+      parser_names = frozenset(filter_object.compiled_list)
+      return lambda value: value in parser_names
+
+    return lambda value: operation(value, right_operand)
+
+  def _CompileOperator(self, filter_object):
+    """Compiles an operator on a single event object attribute.
+
+    Args:
+      filter_object: the filter object (instance of
+                     objectfilter.GenericBinaryOperator).
+
+    Returns:
+      A tuple of the compiled function and its relative cost or None if the
+      operator cannot be compiled.
+    """
+    value_expander = filter_object.value_expander
+    attribute_name = filter_object.left_operand
+
+    # Attribute paths, e.g. "a.b", and other value expanders are interpreted.
+    if (type(value_expander) != PlasoValueExpander or
+        not isinstance(attribute_name, basestring) or
+        value_expander.FIELD_SEPARATOR in attribute_name):
+      return
+
+    attribute_name = attribute_name.lower()
+    bool_value = filter_object.bool_value
+    get_value = self.CompileValueGetter(value_expander, attribute_name)
+    operation = self._CompileOperation(filter_object)
+
+    def _MatchesOperator(event_object, cache):
+      value = get_value(event_object, cache)
+      if value is not None:
+        try:
+          if operation(value):
+            return bool_value
+        except (ValueError, TypeError):
+          pass
+
+      return not bool_value
+
+    if attribute_name in self.FORMATTED_ATTRIBUTE_NAMES:
+      cost = self._COST_FORMATTED_ATTRIBUTE
+    elif isinstance(filter_object, objectfilter.Regexp):
+      cost = self._COST_REGEXP
+    else:
+      cost = self._COST_ATTRIBUTE
+
+    return _MatchesOperator, cost
+
+  @classmethod
+  def CompileValueGetter(cls, value_expander, attribute_name):
+    """Compiles the retrieval of an attribute value.
+
+    The value is determined the same way as PlasoValueExpander does. Message
+    and source strings are cached per event object.
+
+    Args:
+      value_expander: the value expander (instance of PlasoValueExpander).
+      attribute_name: the lower case name of the attribute.
+
+    Returns:
+      A function that takes the event object and cache and returns the
+      attribute value or None.
+    """
+    def _GetValue(event_object, unused_cache):
+      value = getattr(event_object, attribute_name, None)
+      if not value:
+        return
+
+      if isinstance(value, dict):
+        value = DictObject(value)
+      return value
+
+    if attribute_name == 'tag':
+      def _GetTagValue(event_object, cache):
+        value = _GetValue(event_object, cache)
+        if value:
+          return value.tags
+
+      return _GetTagValue
+
+    if attribute_name == 'message':
+      def _GetMessageValue(event_object, cache):
+        value = _GetValue(event_object, cache)
+        if value:
+          return value
+
+        if 'message' not in cache:
+          # pylint: disable=protected-access
+          cache['message'] = value_expander._GetMessage(event_object)
+        return cache['message']
+
+      return _GetMessageValue
+
+    if attribute_name in cls.FORMATTED_ATTRIBUTE_NAMES:
+      if attribute_name in ('source', 'source_short'):
+        source_index = 0
+      else:
+        source_index = 1
+
+      def _GetSourceValue(event_object, cache):
+        value = _GetValue(event_object, cache)
+        if value:
+          return value
+
+        if 'sources' not in cache:
+          # pylint: disable=protected-access
+          cache['sources'] = value_expander._GetSources(event_object)
+        return cache['sources'][source_index]
+
+      return _GetSourceValue
+
+    return _GetValue
+
+  def Matches(self, event_object):
+    """Determines if an event object matches the filter.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+
+    Returns:
+      A boolean value indicating the event object matches.
+    """
+    return self._matches(event_object, {})
+
+
+class _AttributeValueObject(object):
+  """A simple object that only defines a single attribute."""
+
+  def __init__(self, attribute_name, attribute_value):
+    """Initializes the object.
+
+    Args:
+      attribute_name: the name of the attribute.
+      attribute_value: the value of the attribute or None if the attribute
+                       is not defined.
+    """
+    super(_AttributeValueObject, self).__init__()
+    if attribute_value is not None:
+      setattr(self, attribute_name, attribute_value)
+
+
+def MatchesAttributeValues(matcher, attribute_values):
+  """Evaluates a filter matcher against a subset of the attribute values.
+
+  This is used to determine whether a filter can match an event object
+  without the need to have the full event object, e.g. to skip events in
+  the storage file based on the values of a limited set of attributes.
+
+  Args:
+    matcher: the filter matcher (instance of objectfilter.Filter).
+    attribute_values: a dictionary containing the attribute names as keys and
+                      a list of the possible values of the attribute as value.
+                      A value of None indicates the attribute is not defined.
+
+  Returns:
+    True if the filter matches for all the possible values, False if the
+    filter does not match for any of the possible values or None if this
+    cannot be determined.
+  """
+  if isinstance(matcher, CompiledFilter):
+    matcher = matcher.filter_object
+
+  if isinstance(matcher, objectfilter.IdentityFilter):
+    return True
+
+  if isinstance(matcher, (objectfilter.AndFilter, objectfilter.OrFilter)):
+    results = [
+        MatchesAttributeValues(child_filter, attribute_values)
+        for child_filter in matcher.args]
+
+    if isinstance(matcher, objectfilter.AndFilter):
+      if False in results:
+        return False
+      if None in results:
+        return
+      return True
+
+    if not results or True in results:
+      return True
+    if None in results:
+      return
+    return False
+
+  if not isinstance(matcher, objectfilter.GenericBinaryOperator):
+    return
+
+  attribute_name = matcher.left_operand
+  if not isinstance(attribute_name, basestring):
+    return
+
+  attribute_name = attribute_name.lower()
+  if attribute_name not in attribute_values:
+    return
+
+  results = set()
+  for attribute_value in attribute_values[attribute_name]:
+    results.add(matcher.Matches(
+        _AttributeValueObject(attribute_name, attribute_value)))
+    if len(results) > 1:
+      return
+
+  if not results:
+    return
+
+  return results.pop()
+
+
 def GetMatcher(query, quiet=False):
-  """Return a filter match object for a given query."""
+  """Return a filter match object (instance of CompiledFilter) for a query."""
   matcher = None
   try:
     parser = BaseParser(query).Parse()
-    matcher = parser.Compile(PlasoAttributeFilterImplementation)
+    matcher = CompiledFilter(
+        parser.Compile(PlasoAttributeFilterImplementation))
   except objectfilter.ParseError as exception:
     if not quiet:
       logging.error(u'Filter <{0:s}> malformed: {1:s}'.format(
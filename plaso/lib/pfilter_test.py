@@ -58,6 +58,10 @@ class PFilterTest(unittest.TestCase):
 
     self.assertEqual(result, matcher.Matches(event_object))
 
+    # The compiled filter should produce the same result.
+    compiled_filter = pfilter.CompiledFilter(matcher)
+    self.assertEqual(result, compiled_filter.Matches(event_object))
+
   def setUp(self):
     """Set up the necessary variables used in tests."""
     self._pre = Empty()
@@ -170,6 +174,63 @@ class PFilterTest(unittest.TestCase):
         '\'bad, bad thing [\\sa-zA-Z\\.]+ evil\'')
     self._RunPlasoTest(event_object, query, True)
 
+  def testCompiledFilter(self):
+    """Test the CompiledFilter object."""
+    event_object = event.EventObject()
+    event_object.data_type = 'Weirdo:Made up Source:Last Written'
+    event_object.parser = 'Weirdo'
+    event_object.tag = event.EventTag()
+    event_object.tag.tags = [u'Malware', u'Important']
+
+    query = (
+        'message contains \'evil\' and parser is not \'Weirdo\' and '
+        'tag contains \'Malware\'')
+    matcher = pfilter.GetMatcher(query)
+    self.assertIsInstance(matcher, pfilter.CompiledFilter)
+    self.assertEquals(str(matcher), str(matcher.filter_object))
+    self.assertFalse(matcher.Matches(event_object))
+
+    query = 'tag contains \'Malware\' or message contains \'evil\''
+    matcher = pfilter.GetMatcher(query)
+    self.assertTrue(matcher.Matches(event_object))
+
+    query = 'parser inlist \'webhist\''
+    self._RunPlasoTest(event_object, query, False)
+
+    event_object.parser = 'chrome_history'
+    self._RunPlasoTest(event_object, query, True)
+
+    query = 'tag contains \'important\''
+    self._RunPlasoTest(event_object, query, False)
+
+  def testMatchesAttributeValues(self):
+    """Test the MatchesAttributeValues function."""
+    attribute_values = {
+        'data_type': [u'chrome:history:page_visited'],
+        'parser': [u'chrome_history', u'firefox_history'],
+        'hostname': [None]}
+
+    test_values = [
+        ('parser is \'chrome_history\'', None),
+        ('parser contains \'history\'', True),
+        ('parser is \'winreg\'', False),
+        ('parser is not \'winreg\'', True),
+        ('data_type contains \'chrome\'', True),
+        ('data_type contains \'chrome\' AND parser is \'winreg\'', False),
+        ('data_type contains \'firefox\' OR parser is \'winreg\'', False),
+        ('hostname is \'nomachine\'', False),
+        ('data_type contains \'chrome\' AND message contains \'evil\'',
+         None),
+        ('data_type is \'fs:stat\' AND message contains \'evil\'', False),
+        ('data_type contains \'chrome\' OR message contains \'evil\'',
+         True)]
+
+    for query, expected_result in test_values:
+      matcher = pfilter.GetMatcher(query)
+      self.assertEquals(
+          pfilter.MatchesAttributeValues(matcher, attribute_values),
+          expected_result, query)
+
 
 if __name__ == "__main__":
   unittest.main()
@@ -25,11 +25,12 @@ The storage file is essentially split up in two categories:
    +  Other files, these contain grouping information, tag, collection
       information or other metadata describing the content of the store files.
 
-The store itself is a collection of four files:
+The store itself is a collection of five files:
   plaso_meta.<store_number>
   plaso_proto.<store_number>
   plaso_index.<store_number>
   plaso_timestamps.<store_number>
+  plaso_columns.<store_number>
 
 The plaso_proto file within each store contains several serialized EventObjects
 or events that are serialized (as a protobuf). All of the EventObjects within
@@ -79,6 +80,28 @@ This is used for time based filtering, where if the 15th entry in this file is
 the first entry that is larger than the lower bound, then the index file is used
 to seek to the 15th entry inside the proto file.
 
+  + plaso_columns
+
+This file contains the values of a limited set of frequently filtered
+attributes, such as data_type and parser, of the entries within the proto
+file. The values are dictionary encoded per attribute (or column).
+
+The structure is:
++-------------+--------+----------------+----------------+-...-+
+| header size | header | column 1 codes | column 2 codes | ... |
++-------------+--------+----------------+----------------+-...-+
+
+Where header size is an unsigned integer '<I' that contains the size of
+the header. The header is a JSON dictionary that contains the column
+names, the number of entries and per column a list of the distinct values
+of the column. Every column contains an unsigned integer '<I' per entry
+that contains the index of the value of the entry in the list of distinct
+values of the column.
+
+This is used for filtering, where stores and entries that cannot match
+the filter based on the column values are skipped without deserializing
+the corresponding events.
+
   + plaso_proto
 
 The structure of a proto file is:
@@ -86,6 +109,14 @@ The structure of a proto file is:
 | size |  protobuf (plaso_storage_proto) | size | proto...|
 +------+---------------------------------+------+------...+
 
+Besides the stores the storage file can contain:
+
+  + plaso_fingerprints.<number>
+
+The fingerprints of the file entries extracted by an incremental extraction
+run, which are used to skip unchanged file entries in a next run. Every
+fingerprint is an unsigned 64-bit integer '>Q'.
+
 For further details about the storage design see:
   http://plaso.kiddaland.net/developer/libraries/storage
 """
@@ -95,13 +126,22 @@ For further details about the storage design see:
 # other tools. This file will then contain the queueing mechanism and other
 # plaso specific mechanism, making it easier to import the storage library.
 
+import array
 import collections
 import construct
 import heapq
+import json
 import logging
+import multiprocessing
+import operator
+import os
+import Queue
+import shutil
 # TODO: replace all instances of struct by construct!
 import struct
 import sys
+import tempfile
+import threading
 import zipfile
 
 from google.protobuf import message
@@ -195,11 +235,353 @@ class _EventTagIndexValue(object):
         tag_identifier, store_number=store_number, store_offset=store_offset)
 
 
+class _StoreTimestampIndex(object):
+  """Class that defines the timestamp index of a store.
+
+  The timestamp index is the content of a plaso_timestamps stream, which
+  contains the sorted timestamps of the entries in the store as 64-bit
+  little-endian integers.
+  """
+
+  _TIMESTAMP_SIZE = 8
+
+  def __init__(self, timestamp_data):
+    """Initializes the timestamp index.
+
+    Args:
+      timestamp_data: a byte string containing the timestamp stream data.
+    """
+    super(_StoreTimestampIndex, self).__init__()
+    self._timestamp_data = timestamp_data
+    self.number_of_entries = len(timestamp_data) // self._TIMESTAMP_SIZE
+
+  def GetTimestamp(self, entry_index):
+    """Retrieves the timestamp of an entry.
+
+    Args:
+      entry_index: the entry index.
+
+    Returns:
+      The timestamp of the entry.
+    """
+    return struct.unpack_from(
+        '<q', self._timestamp_data, entry_index * self._TIMESTAMP_SIZE)[0]
+
+  def GetLowerBoundEntryIndex(self, timestamp):
+    """Retrieves the index of the first entry not before a timestamp.
+
+    Args:
+      timestamp: the timestamp.
+
+    Returns:
+      The index of the first entry with a timestamp larger than or equal to
+      the timestamp or the number of entries if there is no such entry.
+    """
+    lower_index = 0
+    upper_index = self.number_of_entries
+    while lower_index < upper_index:
+      middle_index = (lower_index + upper_index) // 2
+      if self.GetTimestamp(middle_index) < timestamp:
+        lower_index = middle_index + 1
+      else:
+        upper_index = middle_index
+
+    return lower_index
+
+
+class _StoreColumnIndex(object):
+  """Class that defines the column index of a store.
+
+  The column index is the content of a plaso_columns stream, which contains
+  the dictionary encoded values of frequently filtered attributes of the
+  entries in the store.
+  """
+
+  _CODE_SIZE = 4
+
+  def __init__(self, column_data):
+    """Initializes the column index.
+
+    Args:
+      column_data: a byte string containing the column stream data.
+
+    Raises:
+      ValueError: if the column stream data is invalid.
+    """
+    super(_StoreColumnIndex, self).__init__()
+    if len(column_data) < 4:
+      raise ValueError(u'Column stream data too small.')
+
+    header_size = struct.unpack_from('<I', column_data, 0)[0]
+    header = json.loads(column_data[4:4 + header_size])
+
+    self._codes_offset = 4 + header_size
+    self._column_data = column_data
+    self._column_values = header.get('values', [])
+    self.column_names = header.get('columns', [])
+    self.number_of_entries = header.get('number_of_entries', 0)
+
+    expected_size = self._codes_offset + (
+        len(self.column_names) * self.number_of_entries * self._CODE_SIZE)
+    if len(self._column_values) != len(self.column_names) or (
+        len(column_data) < expected_size):
+      raise ValueError(u'Column stream data size mismatch.')
+
+  @classmethod
+  def Write(cls, file_object, column_names, column_values, column_codes):
+    """Writes a column index.
+
+    Args:
+      file_object: the file-like object of the column stream.
+      column_names: a list of the column names.
+      column_values: a list containing per column the list of the distinct
+                     values of the column.
+      column_codes: a list containing per column an array of the codes of
+                    the entries (instance of array.array).
+    """
+    number_of_entries = 0
+    if column_codes:
+      number_of_entries = len(column_codes[0])
+
+    header = json.dumps({
+        'columns': column_names,
+        'number_of_entries': number_of_entries,
+        'values': column_values})
+
+    file_object.write(struct.pack('<I', len(header)))
+    file_object.write(header)
+
+    for codes in column_codes:
+      if sys.byteorder != 'little':
+        codes.byteswap()
+      file_object.write(codes.tostring())
+
+  def GetColumnValues(self, column_name):
+    """Retrieves the distinct values of a column.
+
+    Args:
+      column_name: the column name.
+
+    Returns:
+      A list of the distinct values of the column.
+    """
+    column_index = self.column_names.index(column_name)
+    return self._column_values[column_index]
+
+  def GetEntryCodes(self, entry_index):
+    """Retrieves the codes of an entry.
+
+    Args:
+      entry_index: the entry index.
+
+    Returns:
+      A tuple containing the code of the entry per column.
+    """
+    codes = []
+    offset = self._codes_offset + (entry_index * self._CODE_SIZE)
+    for _ in self.column_names:
+      codes.append(struct.unpack_from('<I', self._column_data, offset)[0])
+      offset += self.number_of_entries * self._CODE_SIZE
+
+    return tuple(codes)
+
+  def GetEntryValues(self, entry_codes):
+    """Retrieves the values of an entry.
+
+    Args:
+      entry_codes: a tuple containing the code of the entry per column.
+
+    Returns:
+      A dictionary containing the column names as keys and a list
+      containing the value of the entry as the value.
+    """
+    entry_values = {}
+    for column_index, code in enumerate(entry_codes):
+      column_name = self.column_names[column_index]
+      entry_values[column_name] = [self._column_values[column_index][code]]
+
+    return entry_values
+
+
+def _PrefetchStoreEventObjects(
+    storage_file_path, store_number, bound_first, bound_last, column_matcher,
+    batch_size, lazy_event_objects, batch_queue, abort_event):
+  """Reads and decodes the event objects of a single store into batches.
+
+  This function is the target of a prefetch thread or process. The batches
+  contain (timestamp, store number, event object) tuples and the end of the
+  store is signaled by pushing the number of entries that were filtered out
+  by the column matcher onto the batch queue.
+
+  Args:
+    storage_file_path: the path of the storage file.
+    store_number: the store number.
+    bound_first: the lower bound timestamp.
+    bound_last: the upper bound timestamp.
+    column_matcher: the filter matcher that is used to skip entries based
+                    on the column stream or None.
+    batch_size: the maximum number of event objects in a batch.
+    lazy_event_objects: boolean value to indicate the event objects should
+                        decode their attributes on demand.
+    batch_queue: the queue the batches are pushed on.
+    abort_event: the event (instance of threading.Event or
+                 multiprocessing.Event) that signals the prefetching
+                 should stop.
+  """
+  def _PushOnQueue(item):
+    """Pushes an item on the batch queue until it is pushed or aborted."""
+    while not abort_event.is_set():
+      try:
+        batch_queue.put(item, True, 1)
+        return True
+      except Queue.Full:
+        pass
+
+    return False
+
+  storage_file = StorageFile(storage_file_path, read_only=True)
+  if lazy_event_objects:
+    storage_file.EnableLazyEventObjects()
+
+  # pylint: disable=protected-access
+  storage_file._bound_first = bound_first
+  storage_file._bound_last = bound_last
+  storage_file._column_matcher = column_matcher
+
+  batch = []
+  try:
+    while not abort_event.is_set():
+      try:
+        event_object = storage_file.GetEventObject(store_number)
+      except errors.WrongProtobufEntry as exception:
+        logging.warning((
+            u'Problem while parsing a protobuf entry from: '
+            u'plaso_proto.{0:06d} with error: {1:s}').format(
+                store_number, exception))
+        break
+
+      # The upper bound is only reached in stores without a timestamp stream.
+      if not event_object or event_object.timestamp > bound_last:
+        break
+
+      if event_object.timestamp < bound_first:
+        continue
+
+      batch.append((event_object.timestamp, store_number, event_object))
+      if len(batch) >= batch_size:
+        if not _PushOnQueue(batch):
+          break
+        batch = []
+
+    if batch:
+      _PushOnQueue(batch)
+
+  finally:
+    _PushOnQueue(storage_file.number_of_filtered_entries)
+    storage_file.Close()
+
+
+class _StorePrefetcher(object):
+  """Class that prefetches the event objects of a store in a worker."""
+
+  def __init__(
+      self, storage_file_path, store_number, bound_first, bound_last,
+      batch_size, maximum_number_of_batches, column_matcher=None,
+      lazy_event_objects=False, use_processes=False):
+    """Initializes the store prefetcher.
+
+    Args:
+      storage_file_path: the path of the storage file.
+      store_number: the store number.
+      bound_first: the lower bound timestamp.
+      bound_last: the upper bound timestamp.
+      batch_size: the maximum number of event objects in a batch.
+      maximum_number_of_batches: the maximum number of batches that are
+                                 prefetched.
+      column_matcher: optional filter matcher that is used to skip entries
+                      based on the column stream. The default is None.
+      lazy_event_objects: optional boolean value to indicate the event
+                          objects should decode their attributes on demand.
+                          The default is False.
+      use_processes: optional boolean value to indicate the store should
+                     be read by a process instead of a thread. The default
+                     is False.
+    """
+    super(_StorePrefetcher, self).__init__()
+    if use_processes:
+      self._abort_event = multiprocessing.Event()
+      self._batch_queue = multiprocessing.Queue(
+          maxsize=maximum_number_of_batches)
+      worker_class = multiprocessing.Process
+    else:
+      self._abort_event = threading.Event()
+      self._batch_queue = Queue.Queue(maxsize=maximum_number_of_batches)
+      worker_class = threading.Thread
+
+    self._worker = worker_class(
+        name=u'Prefetch store: {0:d}'.format(store_number),
+        target=_PrefetchStoreEventObjects,
+        args=(storage_file_path, store_number, bound_first, bound_last,
+              column_matcher, batch_size, lazy_event_objects,
+              self._batch_queue, self._abort_event))
+    self._worker.daemon = True
+    self._use_processes = use_processes
+    self.number_of_filtered_entries = 0
+    self.store_number = store_number
+
+  def _GetItem(self):
+    """Retrieves the next item from the batch queue.
+
+    Returns:
+      A batch, the number of filtered entries or None if the worker stopped
+      without signaling the end of the store.
+    """
+    while self._worker.is_alive():
+      try:
+        return self._batch_queue.get(True, 1)
+      except Queue.Empty:
+        pass
+
+    # The worker has stopped but could have pushed items before stopping.
+    try:
+      return self._batch_queue.get(False)
+    except Queue.Empty:
+      return
+
+  def GetBatch(self):
+    """Retrieves the next batch of event objects.
+
+    Returns:
+      A list of (timestamp, store number, event object) tuples or None
+      if the end of the store was reached.
+    """
+    item = self._GetItem()
+    if isinstance(item, list):
+      return item
+
+    if item is not None:
+      self.number_of_filtered_entries = item
+
+  def Start(self):
+    """Starts the prefetch worker."""
+    self._worker.start()
+
+  def Stop(self):
+    """Signals the prefetch worker to stop and waits for it to stop."""
+    self._abort_event.set()
+    self._worker.join(5)
+
+    if self._use_processes and self._worker.is_alive():
+      self._worker.terminate()
+
+
 class StorageFile(object):
   """Class that defines the storage file."""
 
   _STREAM_DATA_SEGMENT_SIZE = 1024
 
+  _STREAM_SKIP_SEGMENT_SIZE = 1024 * 1024
+
   # Set the maximum buffer size to 196 MiB
   MAX_BUFFER_SIZE = 196 * 1024 * 1024
 
@@ -209,6 +591,16 @@ class StorageFile(object):
   # Set the maximum report protobuf string size to 24 MiB
   MAX_REPORT_PROTOBUF_SIZE = 24 * 1024 * 1024
 
+  # The names of the event object attributes that are stored in the column
+  # stream of a store.
+  _COLUMN_NAMES = ['data_type', 'parser', 'hostname', 'filename']
+
+  # The default number of event objects in a prefetch batch.
+  DEFAULT_PREFETCH_BATCH_SIZE = 512
+
+  # The default maximum number of prefetched batches per store.
+  DEFAULT_PREFETCH_MAXIMUM_NUMBER_OF_BATCHES = 8
+
   # Set the version of this storage mechanism.
   STORAGE_VERSION = 1
 
@@ -248,18 +640,30 @@ class StorageFile(object):
     self._buffer_first_timestamp = sys.maxint
     self._buffer_last_timestamp = 0
     self._buffer_size = 0
+    self._column_decisions = {}
+    self._column_indexes = {}
+    self._column_matcher = None
     self._event_object_serializer = None
     self._event_serializer_format_string = u''
     self._event_tag_index = None
     self._file_open = False
     self._file_number = 1
     self._first_file_number = None
+    self._lazy_event_objects = False
     self._max_buffer_size = buffer_size or self.MAX_BUFFER_SIZE
+    self._offset_indexes = {}
     self._output_file = output_file
     self._pre_obj = pre_obj
+    self._prefetch_batches = {}
+    self._prefetch_batch_size = None
+    self._prefetch_maximum_number_of_batches = None
+    self._prefetch_use_processes = False
+    self._prefetchers = {}
     self._proto_streams = {}
     self._read_only = None
+    self._timestamp_indexes = {}
     self._write_counter = 0
+    self.number_of_filtered_entries = 0
 
     self._analysis_report_serializer = (
         protobuf_serializer.ProtobufAnalysisReportSerializer)
@@ -415,21 +819,93 @@ class StorageFile(object):
     stream_name = 'plaso_meta.{0:06d}'.format(self._file_number)
     self._WriteStream(stream_name, yaml.safe_dump(yaml_dict))
 
+    # Sort the buffered entries in-place on timestamp. The sort is stable
+    # so entries with the same timestamp are stored in the order they were
+    # added.
+    self._buffer.sort(key=operator.itemgetter(0))
+
+    # The streams are written to temporary files entry by entry and then
+    # copied into the ZIP file, so that the serialized events are not
+    # loaded into memory a second time. The temporary files are stored
+    # next to the storage file since the system temporary directory can
+    # be too small or memory backed.
+    parent_directory = None
+    if isinstance(self._output_file, basestring):
+      parent_directory = os.path.dirname(os.path.abspath(self._output_file))
+
+    temporary_directory = tempfile.mkdtemp(dir=parent_directory)
+    try:
+      index_path = os.path.join(temporary_directory, 'plaso_index')
+      proto_path = os.path.join(temporary_directory, 'plaso_proto')
+      timestamp_path = os.path.join(temporary_directory, 'plaso_timestamps')
+      column_path = os.path.join(temporary_directory, 'plaso_columns')
+
+      with open(index_path, 'wb') as index_file_object, \
+          open(proto_path, 'wb') as proto_file_object, \
+          open(timestamp_path, 'wb') as timestamp_file_object:
+        column_values, column_codes = self._WriteBufferedEntries(
+            index_file_object, proto_file_object, timestamp_file_object)
+
+      with open(column_path, 'wb') as column_file_object:
+        _StoreColumnIndex.Write(
+            column_file_object, self._COLUMN_NAMES, column_values,
+            column_codes)
+
+      stream_name = 'plaso_index.{0:06d}'.format(self._file_number)
+      self._WriteStreamFromFile(stream_name, index_path)
+
+      stream_name = 'plaso_proto.{0:06d}'.format(self._file_number)
+      self._WriteStreamFromFile(stream_name, proto_path)
+
+      stream_name = 'plaso_timestamps.{0:06d}'.format(self._file_number)
+      self._WriteStreamFromFile(stream_name, timestamp_path)
+
+      stream_name = 'plaso_columns.{0:06d}'.format(self._file_number)
+      self._WriteStreamFromFile(stream_name, column_path)
+
+    finally:
+      shutil.rmtree(temporary_directory, True)
+
+    self._file_number += 1
+    self._buffer_size = 0
+    self._buffer = []
+    self._buffer_first_timestamp = sys.maxint
+    self._buffer_last_timestamp = 0
+
+  def _WriteBufferedEntries(
+      self, index_file_object, proto_file_object, timestamp_file_object):
+    """Writes the sorted buffered entries to the store streams.
+
+    Every entry is released from the buffer once it has been written.
+    The column values of the entries are dictionary encoded.
+
+    Args:
+      index_file_object: the file-like object of the index stream.
+      proto_file_object: the file-like object of the proto stream.
+      timestamp_file_object: the file-like object of the timestamp stream.
+
+    Returns:
+      A tuple containing a list of the distinct values per column and a list
+      of the codes of the entries per column (instances of array.array).
+    """
+    column_codes = []
+    column_dictionaries = []
+    column_values = []
+    for _ in self._COLUMN_NAMES:
+      column_codes.append(array.array('I'))
+      column_dictionaries.append({})
+      column_values.append([])
+
     ofs = 0
-    proto_str = []
-    index_str = []
-    timestamp_str = []
-    for _ in range(len(self._buffer)):
-      timestamp, entry = heapq.heappop(self._buffer)
-      # TODO: Instead of appending to an array
-      # which is not optimal (loads up the entire max file
-      # size into memory) Zipfile should be extended to
-      # allow appending to files (implement lock).
+    for buffer_index in xrange(len(self._buffer)):
+      timestamp, entry, entry_column_values = self._buffer[buffer_index]
+      self._buffer[buffer_index] = None
+
       try:
         # Appending a timestamp to the timestamp index, this is used during
         # time based filtering. If this is not done we would need to unserialize
         # all events to get the timestamp value which is really slow.
-        timestamp_str.append(struct.pack('<q', timestamp))
+        timestamp_data = struct.pack('<q', timestamp)
       except struct.error as exception:
         # TODO: Instead of just logging the error unserialize the event
         # and print out information from the event, eg. parser and path spec
@@ -439,25 +915,24 @@ class StorageFile(object):
             u'Unable to store event, not able to index timestamp value with '
             u'error: {0:s} [timestamp: {1:d}]').format(exception, timestamp))
         continue
-      index_str.append(struct.pack('<I', ofs))
-      packed = struct.pack('<I', len(entry)) + entry
-      ofs += len(packed)
-      proto_str.append(packed)
 
-    stream_name = 'plaso_index.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, ''.join(index_str))
+      timestamp_file_object.write(timestamp_data)
+      index_file_object.write(struct.pack('<I', ofs))
+      proto_file_object.write(struct.pack('<I', len(entry)))
+      proto_file_object.write(entry)
+      ofs += 4 + len(entry)
 
-    stream_name = 'plaso_proto.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, ''.join(proto_str))
+      for column_index, value in enumerate(entry_column_values):
+        dictionary = column_dictionaries[column_index]
+        code = dictionary.get(value, None)
+        if code is None:
+          code = len(column_values[column_index])
+          dictionary[value] = code
+          column_values[column_index].append(value)
 
-    stream_name = 'plaso_timestamps.{0:06d}'.format(self._file_number)
-    self._WriteStream(stream_name, ''.join(timestamp_str))
+        column_codes[column_index].append(code)
 
-    self._file_number += 1
-    self._buffer_size = 0
-    self._buffer = []
-    self._buffer_first_timestamp = sys.maxint
-    self._buffer_last_timestamp = 0
+    return column_values, column_codes
 
   def _GetEventTagIndexValue(self, store_number, store_index, uuid):
     """Retrieves an event tag index value.
@@ -523,48 +998,56 @@ class StorageFile(object):
       file_object, last_entry_index = self._GetProtoStreamSeekOffset(
           stream_number, entry_index, stream_offset)
 
-    if (not last_entry_index and entry_index == -1 and
-        self._bound_first is not None):
-      # We only get here if the following conditions are met:
-      #   1. last_entry_index is not set (so this is the first read
-      #      from this file).
-      #   2. There is a lower bound (so we have a date filter).
-      #   3. The lower bound is higher than zero (basically set to a value).
-      #   4. We are accessing this function using 'get me the next entry' as an
-      #      opposed to the 'get me entry X', where we just want to server entry
-      #      X.
+    else:
+      # We only get here if we are accessing this function using 'get me the
+      # next entry' as an opposed to the 'get me entry X', where we just want
+      # to serve entry X.
       #
       # The purpose: speed seeking into the storage file based on time. Instead
       # of spending precious time reading through the storage file and
-      # deserializing protobufs just to compare timestamps we read a much
-      # 'cheaper' file, one that only contains timestamps to find the proper
-      # entry into the storage file. That way we'll get to the right place in
-      # the file and can start reading protobufs from the right location.
-
-      stream_name = 'plaso_timestamps.{0:06d}'.format(stream_number)
-
-      if stream_name in self._GetStreamNames():
-        timestamp_file_object = self._OpenStream(stream_name, 'r')
-        if timestamp_file_object is None:
-          raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+      # deserializing protobufs just to compare timestamps we binary search a
+      # much 'cheaper' stream, one that only contains timestamps, to find the
+      # proper entry into the storage file. That way we'll get to the right
+      # place in the file and can start reading protobufs from the right
+      # location, and stop reading as soon as the upper bound is reached.
+      timestamp_index = None
+      if self._bound_first is not None:
+        timestamp_index = self._GetTimestampIndex(stream_number)
+
+      if timestamp_index is not None and not last_entry_index:
+        first_entry_index = timestamp_index.GetLowerBoundEntryIndex(
+            self._bound_first)
+        if first_entry_index >= timestamp_index.number_of_entries:
+          return None, None
 
-        index = 0
-        timestamp_compare = 0
-        encountered_error = False
-        while timestamp_compare < self._bound_first:
-          timestamp_raw = timestamp_file_object.read(8)
-          if len(timestamp_raw) != 8:
-            encountered_error = True
-            break
+        if first_entry_index > 0:
+          stream_offset = self._GetProtoStreamOffset(
+              stream_number, first_entry_index)
+          if stream_offset is None:
+            return None, None
+
+          file_object, last_entry_index = self._GetProtoStreamSeekOffset(
+              stream_number, first_entry_index, stream_offset)
+
+      # In a similar fashion the column stream is used to skip entries that
+      # cannot match the filter.
+      if self._column_matcher is not None:
+        matching_entry_index = self._GetNextMatchingEntryIndex(
+            stream_number, last_entry_index, timestamp_index)
+        if matching_entry_index is None:
+          return None, None
 
-          timestamp_compare = struct.unpack('<q', timestamp_raw)[0]
-          index += 1
+        if matching_entry_index > last_entry_index:
+          file_object, last_entry_index = self._SkipProtoStreamEntries(
+              stream_number, last_entry_index, matching_entry_index)
 
-        if encountered_error:
+      if timestamp_index is not None:
+        if last_entry_index >= timestamp_index.number_of_entries:
           return None, None
 
-        return self._GetEventObjectProtobufString(
-            stream_number, entry_index=index)
+        if (self._bound_last is not None and
+            timestamp_index.GetTimestamp(last_entry_index) > self._bound_last):
+          return None, None
 
     size_data = file_object.read(4)
 
@@ -601,6 +1084,183 @@ class StorageFile(object):
     proto.ParseFromString(proto_serialized)
     return proto
 
+  def _SkipProtoStreamEntries(
+      self, stream_number, last_entry_index, entry_index):
+    """Skips entries in the proto stream without deserializing them.
+
+    Args:
+      stream_number: the number of the stream.
+      last_entry_index: the last entry index to which the offset of the stream
+                        file-like object points.
+      entry_index: the index of the entry to skip to.
+
+    Returns:
+      A tuple of the stream file-like object and the last entry index.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    file_object, _ = self._proto_streams[stream_number]
+
+    last_stream_offset = self._GetProtoStreamOffset(
+        stream_number, last_entry_index)
+    stream_offset = self._GetProtoStreamOffset(stream_number, entry_index)
+    if last_stream_offset is None or stream_offset is None:
+      return file_object, last_entry_index
+
+    # Since zipfile.ZipExtFile is not seekable we need to read upto
+    # the stream offset.
+    skip_size = stream_offset - last_stream_offset
+    while skip_size > 0:
+      data = file_object.read(min(skip_size, self._STREAM_SKIP_SEGMENT_SIZE))
+      if not data:
+        break
+      skip_size -= len(data)
+
+    self._proto_streams[stream_number] = (file_object, entry_index)
+    return file_object, entry_index
+
+  def _StoreMatchesFilter(self, stream_number):
+    """Determines if a store could contain entries that match the filter.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      A boolean value indicating the store could contain matching entries.
+    """
+    if self._column_matcher is None:
+      return True
+
+    column_index = self._GetColumnIndex(stream_number)
+    if column_index is None:
+      return True
+
+    column_values = {}
+    for column_name in column_index.column_names:
+      column_values[column_name] = column_index.GetColumnValues(column_name)
+
+    decision = pfilter.MatchesAttributeValues(
+        self._column_matcher, column_values)
+    return decision is not False
+
+  def _GetTimestampIndex(self, stream_number):
+    """Retrieves the timestamp index of a store.
+
+    The timestamp index is read once per store and cached.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      The timestamp index (instance of _StoreTimestampIndex) or None if
+      the store has no timestamp stream.
+    """
+    if stream_number not in self._timestamp_indexes:
+      stream_name = 'plaso_timestamps.{0:06d}'.format(stream_number)
+      timestamp_index = None
+      if stream_name in self._GetStreamNames():
+        timestamp_index = _StoreTimestampIndex(self._ReadStream(stream_name))
+
+      self._timestamp_indexes[stream_number] = timestamp_index
+
+    return self._timestamp_indexes[stream_number]
+
+  def _GetColumnIndex(self, stream_number):
+    """Retrieves the column index of a store.
+
+    The column index is read once per store and cached.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      The column index (instance of _StoreColumnIndex) or None if the store
+      has no (valid) column stream.
+    """
+    if stream_number not in self._column_indexes:
+      stream_name = 'plaso_columns.{0:06d}'.format(stream_number)
+      column_index = None
+      if stream_name in self._GetStreamNames():
+        try:
+          column_index = _StoreColumnIndex(self._ReadStream(stream_name))
+        except ValueError as exception:
+          logging.warning(
+              u'Unable to read column stream: {0:s} with error: {1:s}'.format(
+                  stream_name, exception))
+
+      self._column_indexes[stream_number] = column_index
+
+    return self._column_indexes[stream_number]
+
+  def _GetNextMatchingEntryIndex(
+      self, stream_number, entry_index, timestamp_index=None):
+    """Retrieves the index of the next entry that could match the filter.
+
+    The decision whether an entry could match the filter is based on the
+    column values of the entry and is cached per distinct combination of
+    column values.
+
+    Args:
+      stream_number: the number of the stream.
+      entry_index: the index of the entry to start from.
+      timestamp_index: optional timestamp index (instance of
+                       _StoreTimestampIndex) used to stop at the upper bound.
+                       The default is None.
+
+    Returns:
+      The index of the next entry that could match the filter or None if
+      there are no more entries.
+    """
+    column_index = self._GetColumnIndex(stream_number)
+    if column_index is None:
+      return entry_index
+
+    decisions = self._column_decisions.setdefault(stream_number, {})
+
+    while entry_index < column_index.number_of_entries:
+      if (timestamp_index is not None and self._bound_last is not None and
+          timestamp_index.GetTimestamp(entry_index) > self._bound_last):
+        return entry_index
+
+      entry_codes = column_index.GetEntryCodes(entry_index)
+      decision = decisions.get(entry_codes, None)
+      if decision is None:
+        decision = pfilter.MatchesAttributeValues(
+            self._column_matcher, column_index.GetEntryValues(entry_codes))
+        decision = decision is not False
+        decisions[entry_codes] = decision
+
+      if decision:
+        return entry_index
+
+      self.number_of_filtered_entries += 1
+      entry_index += 1
+
+  def _GetOffsetIndex(self, stream_number):
+    """Retrieves the offset index of a store.
+
+    The offset index is the data of the plaso_index stream, which is read
+    once per store and cached.
+
+    Args:
+      stream_number: the number of the stream.
+
+    Returns:
+      A byte string containing the index stream data.
+
+    Raises:
+      IOError: if the stream cannot be opened.
+    """
+    if stream_number not in self._offset_indexes:
+      stream_name = 'plaso_index.{0:06d}'.format(stream_number)
+      if stream_name not in self._GetStreamNames():
+        raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+
+      self._offset_indexes[stream_number] = self._ReadStream(stream_name)
+
+    return self._offset_indexes[stream_number]
+
   def _GetProtoStream(self, stream_number):
     """Retrieves the proto stream.
 
@@ -677,29 +1337,13 @@ class StorageFile(object):
     Raises:
       IOError: if the stream cannot be opened.
     """
-    # TODO: cache the index file object in the same way as the proto
-    # stream file objects.
-
-    # TODO: once cached use the last entry index to determine if the stream
-    # file object should be re-opened.
-
-    stream_name = 'plaso_index.{0:06d}'.format(stream_number)
-    index_file_object = self._OpenStream(stream_name, 'r')
-    if index_file_object is None:
-      raise IOError(u'Unable to open stream: {0:s}'.format(stream_name))
+    index_data = self._GetOffsetIndex(stream_number)
 
-    # Since zipfile.ZipExtFile is not seekable we need to read upto
-    # the stream offset.
-    _ = index_file_object.read(entry_index * 4)
-
-    index_data = index_file_object.read(4)
-
-    index_file_object.close()
-
-    if len(index_data) != 4:
+    offset = entry_index * 4
+    if offset + 4 > len(index_data):
       return None
 
-    return struct.unpack('<I', index_data)[0]
+    return struct.unpack_from('<I', index_data, offset)[0]
 
   def _OpenStream(self, stream_name, mode='r'):
     """Opens a stream.
@@ -837,8 +1481,21 @@ class StorageFile(object):
     """
     self._zipfile.writestr(stream_name, stream_data)
 
+  def _WriteStreamFromFile(self, stream_name, path):
+    """Write the data of a file to a stream.
+
+    The data is read from the file in chunks by the ZIP file object.
+
+    Args:
+      stream_name: the name of the stream.
+      path: the path of the file that contains the data of the stream.
+    """
+    self._zipfile.write(path, arcname=stream_name)
+
   def Close(self):
     """Closes the storage, flush the last buffer and closes the ZIP file."""
+    self._StopPrefetchers()
+
     if self._file_open:
       if not self._read_only and self._pre_obj:
         self._WritePreprocessObject(self._pre_obj)
@@ -980,31 +1637,38 @@ class StorageFile(object):
 
     return information
 
-  def SetStoreLimit(self, unused_my_filter=None):
-    """Set a limit to the stores used for returning data."""
+  def SetStoreLimit(self, my_filter=None):
+    """Set a limit to the stores used for returning data.
+
+    Args:
+      my_filter: optional filter object (instance of FilterObject). If the
+                 filter defines a matcher the column streams are used to skip
+                 stores and entries that cannot match the filter. The default
+                 is None.
+    """
     # Retrieve set first and last timestamps.
     self._bound_first, self._bound_last = pfilter.TimeRangeCache.GetTimeRange()
 
     self.store_range = []
 
-    # TODO: Fetch a filter object from the filter query.
+    self._column_decisions = {}
+    self._column_matcher = getattr(my_filter, 'matcher', None)
 
     for number in self.GetProtoNumbers():
-      # TODO: Read more criteria from here.
       first, last = self.ReadMeta(number).get('range', (0, limit.MAX_INT64))
       if last < first:
         logging.error(
             u'last: {0:d} first: {1:d} container: {2:d} (last < first)'.format(
                 last, first, number))
 
-      if first <= self._bound_last and self._bound_first <= last:
-        # TODO: Check at least parser and data_type (stored in metadata).
-        # Check whether these attributes exist in filter, if so use the filter
-        # to determine whether the stores should be included.
-        self.store_range.append(number)
+      if first > self._bound_last or self._bound_first > last:
+        logging.debug(u'Store [{0:d}] not used'.format(number))
+
+      elif not self._StoreMatchesFilter(number):
+        logging.debug(u'Store [{0:d}] not used by filter'.format(number))
 
       else:
-        logging.debug(u'Store [{0:d}] not used'.format(number))
+        self.store_range.append(number)
 
   def GetSortedEntry(self):
     """Return a sorted entry from the storage file.
@@ -1016,18 +1680,22 @@ class StorageFile(object):
       self._bound_first, self._bound_last = (
           pfilter.TimeRangeCache.GetTimeRange())
 
+    if self._prefetch_batch_size:
+      return self._GetPrefetchedSortedEntry()
+
     if not hasattr(self, '_merge_buffer'):
       self._merge_buffer = []
       number_range = getattr(self, 'store_range', list(self.GetProtoNumbers()))
       for store_number in number_range:
         event_object = self.GetEventObject(store_number)
-        if not event_object:
-          return
 
-        while event_object.timestamp < self._bound_first:
+        # Stores without a timestamp stream still need to be read up to
+        # the lower bound.
+        while event_object and event_object.timestamp < self._bound_first:
           event_object = self.GetEventObject(store_number)
-          if not event_object:
-            return
+
+        if not event_object:
+          continue
 
         heapq.heappush(
             self._merge_buffer,
@@ -1056,6 +1724,142 @@ class StorageFile(object):
 
     return event_read
 
+  def _GetNextPrefetchedEntry(self, store_number):
+    """Retrieves the next prefetched entry of a store.
+
+    Args:
+      store_number: the store number.
+
+    Returns:
+      A (timestamp, store number, event object) tuple or None if the end
+      of the store was reached.
+    """
+    batch = self._prefetch_batches.get(store_number, None)
+    if not batch:
+      prefetcher = self._prefetchers.get(store_number, None)
+      if not prefetcher:
+        return
+
+      batch = prefetcher.GetBatch()
+      if not batch:
+        prefetcher.Stop()
+        # The entries the worker filtered out using the column stream.
+        number_of_filtered_entries = prefetcher.number_of_filtered_entries
+        self.number_of_filtered_entries += number_of_filtered_entries
+        del self._prefetchers[store_number]
+        return
+
+      batch = collections.deque(batch)
+      self._prefetch_batches[store_number] = batch
+
+    return batch.popleft()
+
+  def _GetPrefetchedSortedEntry(self):
+    """Return a sorted entry from the prefetched stores.
+
+    Returns:
+      An event object (instance of EventObject).
+    """
+    if not hasattr(self, '_merge_buffer'):
+      self._merge_buffer = []
+      number_range = getattr(self, 'store_range', list(self.GetProtoNumbers()))
+      for store_number in number_range:
+        prefetcher = _StorePrefetcher(
+            self._output_file, store_number, self._bound_first,
+            self._bound_last, self._prefetch_batch_size,
+            self._prefetch_maximum_number_of_batches,
+            column_matcher=self._column_matcher,
+            lazy_event_objects=self._lazy_event_objects,
+            use_processes=self._prefetch_use_processes)
+        prefetcher.Start()
+        self._prefetchers[store_number] = prefetcher
+
+      for store_number in number_range:
+        entry = self._GetNextPrefetchedEntry(store_number)
+        if entry:
+          heapq.heappush(self._merge_buffer, entry)
+
+    if not self._merge_buffer:
+      return
+
+    _, store_number, event_read = heapq.heappop(self._merge_buffer)
+
+    # Stop as soon as we hit the upper bound.
+    if event_read.timestamp > self._bound_last:
+      self._merge_buffer = []
+      self._StopPrefetchers()
+      return
+
+    entry = self._GetNextPrefetchedEntry(store_number)
+    if entry:
+      heapq.heappush(self._merge_buffer, entry)
+
+    event_read.tag = self._ReadEventTagByIdentifier(
+        event_read.store_number, event_read.store_index, event_read.uuid)
+
+    return event_read
+
+  def _StopPrefetchers(self):
+    """Stops the store prefetchers."""
+    for prefetcher in self._prefetchers.itervalues():
+      prefetcher.Stop()
+
+    self._prefetchers = {}
+    self._prefetch_batches = {}
+
+  def EnableLazyEventObjects(self):
+    """Enables reading event objects that decode attributes on demand.
+
+    Only storage files that use the protobuf serializer support lazy event
+    objects, see protobuf_serializer.ProtobufLazyEventObject.
+
+    Returns:
+      A boolean value indicating lazy event objects were enabled.
+    """
+    if self._event_serializer_format_string != 'proto':
+      return False
+
+    self._event_object_serializer = (
+        protobuf_serializer.ProtobufLazyEventObjectSerializer)
+    self._lazy_event_objects = True
+    return True
+
+  def EnablePrefetching(
+      self, batch_size=None, maximum_number_of_batches=None,
+      use_processes=False):
+    """Enables prefetching of the stores by GetSortedEntry.
+
+    When prefetching is enabled every store is read and decoded by a separate
+    worker and GetSortedEntry only merges the decoded event objects. Only
+    storage files opened by path can be prefetched.
+
+    Args:
+      batch_size: optional maximum number of event objects in a batch.
+                  The default is None, which represents
+                  DEFAULT_PREFETCH_BATCH_SIZE.
+      maximum_number_of_batches: optional maximum number of batches that are
+                                 prefetched per store. The default is None,
+                                 which represents
+                                 DEFAULT_PREFETCH_MAXIMUM_NUMBER_OF_BATCHES.
+      use_processes: optional boolean value to indicate the stores should be
+                     read by processes instead of threads. The default is
+                     False.
+
+    Returns:
+      A boolean value indicating prefetching was enabled.
+    """
+    if not isinstance(self._output_file, basestring):
+      logging.warning(
+          u'Unable to prefetch stores of a storage file not opened by path.')
+      return False
+
+    self._prefetch_batch_size = batch_size or self.DEFAULT_PREFETCH_BATCH_SIZE
+    self._prefetch_maximum_number_of_batches = (
+        maximum_number_of_batches or
+        self.DEFAULT_PREFETCH_MAXIMUM_NUMBER_OF_BATCHES)
+    self._prefetch_use_processes = use_processes
+    return True
+
   def GetEventObject(self, stream_number, entry_index=-1):
     """Reads an event object from the store.
 
@@ -1164,27 +1968,25 @@ class StorageFile(object):
     """Return the current file number of the storage."""
     return self._file_number
 
-  def AddEventObject(self, event_object):
-    """Adds an event object to the storage.
+  def _AppendEventObjectData(
+      self, timestamp, event_object_data, data_type, attributes):
+    """Appends serialized event object data to the buffer.
 
     Args:
-      event_object: an event object (instance of EventObject).
-
-    Raises:
-      IOError: When trying to write to a closed storage file.
+      timestamp: the timestamp of the event object.
+      event_object_data: a binary string containing the serialized event
+                         object.
+      data_type: the data type of the event object.
+      attributes: a dictionary containing the attribute values of the event
+                  object that are used for the counters and column values.
     """
-    if not self._file_open:
-      raise IOError(u'Trying to add an entry to a closed storage file.')
-
-    if event_object.timestamp > self._buffer_last_timestamp:
-      self._buffer_last_timestamp = event_object.timestamp
+    if timestamp > self._buffer_last_timestamp:
+      self._buffer_last_timestamp = timestamp
 
     # TODO: support negative timestamps.
-    if (event_object.timestamp < self._buffer_first_timestamp and
-        event_object.timestamp > 0):
-      self._buffer_first_timestamp = event_object.timestamp
+    if timestamp < self._buffer_first_timestamp and timestamp > 0:
+      self._buffer_first_timestamp = timestamp
 
-    attributes = event_object.GetValues()
     # Add values to counters.
     if self._pre_obj:
       self._pre_obj.counter['total'] += 1
@@ -1193,10 +1995,36 @@ class StorageFile(object):
         self._pre_obj.plugin_counter[attributes.get('plugin', 'N/A')] += 1
 
     # Add to temporary counter.
-    self._count_data_type[event_object.data_type] += 1
+    self._count_data_type[data_type] += 1
     parser = attributes.get('parser', 'unknown_parser')
     self._count_parser[parser] += 1
 
+    column_values = []
+    for column_name in self._COLUMN_NAMES:
+      value = attributes.get(column_name, None)
+      if value is not None:
+        value = utils.GetUnicodeString(value)
+      column_values.append(value)
+
+    self._buffer.append((timestamp, event_object_data, tuple(column_values)))
+    self._buffer_size += len(event_object_data)
+    self._write_counter += 1
+
+    if self._buffer_size > self._max_buffer_size:
+      self._FlushBuffer()
+
+  def AddEventObject(self, event_object):
+    """Adds an event object to the storage.
+
+    Args:
+      event_object: an event object (instance of EventObject).
+
+    Raises:
+      IOError: When trying to write to a closed storage file.
+    """
+    if not self._file_open:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
+
     event_object_data = self._event_object_serializer.WriteSerialized(
         event_object)
 
@@ -1205,13 +2033,47 @@ class StorageFile(object):
     if event_object_data is None:
       return
 
-    heapq.heappush(
-        self._buffer, (event_object.timestamp, event_object_data))
-    self._buffer_size += len(event_object_data)
-    self._write_counter += 1
+    self._AppendEventObjectData(
+        event_object.timestamp, event_object_data, event_object.data_type,
+        event_object.GetValues())
 
-    if self._buffer_size > self._max_buffer_size:
-      self._FlushBuffer()
+  def AddSerializedEventObject(self, serialized_event_object):
+    """Adds a serialized event object to the storage.
+
+       The serialized event object data is appended as-is, without
+       deserializing it, if it is in the serializer format of the storage.
+
+    Args:
+      serialized_event_object: a serialized event object (instance of
+                               SerializedEventObject).
+
+    Raises:
+      IOError: When trying to write to a closed storage file.
+    """
+    if not self._file_open:
+      raise IOError(u'Trying to add an entry to a closed storage file.')
+
+    if (serialized_event_object.serializer_format !=
+        self._event_serializer_format_string):
+      if serialized_event_object.serializer_format == 'json':
+        serializer = json_serializer.JsonEventObjectSerializer
+      else:
+        serializer = protobuf_serializer.ProtobufEventObjectSerializer
+
+      event_object = serializer.ReadSerialized(serialized_event_object.data)
+      self.AddEventObject(event_object)
+      return
+
+    attributes = {}
+    for attribute_name in ['data_type', 'parser', 'plugin', 'hostname',
+                           'filename']:
+      attribute_value = getattr(serialized_event_object, attribute_name, None)
+      if attribute_value is not None:
+        attributes[attribute_name] = attribute_value
+
+    self._AppendEventObjectData(
+        serialized_event_object.timestamp, serialized_event_object.data,
+        serialized_event_object.data_type, attributes)
 
   def AddEventObjects(self, event_objects):
     """Adds an event objects to the storage.
@@ -1283,6 +2145,49 @@ class StorageFile(object):
         report_string = file_object.read(self.MAX_REPORT_PROTOBUF_SIZE)
         yield self._analysis_report_serializer.ReadSerialized(report_string)
 
+  def GetFileEntryFingerprints(self):
+    """Retrieves the file entry fingerprints of incremental extraction runs.
+
+    Returns:
+      A set of integers containing the 64-bit fingerprints.
+    """
+    fingerprints = set()
+    for stream_name in self._GetStreamNames():
+      if stream_name.startswith('plaso_fingerprints.'):
+        data = self._ReadStream(stream_name)
+        number_of_fingerprints = len(data) // 8
+        fingerprints.update(struct.unpack(
+            '>{0:d}Q'.format(number_of_fingerprints),
+            data[:number_of_fingerprints * 8]))
+
+    return fingerprints
+
+  def StoreFileEntryFingerprints(self, fingerprints):
+    """Stores the file entry fingerprints of an incremental extraction run.
+
+    Args:
+      fingerprints: An iterable of integers containing the 64-bit
+                    fingerprints.
+    """
+    fingerprints = list(fingerprints)
+    if not fingerprints:
+      return
+
+    fingerprints_number = 1
+    for name in self._GetStreamNames():
+      if name.startswith('plaso_fingerprints.'):
+        _, _, number_string = name.partition('.')
+        try:
+          number = int(number_string, 10)
+        except ValueError:
+          number = 0
+        if number >= fingerprints_number:
+          fingerprints_number = number + 1
+
+    stream_name = 'plaso_fingerprints.{0:06d}'.format(fingerprints_number)
+    self._WriteStream(stream_name, struct.pack(
+        '>{0:d}Q'.format(len(fingerprints)), *fingerprints))
+
   def StoreGrouping(self, rows):
     """Store group information into the storage file.
 
@@ -1496,7 +2401,10 @@ class StorageFileWriter(queue.EventObjectQueueConsumer):
 
   def _ConsumeEventObject(self, event_object, **unused_kwargs):
     """Consumes an event object callback for ConsumeEventObjects."""
-    self._storage_file.AddEventObject(event_object)
+    if isinstance(event_object, event.SerializedEventObject):
+      self._storage_file.AddSerializedEventObject(event_object)
+    else:
+      self._storage_file.AddEventObject(event_object)
 
   def WriteEventObjects(self):
     """Writes the event objects that are pushed on the queue."""
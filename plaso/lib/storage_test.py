@@ -20,9 +20,11 @@
 import os
 import tempfile
 import shutil
+import struct
 import unittest
 import zipfile
 
+from plaso import filters
 from plaso.engine import queue
 from plaso.events import text_events
 from plaso.events import windows_events
@@ -89,6 +91,29 @@ class TempDirectory(object):
     shutil.rmtree(self.name, True)
 
 
+class StoreTimestampIndexTest(unittest.TestCase):
+  """Tests for the store timestamp index."""
+
+  def testGetLowerBoundEntryIndex(self):
+    """Test the GetLowerBoundEntryIndex function."""
+    timestamp_data = ''.join([
+        struct.pack('<q', timestamp) for timestamp in [2, 4, 4, 8, 16]])
+    timestamp_index = storage._StoreTimestampIndex(timestamp_data)
+
+    self.assertEquals(timestamp_index.number_of_entries, 5)
+    self.assertEquals(timestamp_index.GetTimestamp(3), 8)
+
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(0), 0)
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(2), 0)
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(3), 1)
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(4), 1)
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(9), 4)
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(17), 5)
+
+    timestamp_index = storage._StoreTimestampIndex('')
+    self.assertEquals(timestamp_index.GetLowerBoundEntryIndex(1), 0)
+
+
 class StorageFileTest(unittest.TestCase):
   """Tests for the plaso storage file."""
 
@@ -145,13 +170,222 @@ class StorageFileTest(unittest.TestCase):
       z_file = zipfile.ZipFile(temp_file, 'r', zipfile.ZIP_DEFLATED)
 
       expected_z_filename_list = [
-          'plaso_index.000001', 'plaso_meta.000001', 'plaso_proto.000001',
-          'plaso_timestamps.000001', 'serializer.txt']
+          'plaso_columns.000001', 'plaso_index.000001', 'plaso_meta.000001',
+          'plaso_proto.000001', 'plaso_timestamps.000001', 'serializer.txt']
 
       z_filename_list = sorted(z_file.namelist())
-      self.assertEquals(len(z_filename_list), 5)
+      self.assertEquals(len(z_filename_list), 6)
       self.assertEquals(z_filename_list, expected_z_filename_list)
 
+  def testFileEntryFingerprints(self):
+    """Test the StoreFileEntryFingerprints and GetFileEntryFingerprints."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+
+      with storage.StorageFile(temp_file) as store:
+        self.assertEquals(store.GetFileEntryFingerprints(), set())
+        store.StoreFileEntryFingerprints([0x0123456789abcdef, 1])
+
+      with storage.StorageFile(temp_file) as store:
+        store.StoreFileEntryFingerprints(set([0xfedcba9876543210, 1]))
+        store.StoreFileEntryFingerprints([])
+
+      with storage.StorageFile(temp_file, read_only=True) as store:
+        expected_fingerprints = set([
+            0x0123456789abcdef, 0xfedcba9876543210, 1])
+        self.assertEquals(
+            store.GetFileEntryFingerprints(), expected_fingerprints)
+
+        stream_names = sorted(
+            stream_name for stream_name in store._GetStreamNames()
+            if stream_name.startswith('plaso_fingerprints.'))
+        self.assertEquals(stream_names, [
+            'plaso_fingerprints.000001', 'plaso_fingerprints.000002'])
+
+  def testAddSerializedEventObject(self):
+    """Test adding event objects serialized by the workers."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file)
+      for event_object in self._event_objects:
+        event_object_data = (
+            protobuf_serializer.ProtobufEventObjectSerializer.WriteSerialized(
+                event_object))
+        serialized_event_object = event.SerializedEventObject(
+            event_object.timestamp, event_object_data, 'proto',
+            data_type=event_object.data_type, parser=event_object.parser)
+        store.AddSerializedEventObject(serialized_event_object)
+      store.Close()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      event_objects = list(read_store.GetEntries(1))
+      self.assertEquals(len(event_objects), 4)
+      self.assertEquals(
+          [event_object.timestamp for event_object in event_objects],
+          sorted(event_object.timestamp for event_object in self._event_objects))
+      self.assertEquals(event_objects[0].text, self._event_objects[3].text)
+      self.assertEquals(read_store.ReadMeta(1)['parsers'], ['UNKNOWN'])
+      read_store.Close()
+
+  def testFlushBuffer(self):
+    """Test flushing the buffer into multiple stores."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      # Use a small buffer size to force a flush after every second event.
+      store = storage.StorageFile(temp_file, buffer_size=512)
+      store.AddEventObjects(self._event_objects)
+      store.AddEventObjects(reversed(self._event_objects))
+      store.Close()
+
+      # The temporary files of the streams are removed after every flush.
+      self.assertEquals(os.listdir(dirname), ['plaso.db'])
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      store_numbers = list(read_store.GetProtoNumbers())
+      self.assertTrue(len(store_numbers) > 1)
+
+      number_of_events = 0
+      for store_number in store_numbers:
+        timestamps = [
+            event_object.timestamp
+            for event_object in read_store.GetEntries(store_number)]
+        self.assertEquals(timestamps, sorted(timestamps))
+        self.assertEquals(
+            len(timestamps), read_store.ReadMeta(store_number)['count'])
+        number_of_events += len(timestamps)
+
+      self.assertEquals(number_of_events, 8)
+
+      event_object = read_store.GetEventObject(store_numbers[0], entry_index=1)
+      self.assertNotEquals(event_object, None)
+      self.assertEquals(event_object.store_index, 1)
+      read_store.Close()
+
+  def testGetSortedEntryTimeRange(self):
+    """Test reading sorted entries within a time range."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file, buffer_size=512)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      pfilter.TimeRangeCache.ResetTimeConstraints()
+      pfilter.TimeRangeCache.SetLowerTimestamp(13349402860000000)
+      pfilter.TimeRangeCache.SetUpperTimestamp(13349615269295969)
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      read_store.SetStoreLimit()
+
+      timestamps = []
+      event_object = read_store.GetSortedEntry()
+      while event_object:
+        timestamps.append(event_object.timestamp)
+        event_object = read_store.GetSortedEntry()
+
+      read_store.Close()
+      pfilter.TimeRangeCache.ResetTimeConstraints()
+
+    self.assertEquals(timestamps, [13349402860000000, 13349615269295969])
+
+  def testGetSortedEntryColumnFilter(self):
+    """Test reading sorted entries that are filtered on column values."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      pfilter.TimeRangeCache.ResetTimeConstraints()
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      column_index = read_store._GetColumnIndex(1)
+      self.assertNotEquals(column_index, None)
+      self.assertEquals(
+          column_index.column_names,
+          ['data_type', 'parser', 'hostname', 'filename'])
+      self.assertEquals(column_index.GetColumnValues('parser'), [u'UNKNOWN'])
+
+      filter_object = filters.GetFilter('data_type contains \'registry\'')
+      read_store.SetStoreLimit(filter_object)
+
+      timestamps = []
+      event_object = read_store.GetSortedEntry()
+      while event_object:
+        timestamps.append(event_object.timestamp)
+        event_object = read_store.GetSortedEntry()
+
+      self.assertEquals(read_store.number_of_filtered_entries, 1)
+      read_store.Close()
+
+      expected_timestamps = [
+          13349402860000000, 13349615269295969, 13359662069295961]
+      self.assertEquals(timestamps, expected_timestamps)
+
+      read_store = storage.StorageFile(temp_file, read_only=True)
+      filter_object = filters.GetFilter('parser is \'winreg\'')
+      read_store.SetStoreLimit(filter_object)
+      self.assertEquals(read_store.store_range, [])
+      read_store.Close()
+
+  def testGetSortedEntryPrefetching(self):
+    """Test reading sorted entries with prefetching."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file, buffer_size=512)
+      store.AddEventObjects(self._event_objects)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      pfilter.TimeRangeCache.ResetTimeConstraints()
+
+      for use_processes in [False, True]:
+        read_store = storage.StorageFile(temp_file, read_only=True)
+        self.assertTrue(read_store.EnablePrefetching(
+            batch_size=1, use_processes=use_processes))
+
+        timestamps = []
+        event_object = read_store.GetSortedEntry()
+        while event_object:
+          timestamps.append(event_object.timestamp)
+          event_object = read_store.GetSortedEntry()
+
+        read_store.Close()
+
+        expected_timestamps = sorted([
+            event_object.timestamp for event_object in self._event_objects] * 2)
+        self.assertEquals(timestamps, expected_timestamps)
+
+  def testGetSortedEntryPrefetchingColumnFilter(self):
+    """Test reading sorted entries with prefetching and a column filter."""
+    with TempDirectory() as dirname:
+      temp_file = os.path.join(dirname, 'plaso.db')
+      store = storage.StorageFile(temp_file)
+      store.AddEventObjects(self._event_objects)
+      store.Close()
+
+      pfilter.TimeRangeCache.ResetTimeConstraints()
+
+      for use_processes in [False, True]:
+        read_store = storage.StorageFile(temp_file, read_only=True)
+        self.assertTrue(read_store.EnablePrefetching(
+            batch_size=1, use_processes=use_processes))
+
+        filter_object = filters.GetFilter('data_type contains \'registry\'')
+        read_store.SetStoreLimit(filter_object)
+
+        timestamps = []
+        event_object = read_store.GetSortedEntry()
+        while event_object:
+          timestamps.append(event_object.timestamp)
+          event_object = read_store.GetSortedEntry()
+
+        self.assertEquals(read_store.number_of_filtered_entries, 1)
+        read_store.Close()
+
+        expected_timestamps = [
+            13349402860000000, 13349615269295969, 13359662069295961]
+        self.assertEquals(timestamps, expected_timestamps)
+
   def testStorage(self):
     """Test the storage object."""
     event_objects = []
@@ -330,7 +564,8 @@ class StoreStorageTest(unittest.TestCase):
       event_object = store.GetSortedEntry()
 
     expected_timestamps = [
-        1344270407000000L, 1392438730000000L, 1427151678000000L,
+        1343166324000000L, 1344270407000000L, 1392438730000000L,
+        1418925272000000L, 1427151678000000L, 1427151678000123L,
         1451584472000000L]
 
     self.assertEquals(read_list, expected_timestamps)
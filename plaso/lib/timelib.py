@@ -25,6 +25,7 @@ The file can also contain common functions to change the default timestamp into
 a more human readable one.
 """
 
+import bisect
 import calendar
 import datetime
 import dateutil.parser
@@ -589,6 +590,275 @@ class Timestamp(object):
     return int(scrubbed + rounded * cls.MICRO_SECONDS_PER_SECOND)
 
 
+class TimestampFormatter(object):
+  """Class that converts timestamps into date and time strings of a timezone.
+
+  The UTC offset of a timestamp is looked up in the transition table of the
+  timezone and the date values are cached per day. The formatted date and
+  time strings are kept for the last second that was converted, since sorted
+  output converts the same second many times in a row. This is considerably
+  faster than converting every timestamp into a datetime object.
+  """
+
+  # The maximum number of days of which the date values are cached.
+  _MAXIMUM_NUMBER_OF_CACHED_DAYS = 65536
+
+  # The ordinal of 1970-01-01, the day number of the POSIX epoch.
+  _EPOCH_ORDINAL = datetime.date(1970, 1, 1).toordinal()
+
+  # The range of the day numbers, relative to the POSIX epoch, supported
+  # by the datetime module.
+  _MINIMUM_DAY_NUMBER = datetime.date.min.toordinal() - _EPOCH_ORDINAL
+  _MAXIMUM_DAY_NUMBER = datetime.date.max.toordinal() - _EPOCH_ORDINAL
+
+  # The values of the beginning of UNIX Epoch, which are used when a timestamp
+  # is out of bounds, see _GetValues.
+  _EPOCH_VALUES = (
+      (1970, 1, 1, 0, 0, 0, 0), u'1970-01-01', u'00:00:00', u'+00:00')
+
+  def __init__(self, timezone=pytz.utc):
+    """Initializes the timestamp formatter.
+
+    Args:
+      timezone: Optional timezone (instance of pytz.timezone).
+                The default is UTC.
+    """
+    super(TimestampFormatter, self).__init__()
+    self._cached_days = {}
+    self._last_number_of_seconds = None
+    self._last_values = None
+    self._timezone = timezone
+    self._transition_times = None
+    self._utc_offset = None
+    self._utc_offsets = None
+
+    # pylint: disable=protected-access
+    if hasattr(timezone, '_utc_transition_times'):
+      # The transition table of a pytz timezone with daylight saving time,
+      # which pytz uses in the same way to convert from UTC.
+      self._transition_times = [
+          calendar.timegm(transition_time.timetuple())
+          for transition_time in timezone._utc_transition_times]
+      self._utc_offsets = [
+          self._GetNumberOfSeconds(transition_info[0])
+          for transition_info in timezone._transition_info]
+
+    else:
+      try:
+        utc_offset = timezone.utcoffset(None)
+      except (AttributeError, TypeError, ValueError):
+        utc_offset = None
+
+      if utc_offset is not None:
+        self._utc_offset = self._GetNumberOfSeconds(utc_offset)
+
+  def _GetNumberOfSeconds(self, timedelta_object):
+    """Retrieves the number of seconds of a timedelta object."""
+    return timedelta_object.days * Timestamp.SECONDS_PER_DAY + (
+        timedelta_object.seconds)
+
+  def _GetUTCOffset(self, number_of_seconds):
+    """Retrieves the UTC offset.
+
+    Args:
+      number_of_seconds: the number of seconds since the POSIX epoch in UTC.
+
+    Returns:
+      The UTC offset in seconds.
+    """
+    if self._transition_times is None:
+      return self._utc_offset
+
+    index = bisect.bisect_right(self._transition_times, number_of_seconds) - 1
+    return self._utc_offsets[max(index, 0)]
+
+  def _CalculateValues(self, number_of_seconds):
+    """Calculates the date and time values of a number of seconds.
+
+    Args:
+      number_of_seconds: the number of seconds since the POSIX epoch in UTC.
+
+    Returns:
+      A tuple containing the year, month, day of month, hours, minutes,
+      seconds and the UTC offset in seconds.
+
+    Raises:
+      OverflowError: if the date is not supported by the datetime module.
+    """
+    if self._transition_times is None and self._utc_offset is None:
+      datetime_object = Timestamp.CopyToDatetime(
+          number_of_seconds * Timestamp.MICRO_SECONDS_PER_SECOND,
+          self._timezone, raise_error=True)
+      return (
+          datetime_object.year, datetime_object.month, datetime_object.day,
+          datetime_object.hour, datetime_object.minute, datetime_object.second,
+          self._GetNumberOfSeconds(datetime_object.utcoffset()))
+
+    day_number = number_of_seconds // Timestamp.SECONDS_PER_DAY
+    if not self._MINIMUM_DAY_NUMBER <= day_number <= self._MAXIMUM_DAY_NUMBER:
+      raise OverflowError(u'date value out of range')
+
+    utc_offset = self._GetUTCOffset(number_of_seconds)
+    day_number, seconds_of_day = divmod(
+        number_of_seconds + utc_offset, Timestamp.SECONDS_PER_DAY)
+
+    date_values = self._cached_days.get(day_number, None)
+    if not date_values:
+      if not self._MINIMUM_DAY_NUMBER <= day_number <= (
+          self._MAXIMUM_DAY_NUMBER):
+        raise OverflowError(u'date value out of range')
+
+      date_object = datetime.date.fromordinal(day_number + self._EPOCH_ORDINAL)
+      date_values = (date_object.year, date_object.month, date_object.day)
+
+      if len(self._cached_days) >= self._MAXIMUM_NUMBER_OF_CACHED_DAYS:
+        self._cached_days = {}
+      self._cached_days[day_number] = date_values
+
+    hours, seconds_of_day = divmod(seconds_of_day, 3600)
+    minutes, seconds = divmod(seconds_of_day, 60)
+    return date_values + (hours, minutes, seconds, utc_offset)
+
+  def _GetValues(self, timestamp, raise_error):
+    """Retrieves the cached date and time values and strings of a timestamp.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds.
+
+    Returns:
+      A tuple containing the date and time values, see _CalculateValues,
+      the date string, the time string and the UTC offset string.
+
+    Raises:
+      OverflowError: If raises_error is set to True and an OverflowError error
+                     occurs. Otherwise the error is absorbed and the values
+                     of the beginning of UNIX Epoch are returned.
+    """
+    number_of_seconds = timestamp // Timestamp.MICRO_SECONDS_PER_SECOND
+    if number_of_seconds == self._last_number_of_seconds:
+      return self._last_values
+
+    try:
+      date_time_values = self._CalculateValues(number_of_seconds)
+    except OverflowError as exception:
+      if raise_error:
+        raise
+      logging.error((
+          u'Unable to copy {0:d} to a datetime object with error: '
+          u'{1:s}').format(timestamp, exception))
+      return self._EPOCH_VALUES
+
+    year, month, day_of_month, hours, minutes, seconds, utc_offset = (
+        date_time_values)
+
+    if utc_offset < 0:
+      utc_offset_sign = u'-'
+      utc_offset = -utc_offset
+    else:
+      utc_offset_sign = u'+'
+
+    utc_offset_hours, utc_offset_minutes = divmod(utc_offset // 60, 60)
+
+    self._last_number_of_seconds = number_of_seconds
+    self._last_values = (
+        date_time_values,
+        u'{0:04d}-{1:02d}-{2:02d}'.format(year, month, day_of_month),
+        u'{0:02d}:{1:02d}:{2:02d}'.format(hours, minutes, seconds),
+        u'{0:s}{1:02d}:{2:02d}'.format(
+            utc_offset_sign, utc_offset_hours, utc_offset_minutes))
+    return self._last_values
+
+  def CopyToDateTimeValues(self, timestamp, raise_error=False):
+    """Copies the timestamp to date and time values.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A tuple containing the year, month, day of month, hours, minutes and
+      seconds.
+
+    Raises:
+      OverflowError: If raises_error is set to True and an OverflowError error
+                     occurs. Otherwise the error is absorbed and the values
+                     of the beginning of UNIX Epoch are returned.
+    """
+    date_time_values, _, _, _ = self._GetValues(timestamp, raise_error)
+    return date_time_values[:6]
+
+  def CopyToDateString(self, timestamp, raise_error=False):
+    """Copies the timestamp to a date string formatted as YYYY-MM-DD.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A string containing the date.
+
+    Raises:
+      OverflowError: If raises_error is set to True and an OverflowError error
+                     occurs.
+    """
+    _, date_string, _, _ = self._GetValues(timestamp, raise_error)
+    return date_string
+
+  def CopyToTimeString(self, timestamp, raise_error=False):
+    """Copies the timestamp to a time string formatted as HH:MM:SS.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A string containing the time.
+
+    Raises:
+      OverflowError: If raises_error is set to True and an OverflowError error
+                     occurs.
+    """
+    _, _, time_string, _ = self._GetValues(timestamp, raise_error)
+    return time_string
+
+  def CopyToIsoFormat(self, timestamp, raise_error=False):
+    """Copies the timestamp to an ISO 8601 formatted string.
+
+       The string is the same as that of Timestamp.CopyToIsoFormat.
+
+    Args:
+      timestamp: An integer containing the timestamp.
+      raise_error: Boolean that if set to True will not absorb an OverflowError
+                   if the timestamp is out of bounds. By default there will be
+                   no error raised.
+
+    Returns:
+      A string containing an ISO 8601 formatted date and time.
+
+    Raises:
+      OverflowError: If raises_error is set to True and an OverflowError error
+                     occurs.
+    """
+    values = self._GetValues(timestamp, raise_error)
+    _, date_string, time_string, utc_offset_string = values
+
+    microseconds = timestamp % Timestamp.MICRO_SECONDS_PER_SECOND
+    if microseconds and values is not self._EPOCH_VALUES:
+      return u'{0:s}T{1:s}.{2:06d}{3:s}'.format(
+          date_string, time_string, microseconds, utc_offset_string)
+
+    return u'{0:s}T{1:s}{2:s}'.format(
+        date_string, time_string, utc_offset_string)
+
+
 def StringToDatetime(
     time_string, timezone=pytz.utc, dayfirst=False, gmt_as_timezone=True):
   """Converts a string representation of a timestamp into a datetime object.
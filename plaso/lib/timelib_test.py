@@ -527,5 +527,50 @@ class TimeLibUnitTest(unittest.TestCase):
         471964380, '12-15-1984 05:13:00', timezone=pytz.timezone('US/Pacific'))
 
 
+
+class TimestampFormatterTest(unittest.TestCase):
+  """Tests for the timestamp formatter."""
+
+  def testCopyToIsoFormat(self):
+    """Test that the ISO 8601 strings are the same as those of Timestamp."""
+    timestamps = [
+        CopyStringToTimestamp('2013-03-14 20:20:08.850041'),
+        CopyStringToTimestamp('2013-03-31 00:59:59'),
+        CopyStringToTimestamp('2013-03-31 01:00:00'),
+        CopyStringToTimestamp('2013-10-27 00:59:59.999999'),
+        CopyStringToTimestamp('2013-10-27 01:00:00'),
+        CopyStringToTimestamp('1900-01-01 00:00:00'),
+        0, -1]
+
+    for timezone_name in ['UTC', 'CET', 'America/St_Johns', 'Asia/Kolkata']:
+      timezone = pytz.timezone(timezone_name)
+      timestamp_formatter = timelib.TimestampFormatter(timezone)
+      for timestamp in timestamps:
+        self.assertEquals(
+            timestamp_formatter.CopyToIsoFormat(timestamp),
+            timelib.Timestamp.CopyToIsoFormat(timestamp, timezone=timezone))
+
+  def testCopyToDateAndTimeStrings(self):
+    """Test the CopyToDateString and CopyToTimeString functions."""
+    timestamp_formatter = timelib.TimestampFormatter(pytz.timezone('CET'))
+
+    timestamp = CopyStringToTimestamp('2013-12-31 23:20:08.850041')
+    self.assertEquals(
+        timestamp_formatter.CopyToDateString(timestamp), u'2014-01-01')
+    self.assertEquals(
+        timestamp_formatter.CopyToTimeString(timestamp), u'00:20:08')
+    self.assertEquals(
+        timestamp_formatter.CopyToDateTimeValues(timestamp),
+        (2014, 1, 1, 0, 20, 8))
+
+    timestamp = timelib.Timestamp.TIMESTAMP_MAX_MICRO_SECONDS
+    with self.assertRaises(OverflowError):
+      timestamp_formatter.CopyToDateString(timestamp, raise_error=True)
+
+    self.assertEquals(
+        timestamp_formatter.CopyToIsoFormat(timestamp),
+        u'1970-01-01T00:00:00+00:00')
+
+
 if __name__ == '__main__':
   unittest.main()
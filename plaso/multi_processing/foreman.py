@@ -19,6 +19,7 @@
 
 import collections
 import logging
+import time
 
 from plaso.multi_processing import process_info
 
@@ -37,25 +38,30 @@ class Foreman(object):
   This information is gathered using both RPC calls to the worker
   itself as well as data provided by the psutil library.
 
-  In the future the Foreman should be able to actively monitor
-  the health of the processes and terminate and restart processes
-  that are stuck.
+  The Foreman terminates worker processes that are no longer functioning
+  or, if a worker timeout is set, that are stuck on a file entry. The
+  engine replaces the terminated worker processes.
   """
 
   PROCESS_LABEL = collections.namedtuple('process_label', 'label pid process')
 
-  def __init__(self, show_memory_usage=False):
+  def __init__(self, show_memory_usage=False, worker_timeout=None):
     """Initialize the foreman process.
 
     Args:
       show_memory_usage: Optional boolean value to indicate memory information
                          should be included in logging. The default is false.
+      worker_timeout: Optional number of seconds after which a worker that
+                      made no progress on a file entry is considered stuck.
+                      The default is None, which disables the check.
     """
+    self._last_progress = {}
     self._last_status_dict = {}
     self._process_information = process_info.ProcessInfo()
     self._process_labels = []
     self._processing_done = False
     self._show_memory_usage = show_memory_usage
+    self._worker_timeout = worker_timeout
 
   @property
   def labels(self):
@@ -78,7 +84,8 @@ class Foreman(object):
       self._CheckStatus(label)
       return
 
-    for process_label in self._process_labels:
+    # Checking the status can remove the process label from the watch list.
+    for process_label in list(self._process_labels):
       self._CheckStatus(process_label)
 
   def GetLabel(self, name=None, pid=None):
@@ -222,9 +229,8 @@ class Foreman(object):
     or terminating a process that is alive and hanging, or not alive while
     it should be alive.
 
-    In the future this function will also be responsible for restarting
-    a worker, or signalling the engine that it needs to spin up a new worker
-    in the case of a worker dying or being in an effective zombie state.
+    The engine is responsible for starting a new worker in place of
+    a terminated one.
 
     Args:
       label: A process label (instance of PROCESS_LABEL).
@@ -247,6 +253,16 @@ class Foreman(object):
           self._LogWorkerInformation(label, status_dict)
           if self._show_memory_usage:
             self._LogMemoryUsage(label)
+
+          if not self._IsStuck(label, status_dict):
+            return
+
+          logging.error((
+              u'Process {0:s} [{1:d}] made no progress in {2:d} seconds on: '
+              u'{3:s}. Terminating it and removing from list.').format(
+                  label.label, label.pid, self._worker_timeout,
+                  status_dict.get('current_file', u'')))
+          self._TerminateProcess(label)
           return
         else:
           logging.info(
@@ -265,15 +281,45 @@ class Foreman(object):
       self.StopMonitoringWorker(label=label)
       return
 
-    # We need to terminate the process.
-    # TODO: Add a function to start a new instance of a worker instead of
-    # just removing and killing it.
+    # We need to terminate the process, the engine starts a new worker.
     logging.error(
         u'Process {0:s} [{1:d}] is not functioning when it should be. '
         u'Terminating it and removing from list.'.format(
             label.label, label.pid))
     self._TerminateProcess(label)
 
+  def _IsStuck(self, label, status_dict):
+    """Determines if a worker process is stuck on a file entry.
+
+    A worker is stuck if it is processing a file entry and both its number
+    of extracted events and its current file did not change within the
+    worker timeout.
+
+    Args:
+      label: A process label (instance of PROCESS_LABEL).
+      status_dict: The status dictionary of the worker.
+
+    Returns:
+      A boolean value indicating the worker is stuck.
+    """
+    if not self._worker_timeout:
+      return False
+
+    if not status_dict.get('is_processing_file_entry', False):
+      self._last_progress.pop(label.pid, None)
+      return False
+
+    progress = (status_dict.get('counter'), status_dict.get('current_file'))
+    timestamp = time.time()
+
+    last_progress, last_timestamp = self._last_progress.get(
+        label.pid, (None, None))
+    if progress != last_progress:
+      self._last_progress[label.pid] = (progress, timestamp)
+      return False
+
+    return timestamp - last_timestamp >= self._worker_timeout
+
   def _LogMemoryUsage(self, label):
     """Logs memory information gathered from a process.
 
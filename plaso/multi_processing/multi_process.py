@@ -63,13 +63,35 @@ class MultiProcessEngine(engine.BaseEngine):
   _WORKER_PROCESSES_MINIMUM = 2
   _WORKER_PROCESSES_MAXIMUM = 15
 
-  def __init__(self, maximum_number_of_queued_items=0):
+  # The maximum number of worker processes that are started in place of
+  # worker processes that crashed or were terminated.
+  _MAXIMUM_NUMBER_OF_WORKER_RESPAWNS = 100
+
+  # The number of queued path specifications per worker process above which
+  # dynamic scaling starts an additional worker process.
+  _SCALE_UP_QUEUE_DEPTH_PER_WORKER = 20
+
+  # The number of queued event object batches above which the storage process
+  # is considered a bottleneck and dynamic scaling retires a worker process.
+  _STORAGE_QUEUE_BACKLOG = 100
+
+  def __init__(
+      self, maximum_number_of_queued_items=0,
+      maximum_number_of_batched_events=None, maximum_event_batch_size=None):
     """Initialize the multi-process engine object.
 
     Args:
       maximum_number_of_queued_items: The maximum number of queued items.
                                       The default is 0, which represents
                                       no limit.
+      maximum_number_of_batched_events: Optional maximum number of event
+                                        objects the workers batch into
+                                        a single storage queue item.
+                                        The default is None, which represents
+                                        the batch producer default.
+      maximum_event_batch_size: Optional maximum size in bytes of a batch
+                                of event objects. The default is None,
+                                which represents the batch producer default.
     """
     collection_queue = MultiProcessingQueue(
         maximum_number_of_queued_items=maximum_number_of_queued_items)
@@ -81,8 +103,20 @@ class MultiProcessEngine(engine.BaseEngine):
     super(MultiProcessEngine, self).__init__(
         collection_queue, storage_queue, parse_error_queue)
 
+    # Event objects cross the process boundary to the storage process in
+    # batches to reduce the per event object queue overhead.
+    self._event_queue_producer = queue.ItemQueueBatchProducer(
+        storage_queue, maximum_number_of_items=maximum_number_of_batched_events,
+        maximum_batch_size=maximum_event_batch_size)
+
     self._collection_process = None
     self._foreman_object = None
+    self._maximum_number_of_workers = None
+    self._minimum_number_of_workers = None
+    self._next_worker_number = 0
+    self._number_of_worker_respawns = 0
+    self._parser_filter_string = None
+    self._retiring_worker_names = set()
     self._storage_process = None
 
     # TODO: turn into a process pool.
@@ -93,6 +127,161 @@ class MultiProcessEngine(engine.BaseEngine):
     self._rpc_proxy_server = None
     self._rpc_port_number = 0
 
+  def _CheckWorkerProcesses(self):
+    """Checks the worker processes and replaces crashed worker processes.
+
+       Worker processes that exited are removed. A worker process that
+       exited with an error, e.g. because a parser crashed or because the
+       foreman terminated it, is replaced by a new worker process, unless
+       it was being retired.
+    """
+    for worker_name, worker_process in sorted(self._worker_processes.items()):
+      if worker_process.is_alive():
+        continue
+
+      del self._worker_processes[worker_name]
+
+      if self._foreman_object:
+        worker_label = self._foreman_object.GetLabel(
+            name=worker_name, pid=worker_process.pid)
+        if worker_label:
+          self._foreman_object.StopMonitoringWorker(label=worker_label)
+
+      if worker_name in self._retiring_worker_names:
+        self._retiring_worker_names.remove(worker_name)
+        continue
+
+      if worker_process.exitcode == 0:
+        continue
+
+      self._RespawnWorkerProcess(worker_name, worker_process.exitcode)
+
+  def _GetLoadAverage(self):
+    """Retrieves the host load average over the last minute.
+
+    Returns:
+      A floating point value containing the load average or None if not
+      available on the platform.
+    """
+    try:
+      load_average, _, _ = os.getloadavg()
+    except (AttributeError, OSError):
+      return
+
+    return load_average
+
+  def _RespawnWorkerProcess(self, worker_name, exit_code):
+    """Starts a new worker process in place of one that exited with an error.
+
+    Args:
+      worker_name: The name of the worker process that exited.
+      exit_code: The exit code of the worker process.
+    """
+    if self._number_of_worker_respawns >= (
+        self._MAXIMUM_NUMBER_OF_WORKER_RESPAWNS):
+      logging.error((
+          u'Worker process: {0:s} exited with code: {1!s}, not starting a '
+          u'new worker, maximum number of respawns reached.').format(
+              worker_name, exit_code))
+      return
+
+    self._number_of_worker_respawns += 1
+    new_worker_name = self._StartWorkerProcess()
+    logging.warning((
+        u'Worker process: {0:s} exited with code: {1!s}, started: {2:s} in '
+        u'its place.').format(worker_name, exit_code, new_worker_name))
+
+  def _ScaleWorkerProcesses(self):
+    """Adds or retires a worker process based on the processing load.
+
+       A worker process is added if the process queue is deep while the
+       storage process keeps up and the host has CPU time left. A worker
+       process is retired if the storage process is the bottleneck or the
+       host is overloaded.
+
+       A worker process is retired by signaling it directly, so that it
+       stops after the file entry it is processing instead of after the
+       queued path specifications. Only one worker process is retired at
+       a time, since the storage queue backlog only decreases once the
+       retiring worker process has stopped.
+    """
+    try:
+      process_queue_depth = len(self._collection_queue)
+      storage_queue_depth = len(self.storage_queue)
+    except NotImplementedError:
+      return
+
+    number_of_workers = (
+        len(self._worker_processes) - len(self._retiring_worker_names))
+    cpu_count = multiprocessing.cpu_count()
+    load_average = self._GetLoadAverage()
+
+    storage_backlog = storage_queue_depth >= self._STORAGE_QUEUE_BACKLOG
+    host_overloaded = (
+        load_average is not None and load_average > cpu_count * 1.5)
+
+    if storage_backlog or host_overloaded:
+      if (not self._retiring_worker_names and
+          number_of_workers > self._minimum_number_of_workers):
+        worker_name = self._RetireWorkerProcess()
+        logging.info((
+            u'Retiring worker process: {0:s}, storage queue: {1:d}, load '
+            u'average: {2!s}.').format(
+                worker_name, storage_queue_depth, load_average))
+
+    elif (process_queue_depth >
+          number_of_workers * self._SCALE_UP_QUEUE_DEPTH_PER_WORKER and
+          (load_average is None or load_average < cpu_count)):
+      if number_of_workers < self._maximum_number_of_workers:
+        worker_name = self._StartWorkerProcess()
+        logging.info((
+            u'Started worker process: {0:s}, process queue: {1:d}, load '
+            u'average: {2!s}.').format(
+                worker_name, process_queue_depth, load_average))
+
+  def _RetireWorkerProcess(self):
+    """Signals the most recently started worker process to retire.
+
+    Returns:
+      The name of the retiring worker process or None if there is no worker
+      process to retire.
+    """
+    for worker_name, worker_process in sorted(
+        self._worker_processes.items(), reverse=True,
+        key=lambda item: item[1].worker_number):
+      if worker_name in self._retiring_worker_names:
+        continue
+
+      worker_process.SignalRetire()
+      self._retiring_worker_names.add(worker_name)
+      return worker_name
+
+  def _StartWorkerProcess(self):
+    """Starts an extraction worker process.
+
+    Returns:
+      The name of the worker process.
+    """
+    worker_number = self._next_worker_number
+    self._next_worker_number += 1
+
+    extraction_worker = self.CreateExtractionWorker(worker_number)
+
+    worker_name = u'Worker_{0:d}'.format(worker_number)
+
+    # TODO: Test to see if a process pool can be a better choice.
+    worker_process = MultiProcessEventExtractionWorkerProcess(
+        extraction_worker, self._parser_filter_string, worker_number,
+        name=worker_name)
+    worker_process.start()
+
+    if self._foreman_object:
+      self._foreman_object.MonitorWorker(
+          pid=worker_process.pid, name=worker_name)
+
+    self._worker_processes[worker_name] = worker_process
+    return worker_name
+
   def _StartRPCProxyServerThread(self, foreman_object):
     """Starts the RPC proxy server thread.
 
@@ -192,6 +381,11 @@ class MultiProcessEngine(engine.BaseEngine):
         self._event_queue_producer, self._parse_error_queue_producer,
         self.knowledge_base)
 
+    if self._serializer_format:
+      # Serialize the event objects in the worker processes to move the
+      # serialization off the storage process.
+      parser_context.SetEventObjectSerializerFormat(self._serializer_format)
+
     extraction_worker = worker.BaseEventExtractionWorker(
         worker_number, self._collection_queue, self._event_queue_producer,
         self._parse_error_queue_producer, parser_context)
@@ -209,6 +403,13 @@ class MultiProcessEngine(engine.BaseEngine):
     if self._filter_object:
       extraction_worker.SetFilterObject(self._filter_object)
 
+    if self._fingerprints_directory:
+      fingerprints_path = os.path.join(
+          self._fingerprints_directory, u'worker_{0:d}.db'.format(
+              worker_number))
+      extraction_worker.SetFileEntryFingerprints(
+          self._fingerprints, fingerprints_path)
+
     if self._mount_path:
       extraction_worker.SetMountPath(self._mount_path)
 
@@ -220,9 +421,17 @@ class MultiProcessEngine(engine.BaseEngine):
   def ProcessSource(
       self, collector_object, storage_writer, parser_filter_string=None,
       number_of_extraction_workers=0, have_collection_process=True,
-      have_foreman_process=True, show_memory_usage=False):
+      have_foreman_process=True, show_memory_usage=False,
+      minimum_number_of_extraction_workers=None,
+      maximum_number_of_extraction_workers=None, worker_timeout=None):
     """Processes the source and extracts event objects.
 
+       Worker processes that crash or that the foreman terminates are
+       replaced by new worker processes. If a minimum or maximum number of
+       extraction workers is set, worker processes are added and retired
+       during collection based on the depth of the process and storage
+       queues and on the host load.
+
     Args:
       collector_object: A collector object (instance of Collector).
       storage_writer: A storage writer object (instance of BaseStorageWriter).
@@ -240,6 +449,18 @@ class MultiProcessEngine(engine.BaseEngine):
                             is true.
       show_memory_usage: Optional boolean value to indicate memory information
                          should be included in logging. The default is false.
+      minimum_number_of_extraction_workers: Optional minimum number of
+                                            extraction worker processes
+                                            for dynamic scaling. The default
+                                            is None.
+      maximum_number_of_extraction_workers: Optional maximum number of
+                                            extraction worker processes
+                                            for dynamic scaling. The default
+                                            is None.
+      worker_timeout: Optional number of seconds after which the foreman
+                      terminates a worker process that made no progress on
+                      a file entry. The default is None, which disables
+                      the check.
     """
     if number_of_extraction_workers < 1:
       # One worker for each "available" CPU (minus other processes).
@@ -262,9 +483,26 @@ class MultiProcessEngine(engine.BaseEngine):
 
       number_of_extraction_workers = cpu_count
 
+    dynamic_scaling = bool(
+        minimum_number_of_extraction_workers or
+        maximum_number_of_extraction_workers)
+    if dynamic_scaling:
+      self._minimum_number_of_workers = (
+          minimum_number_of_extraction_workers or
+          self._WORKER_PROCESSES_MINIMUM)
+      self._maximum_number_of_workers = max(
+          maximum_number_of_extraction_workers or
+          self._WORKER_PROCESSES_MAXIMUM, self._minimum_number_of_workers)
+
+      number_of_extraction_workers = min(max(
+          number_of_extraction_workers, self._minimum_number_of_workers),
+          self._maximum_number_of_workers)
+
+    self._parser_filter_string = parser_filter_string
+
     if have_foreman_process:
       self._foreman_object = foreman.Foreman(
-          show_memory_usage=show_memory_usage)
+          show_memory_usage=show_memory_usage, worker_timeout=worker_timeout)
       self._StartRPCProxyServerThread(self._foreman_object)
 
     self._storage_process = MultiProcessStorageProcess(
@@ -277,21 +515,8 @@ class MultiProcessEngine(engine.BaseEngine):
       self._collection_process.start()
 
     logging.info(u'Starting extraction worker processes.')
-    for worker_number in range(number_of_extraction_workers):
-      extraction_worker = self.CreateExtractionWorker(worker_number)
-
-      worker_name = u'Worker_{0:d}'.format(worker_number)
-
-      # TODO: Test to see if a process pool can be a better choice.
-      worker_process = MultiProcessEventExtractionWorkerProcess(
-          extraction_worker, parser_filter_string, name=worker_name)
-      worker_process.start()
-
-      if self._foreman_object:
-        self._foreman_object.MonitorWorker(
-            pid=worker_process.pid, name=worker_name)
-
-      self._worker_processes[worker_name] = worker_process
+    for _ in range(number_of_extraction_workers):
+      self._StartWorkerProcess()
 
     logging.debug(u'Collection started.')
     if not self._collection_process:
@@ -309,6 +534,11 @@ class MultiProcessEngine(engine.BaseEngine):
           # before the collection thread joins. Look at the option of speeding
           # up the process of the collector stopping by potentially killing it.
 
+        self._CheckWorkerProcesses()
+
+        if dynamic_scaling and self._collection_process.is_alive():
+          self._ScaleWorkerProcesses()
+
     logging.info(u'Collection stopped.')
 
     self._StopProcessing()
@@ -350,6 +580,12 @@ class MultiProcessEngine(engine.BaseEngine):
                 process_name, process_obj.pid))
 
           del self._worker_processes[process_name]
+
+          # The worker crashed or was terminated by the foreman.
+          if process_name in self._retiring_worker_names:
+            self._retiring_worker_names.remove(process_name)
+          elif process_obj.exitcode != 0:
+            self._RespawnWorkerProcess(process_name, process_obj.exitcode)
           continue
 
         if process_obj.is_alive():
@@ -366,6 +602,12 @@ class MultiProcessEngine(engine.BaseEngine):
           process_obj.terminate()
           self._foreman_object.TerminateProcess(label=worker_label)
 
+          del self._worker_processes[process_name]
+          if process_name in self._retiring_worker_names:
+            self._retiring_worker_names.remove(process_name)
+          else:
+            self._RespawnWorkerProcess(process_name, process_obj.exitcode)
+
         else:
           # Process is no longer alive, no need to monitor.
           self._foreman_object.StopMonitoringWorker(label=worker_label)
@@ -524,17 +766,26 @@ class MultiProcessCollectionProcess(multiprocessing.Process):
 class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
   """Class that defines a multi-processing event extraction worker process."""
 
-  def __init__(self, extraction_worker, parser_filter_string, **kwargs):
+  def __init__(
+      self, extraction_worker, parser_filter_string, worker_number, **kwargs):
     """Initializes the process object.
 
     Args:
       extraction_worker: The extraction worker object (instance of
                          MultiProcessEventExtractionWorker).
       parser_filter_string: Optional parser filter string. The default is None.
+      worker_number: A number that identifies the worker.
     """
     super(MultiProcessEventExtractionWorkerProcess, self).__init__(**kwargs)
     self._extraction_worker = extraction_worker
 
+    # The retire event is the control channel that signals the worker to
+    # stop, independent of the path specifications queued in the process
+    # queue.
+    self._retire_event = multiprocessing.Event()
+    self._extraction_worker.SetRetireEvent(self._retire_event)
+    self.worker_number = worker_number
+
     # TODO: clean this up with the implementation of a task based
     # multi-processing approach.
     self._parser_filter_string = parser_filter_string
@@ -610,6 +861,10 @@ class MultiProcessEventExtractionWorkerProcess(multiprocessing.Process):
     """Signals the process to abort."""
     self._extraction_worker.SignalAbort()
 
+  def SignalRetire(self):
+    """Signals the process to stop after the file entry it is processing."""
+    self._retire_event.set()
+
 
 class MultiProcessStorageProcess(multiprocessing.Process):
   """Class that defines a multi-processing storage process."""
@@ -17,12 +17,70 @@
 # limitations under the License.
 """Tests the multi-process processing engine."""
 
+import multiprocessing
 import unittest
 
+from plaso.engine import queue
 from plaso.engine import test_lib
 from plaso.multi_processing import multi_process
 
 
+class TestQueue(object):
+  """Class that implements a test queue of a fixed length."""
+
+  def __init__(self, number_of_items):
+    """Initializes the test queue.
+
+    Args:
+      number_of_items: the number of items in the queue.
+    """
+    super(TestQueue, self).__init__()
+    self._number_of_items = number_of_items
+
+  def __len__(self):
+    """Returns the number of items in the queue."""
+    return self._number_of_items
+
+
+class TestRetiringQueueConsumer(test_lib.TestQueueConsumer):
+  """Class that implements a test queue consumer that retires itself."""
+
+  def _ConsumeItem(self, item):
+    """Consumes an item and signals the consumer to retire.
+
+    Args:
+      item: the item object.
+    """
+    super(TestRetiringQueueConsumer, self)._ConsumeItem(item)
+    self._retire_event.set()
+
+
+class TestWorkerProcess(object):
+  """Class that implements a test worker process."""
+
+  def __init__(self, worker_number):
+    """Initializes the test worker process.
+
+    Args:
+      worker_number: a number that identifies the worker.
+    """
+    super(TestWorkerProcess, self).__init__()
+    self.exitcode = None
+    self.pid = None
+    self.retire_signaled = False
+    self.worker_number = worker_number
+
+  # This method part of the multiprocessing.Process interface hence its name
+  # is not following the style guide.
+  def is_alive(self):
+    """Determines if the test worker process is alive."""
+    return self.exitcode is None
+
+  def SignalRetire(self):
+    """Signals the test worker process to retire."""
+    self.retire_signaled = True
+
+
 class MultiProcessingQueueTest(unittest.TestCase):
   """Tests the multi-processing queue."""
 
@@ -47,6 +105,187 @@ class MultiProcessingQueueTest(unittest.TestCase):
 
     self.assertEquals(test_queue_consumer.number_of_items, len(self._ITEMS))
 
+  def testBatchProducer(self):
+    """Tests pushing batches of items with the batch producer."""
+    test_queue = multi_process.MultiProcessingQueue()
+    test_queue_producer = queue.ItemQueueBatchProducer(
+        test_queue, maximum_number_of_items=3)
+
+    items = sorted(self._ITEMS)
+    test_queue_producer.ProduceItems(items)
+
+    try:
+      # The first 3 items are pushed as a single batch, the remaining item is
+      # buffered by the producer.
+      self.assertEquals(len(test_queue), 1)
+    except NotImplementedError:
+      # On Mac OS X because of broken sem_getvalue()
+      return
+
+    test_queue_producer.SignalEndOfInput()
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+
+    self.assertEquals(test_queue_consumer.items, items)
+
+  def testRetireEvent(self):
+    """Tests that the retire event stops a single consumer."""
+    test_queue = multi_process.MultiProcessingQueue()
+
+    items = sorted(self._ITEMS)
+    for item in items:
+      test_queue.PushItem(item)
+    test_queue.SignalEndOfInput()
+
+    retire_event = multiprocessing.Event()
+    test_queue_consumer = TestRetiringQueueConsumer(test_queue)
+    test_queue_consumer.SetRetireEvent(retire_event)
+    test_queue_consumer.ConsumeItems()
+    self.assertTrue(retire_event.is_set())
+    self.assertEquals(test_queue_consumer.items, items[:1])
+
+    # The remaining items are consumed by another consumer.
+    test_queue_consumer = test_lib.TestQueueConsumer(test_queue)
+    test_queue_consumer.ConsumeItems()
+    self.assertEquals(test_queue_consumer.items, items[1:])
+
+
+class MultiProcessEngineTest(unittest.TestCase):
+  """Tests the multi-process engine."""
+
+  def _CreateEngine(self, load_average=0.0):
+    """Creates a multi-process engine with test worker processes.
+
+    Args:
+      load_average: optional load average of the host. The default is 0.0.
+
+    Returns:
+      A multi-process engine (instance of MultiProcessEngine).
+    """
+    engine_object = multi_process.MultiProcessEngine()
+    # pylint: disable=protected-access
+    engine_object._GetLoadAverage = lambda: load_average
+    engine_object._StartWorkerProcess = lambda: self._StartWorkerProcess(
+        engine_object)
+    engine_object._minimum_number_of_workers = 2
+    engine_object._maximum_number_of_workers = 4
+    return engine_object
+
+  def _StartWorkerProcess(self, engine_object):
+    """Starts a test worker process in place of an extraction worker process.
+
+    Args:
+      engine_object: the multi-process engine (instance of MultiProcessEngine).
+
+    Returns:
+      The name of the worker process.
+    """
+    # pylint: disable=protected-access
+    worker_number = engine_object._next_worker_number
+    engine_object._next_worker_number += 1
+
+    worker_name = u'Worker_{0:d}'.format(worker_number)
+    engine_object._worker_processes[worker_name] = TestWorkerProcess(
+        worker_number)
+    return worker_name
+
+  def testCheckWorkerProcesses(self):
+    """Tests the _CheckWorkerProcesses and _RespawnWorkerProcess functions."""
+    engine_object = self._CreateEngine()
+    # pylint: disable=protected-access
+    for _ in range(3):
+      engine_object._StartWorkerProcess()
+
+    # A worker process that completed is removed, a crashed worker process
+    # is replaced.
+    engine_object._worker_processes[u'Worker_0'].exitcode = 0
+    engine_object._worker_processes[u'Worker_1'].exitcode = -9
+    engine_object._CheckWorkerProcesses()
+
+    self.assertEquals(
+        sorted(engine_object._worker_processes.keys()),
+        [u'Worker_2', u'Worker_3'])
+    self.assertEquals(engine_object._number_of_worker_respawns, 1)
+
+    # A retiring worker process is not replaced.
+    self.assertEquals(engine_object._RetireWorkerProcess(), u'Worker_3')
+    engine_object._worker_processes[u'Worker_3'].exitcode = -15
+    engine_object._CheckWorkerProcesses()
+
+    self.assertEquals(engine_object._worker_processes.keys(), [u'Worker_2'])
+    self.assertEquals(engine_object._retiring_worker_names, set())
+    self.assertEquals(engine_object._number_of_worker_respawns, 1)
+
+    # No worker processes are started once the maximum number of respawns
+    # is reached.
+    engine_object._number_of_worker_respawns = (
+        engine_object._MAXIMUM_NUMBER_OF_WORKER_RESPAWNS)
+    engine_object._worker_processes[u'Worker_2'].exitcode = 1
+    engine_object._CheckWorkerProcesses()
+    self.assertEquals(engine_object._worker_processes, {})
+
+  def testScaleWorkerProcesses(self):
+    """Tests the _ScaleWorkerProcesses function."""
+    engine_object = self._CreateEngine()
+    # pylint: disable=protected-access
+    for _ in range(3):
+      engine_object._StartWorkerProcess()
+
+    # A worker process is added if the process queue is deep.
+    engine_object._collection_queue = TestQueue(100)
+    engine_object.storage_queue = TestQueue(0)
+    engine_object._ScaleWorkerProcesses()
+    self.assertEquals(len(engine_object._worker_processes), 4)
+
+    # No more than the maximum number of worker processes are added.
+    engine_object._ScaleWorkerProcesses()
+    self.assertEquals(len(engine_object._worker_processes), 4)
+
+    # A single worker process is retired while the storage queue is backed up
+    # until the retiring worker process has stopped.
+    engine_object.storage_queue = TestQueue(
+        engine_object._STORAGE_QUEUE_BACKLOG)
+    engine_object._ScaleWorkerProcesses()
+    engine_object._ScaleWorkerProcesses()
+
+    retiring_workers = [
+        worker_process.worker_number
+        for worker_process in engine_object._worker_processes.itervalues()
+        if worker_process.retire_signaled]
+    self.assertEquals(retiring_workers, [3])
+    self.assertEquals(engine_object._retiring_worker_names, set([u'Worker_3']))
+
+    engine_object._worker_processes[u'Worker_3'].exitcode = 0
+    engine_object._CheckWorkerProcesses()
+    self.assertEquals(engine_object._retiring_worker_names, set())
+
+    engine_object._ScaleWorkerProcesses()
+    self.assertEquals(engine_object._retiring_worker_names, set([u'Worker_2']))
+
+    engine_object._worker_processes[u'Worker_2'].exitcode = 0
+    engine_object._CheckWorkerProcesses()
+
+    # No less than the minimum number of worker processes are kept.
+    engine_object._ScaleWorkerProcesses()
+    self.assertEquals(
+        sorted(engine_object._worker_processes.keys()),
+        [u'Worker_0', u'Worker_1'])
+    self.assertEquals(engine_object._retiring_worker_names, set())
+
+  def testScaleWorkerProcessesHostOverloaded(self):
+    """Tests the _ScaleWorkerProcesses function with an overloaded host."""
+    engine_object = self._CreateEngine(
+        load_average=multiprocessing.cpu_count() * 2.0)
+    # pylint: disable=protected-access
+    for _ in range(3):
+      engine_object._StartWorkerProcess()
+
+    engine_object._collection_queue = TestQueue(100)
+    engine_object.storage_queue = TestQueue(0)
+    engine_object._ScaleWorkerProcesses()
+
+    self.assertEquals(len(engine_object._worker_processes), 3)
+    self.assertEquals(engine_object._retiring_worker_names, set([u'Worker_2']))
 
 if __name__ == '__main__':
   unittest.main()
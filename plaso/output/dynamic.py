@@ -22,7 +22,6 @@ import re
 
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.output import helper
 from plaso.output import interface
 
@@ -32,6 +31,8 @@ class Dynamic(interface.FileLogOutputFormatter):
 
   FORMAT_ATTRIBUTE_RE = re.compile('{([^}]+)}')
 
+  SUPPORTS_PARALLEL_FORMATTING = True
+
   # A dict containing mappings between "special" attributes and
   # how they should be calculated and presented.
   # They should be documented here:
@@ -105,8 +106,8 @@ class Dynamic(interface.FileLogOutputFormatter):
   def ParseDate(self, event_object):
     """Return a date string from a timestamp value."""
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event_object.timestamp, self.zone, raise_error=True)
+      return self._timestamp_formatter.CopyToDateString(
+          event_object.timestamp, raise_error=True)
     except OverflowError as exception:
       logging.error((
           u'Unable to copy {0:d} into a human readable timestamp with error: '
@@ -115,14 +116,12 @@ class Dynamic(interface.FileLogOutputFormatter):
               getattr(event_object, 'store_number', u''),
               getattr(event_object, 'store_index', u'')))
       return u'0000-00-00'
-    return u'{0:04d}-{1:02d}-{2:02d}'.format(
-        date_use.year, date_use.month, date_use.day)
 
   def ParseDateTime(self, event_object):
     """Return a datetime object from a timestamp, in an ISO format."""
     try:
-      return timelib.Timestamp.CopyToIsoFormat(
-          event_object.timestamp, timezone=self.zone, raise_error=True)
+      return self._timestamp_formatter.CopyToIsoFormat(
+          event_object.timestamp, raise_error=True)
 
     except OverflowError as exception:
       logging.error((
@@ -136,8 +135,8 @@ class Dynamic(interface.FileLogOutputFormatter):
   def ParseTime(self, event_object):
     """Return a timestamp string from an integer timestamp value."""
     try:
-      date_use = timelib.Timestamp.CopyToDatetime(
-          event_object.timestamp, self.zone, raise_error=True)
+      return self._timestamp_formatter.CopyToTimeString(
+          event_object.timestamp, raise_error=True)
     except OverflowError as exception:
       logging.error((
           u'Unable to copy {0:d} into a human readable timestamp with error: '
@@ -146,8 +145,6 @@ class Dynamic(interface.FileLogOutputFormatter):
               getattr(event_object, 'store_number', u''),
               getattr(event_object, 'store_index', u'')))
       return u'00:00:00'
-    return u'{0:02d}:{1:02d}:{2:02d}'.format(
-        date_use.hour, date_use.minute, date_use.second)
 
   def ParseHostname(self, event_object):
     """Return a hostname."""
@@ -124,9 +124,8 @@ class Elastic(interface.LogOutputFormatter):
     # Adding attributes in that are calculated/derived.
     # We want to remove millisecond precision (causes some issues in
     # conversion).
-    ret_dict['datetime'] = timelib.Timestamp.CopyToIsoFormat(
-        timelib.Timestamp.RoundToSeconds(event_object.timestamp),
-        timezone=self.zone)
+    ret_dict['datetime'] = self._timestamp_formatter.CopyToIsoFormat(
+        timelib.Timestamp.RoundToSeconds(event_object.timestamp))
     msg, _ = formatters_manager.FormattersManager.GetMessageStrings(
         event_object)
     ret_dict['message'] = msg
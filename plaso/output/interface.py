@@ -29,11 +29,18 @@ a human readable format for easy human consumption/analysis.
 """
 
 import abc
+import collections
+import cPickle
 import logging
+import multiprocessing
+import os
+import signal
+import sqlite3
 import sys
 
 from plaso.lib import errors
 from plaso.lib import registry
+from plaso.lib import timelib
 from plaso.lib import utils
 
 import pytz
@@ -63,6 +70,10 @@ class LogOutputFormatter(object):
   # into the argparse parser.
   ARGUMENTS = []
 
+  # Value to indicate the output module can format event objects in another
+  # process, see FormatEvent and WriteFormattedEvent.
+  SUPPORTS_PARALLEL_FORMATTING = False
+
   # TODO: Add a NAME attribute to get rid of using class names.
 
   def __init__(self, store, filehandle=sys.stdout, config=None,
@@ -83,6 +94,10 @@ class LogOutputFormatter(object):
           zone))
       self.zone = pytz.utc
 
+    # The timestamp formatter caches the date and time strings, which is
+    # faster than converting every timestamp into a datetime object.
+    self._timestamp_formatter = timelib.TimestampFormatter(self.zone)
+
     self.filehandle = filehandle
     self.store = store
     self._filter = filter_use
@@ -126,6 +141,34 @@ class LogOutputFormatter(object):
     self.EventBody(evt)
     self.EndEvent()
 
+  def FormatEvent(self, event_object):
+    """Formats an event object without writing it.
+
+    This method is called in a formatting process, see ParallelEventFormatter.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+
+    Returns:
+      The formatted event, which must be picklable, or None if the event
+      object should not be written.
+
+    Raises:
+      NotImplementedError: when not implemented.
+    """
+    raise NotImplementedError
+
+  def WriteFormattedEvent(self, formatted_event):
+    """Writes an event that was formatted by FormatEvent.
+
+    Args:
+      formatted_event: the formatted event.
+
+    Raises:
+      NotImplementedError: when not implemented.
+    """
+    raise NotImplementedError
+
   @abc.abstractmethod
   def EventBody(self, evt):
     """Writes the main body of an event to the output filehandle.
@@ -203,13 +246,237 @@ class FileLogOutputFormatter(LogOutputFormatter):
     super(FileLogOutputFormatter, self).End()
     self.filehandle.Close()
 
+  def FormatEvent(self, event_object):
+    """Formats an event object without writing it.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+
+    Returns:
+      A list of the lines WriteEvent would have written.
+    """
+    filehandle = self.filehandle
+    self.filehandle = _LineBuffer()
+    try:
+      self.WriteEvent(event_object)
+      lines = self.filehandle.lines
+    finally:
+      self.filehandle = filehandle
+    return lines
+
+  def WriteFormattedEvent(self, formatted_event):
+    """Writes an event that was formatted by FormatEvent.
+
+    Args:
+      formatted_event: a list of the lines to write.
+    """
+    for line in formatted_event:
+      self.filehandle.WriteLine(line)
+
+
+class _LineBuffer(object):
+  """Class that stands in for an output filehandle and keeps the lines."""
+
+  def __init__(self):
+    """Initializes the line buffer."""
+    super(_LineBuffer, self).__init__()
+    self.lines = []
+
+  def WriteLine(self, line):
+    """Keeps a single line."""
+    self.lines.append(line)
+
+
+# The output module used by the formatting processes, which is set before
+# the processes are forked so that they inherit it.
+_formatting_output_module = None
+
+
+def _InitializeFormattingProcess():
+  """Initializes a formatting process.
+
+     The parent process handles the keyboard interrupt and terminates
+     the formatting processes.
+  """
+  signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def _FormatSerializedEventObjects(serialized_event_objects):
+  """Formats a batch of event objects in a formatting process.
+
+  Args:
+    serialized_event_objects: a list of pickled event objects.
+
+  Returns:
+    A list of the formatted events, where an event that could not be
+    formatted is None.
+  """
+  formatted_events = []
+  for serialized_event_object in serialized_event_objects:
+    event_object = cPickle.loads(serialized_event_object)
+    try:
+      formatted_event = _formatting_output_module.FormatEvent(event_object)
+    except errors.WrongFormatter as exception:
+      logging.error(u'Unable to write event: {:s}'.format(exception))
+      formatted_event = None
+    formatted_events.append(formatted_event)
+
+  return formatted_events
+
+
+class ParallelEventFormatter(object):
+  """Class that formats event objects in a pool of processes.
+
+  The event objects are sent to the pool in batches and the formatted
+  batches are written by the output module in the order the event objects
+  were passed to WriteEvent, hence the output is the same as when the output
+  module formats the event objects itself. The event objects are pickled when
+  passed to WriteEvent, since the caller can change them afterwards.
+
+  The object can be used in place of the output module by the EventBuffer.
+  """
+
+  # The default number of event objects in a batch.
+  DEFAULT_BATCH_SIZE = 1000
+
+  # The maximum number of batches per process that are being formatted
+  # or waiting to be written.
+  _MAXIMUM_NUMBER_OF_PENDING_BATCHES_PER_PROCESS = 2
+
+  def __init__(self, output_module, number_of_processes, batch_size=None):
+    """Initializes the parallel event formatter.
+
+    Args:
+      output_module: the output module (instance of LogOutputFormatter)
+                     that supports parallel formatting.
+      number_of_processes: the number of formatting processes.
+      batch_size: optional number of event objects in a batch. The default
+                  is None, which represents DEFAULT_BATCH_SIZE.
+
+    Raises:
+      ValueError: if the output module does not support parallel formatting
+                  or the number of processes is less than 1.
+    """
+    if not output_module.SUPPORTS_PARALLEL_FORMATTING:
+      raise ValueError(u'Output module does not support parallel formatting.')
+
+    if number_of_processes < 1:
+      raise ValueError(u'Invalid number of processes: {0:d}.'.format(
+          number_of_processes))
+
+    super(ParallelEventFormatter, self).__init__()
+    self._batch = []
+    self._batch_size = batch_size or self.DEFAULT_BATCH_SIZE
+    self._maximum_number_of_pending_batches = (
+        number_of_processes *
+        self._MAXIMUM_NUMBER_OF_PENDING_BATCHES_PER_PROCESS)
+    self._number_of_processes = number_of_processes
+    self._output_module = output_module
+    self._pending_batches = collections.deque()
+    self._pool = None
+
+  def _SubmitBatch(self):
+    """Submits the current batch to the pool and writes the finished ones."""
+    if not self._batch:
+      return
+
+    self._pending_batches.append(self._pool.apply_async(
+        _FormatSerializedEventObjects, (self._batch, )))
+    self._batch = []
+
+    while self._pending_batches and (
+        len(self._pending_batches) > self._maximum_number_of_pending_batches or
+        self._pending_batches[0].ready()):
+      self._WriteBatch(self._pending_batches.popleft())
+
+  def _WriteBatch(self, async_result):
+    """Waits for a batch to be formatted and writes it.
+
+    Args:
+      async_result: the result of the formatting of the batch (instance of
+                    multiprocessing.pool.AsyncResult).
+    """
+    for formatted_event in async_result.get():
+      if formatted_event is not None:
+        self._output_module.WriteFormattedEvent(formatted_event)
+
+  def Start(self):
+    """Starts the output module and the formatting processes."""
+    global _formatting_output_module  # pylint: disable=global-statement
+
+    self._output_module.Start()
+
+    _formatting_output_module = self._output_module
+    self._pool = multiprocessing.Pool(
+        processes=self._number_of_processes,
+        initializer=_InitializeFormattingProcess)
+
+  def WriteEvent(self, event_object):
+    """Adds an event object to the current batch.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+    """
+    self._batch.append(
+        cPickle.dumps(event_object, cPickle.HIGHEST_PROTOCOL))
+    if len(self._batch) >= self._batch_size:
+      self._SubmitBatch()
+
+  def End(self):
+    """Writes the remaining batches and ends the output module."""
+    global _formatting_output_module  # pylint: disable=global-statement
+
+    try:
+      self._SubmitBatch()
+      while self._pending_batches:
+        self._WriteBatch(self._pending_batches.popleft())
+
+      self._pool.close()
+
+    except:
+      self._pool.terminate()
+      raise
+
+    finally:
+      self._pool.join()
+      self._pool = None
+      _formatting_output_module = None
+
+    self._output_module.End()
+
+
+def SupportsParallelFormatting(output_module):
+  """Determines if an output module can be used with ParallelEventFormatter.
+
+  Args:
+    output_module: the output module (instance of LogOutputFormatter).
+
+  Returns:
+    A boolean value indicating the output module supports parallel formatting
+    and the platform can fork the formatting processes.
+  """
+  return bool(
+      output_module.SUPPORTS_PARALLEL_FORMATTING and hasattr(os, 'fork'))
+
 
 class EventBuffer(object):
-  """Buffer class for EventObject output processing."""
+  """Buffer class for EventObject output processing.
+
+  Duplicate event objects are identified by their equality digest, which
+  is only calculated when more than one event object has the same timestamp.
+  If the number of event objects with the same timestamp exceeds the maximum
+  number of buffered event objects, the event objects are stored in
+  a temporary database instead of in memory.
+  """
 
   MERGE_ATTRIBUTES = ['inode', 'filename', 'display_name']
 
-  def __init__(self, formatter, check_dedups=True):
+  # The default maximum number of event objects with the same timestamp
+  # that are kept in memory.
+  DEFAULT_MAXIMUM_NUMBER_OF_BUFFERED_EVENTS = 100000
+
+  def __init__(
+      self, formatter, check_dedups=True, maximum_number_of_buffered_events=None):
     """Initialize the EventBuffer.
 
     This class is used for buffering up events for duplicate removals
@@ -220,15 +487,110 @@ class EventBuffer(object):
       formatter: An OutputFormatter object.
       check_dedups: Boolean value indicating whether or not the buffer should
       check and merge duplicate entries or not.
+      maximum_number_of_buffered_events: optional maximum number of event
+                                         objects with the same timestamp that
+                                         are kept in memory. The default is
+                                         None, which represents
+                                         DEFAULT_MAXIMUM_NUMBER_OF_BUFFERED_EVENTS.
     """
-    self._buffer_dict = {}
+    # The buffer contains the event objects with the current timestamp in
+    # the order they were appended, the equality digest is used as the key.
+    # A single event object is stored with None as key.
+    self._buffer_dict = collections.OrderedDict()
     self._current_timestamp = 0
+    self._maximum_number_of_buffered_events = (
+        maximum_number_of_buffered_events or
+        self.DEFAULT_MAXIMUM_NUMBER_OF_BUFFERED_EVENTS)
+    self._spill_connection = None
+    self._spill_cursor = None
+    # The last appended event object is written to the temporary database
+    # when the next event object is appended, since the caller can change
+    # the event object after it was appended.
+    self._unspilled_event = None
     self.duplicate_counter = 0
+    # Counter containing the number of duplicate removals per parser.
+    self.duplicate_counters = collections.Counter()
     self.check_dedups = check_dedups
 
     self.formatter = formatter
     self.formatter.Start()
 
+  def _AppendSpilledEvent(self, event_object):
+    """Appends an event object to the temporary database.
+
+    Args:
+      event_object: The EventObject that is being added.
+    """
+    self._WriteUnspilledEvent()
+
+    key = event_object.EqualityDigest()
+    self._spill_cursor.execute(
+        u'SELECT event_object FROM event_objects WHERE digest = ?',
+        (sqlite3.Binary(key), ))
+    row = self._spill_cursor.fetchone()
+    if row:
+      self.JoinEvents(event_object, cPickle.loads(str(row[0])))
+      self._spill_cursor.execute(
+          u'DELETE FROM event_objects WHERE digest = ?',
+          (sqlite3.Binary(key), ))
+
+    self._unspilled_event = (key, event_object)
+
+  def _FlushSpilledEvents(self):
+    """Writes the event objects in the temporary database and closes it."""
+    self._WriteUnspilledEvent()
+
+    cursor = self._spill_connection.cursor()
+    for serialized_event_object, in cursor.execute(
+        u'SELECT event_object FROM event_objects ORDER BY rowid'):
+      self._WriteEvent(cPickle.loads(str(serialized_event_object)))
+
+    self._spill_connection.close()
+    self._spill_connection = None
+    self._spill_cursor = None
+
+  def _SpillEvents(self):
+    """Moves the buffered event objects into a temporary database."""
+    # An empty path creates a temporary database file that is removed
+    # when the connection is closed.
+    self._spill_connection = sqlite3.connect(u'')
+    self._spill_cursor = self._spill_connection.cursor()
+    self._spill_cursor.execute(
+        u'CREATE TABLE event_objects (digest BLOB PRIMARY KEY, '
+        u'event_object BLOB)')
+
+    self._unspilled_event = self._buffer_dict.popitem(last=True)
+    for key, event_object in self._buffer_dict.iteritems():
+      self._spill_cursor.execute(
+          u'INSERT INTO event_objects VALUES (?, ?)', (
+              sqlite3.Binary(key), sqlite3.Binary(
+                  cPickle.dumps(event_object, cPickle.HIGHEST_PROTOCOL))))
+
+    self._buffer_dict = collections.OrderedDict()
+
+  def _WriteEvent(self, event_object):
+    """Writes an event object with the formatter.
+
+    Args:
+      event_object: The EventObject that is written.
+    """
+    try:
+      self.formatter.WriteEvent(event_object)
+    except errors.WrongFormatter as exception:
+      logging.error(u'Unable to write event: {:s}'.format(exception))
+
+  def _WriteUnspilledEvent(self):
+    """Writes the last appended event object to the temporary database."""
+    if not self._unspilled_event:
+      return
+
+    key, event_object = self._unspilled_event
+    self._spill_cursor.execute(
+        u'INSERT INTO event_objects VALUES (?, ?)', (
+            sqlite3.Binary(key), sqlite3.Binary(
+                cPickle.dumps(event_object, cPickle.HIGHEST_PROTOCOL))))
+    self._unspilled_event = None
+
   def Append(self, event_object):
     """Append an EventObject into the processing pipeline.
 
@@ -243,27 +605,46 @@ class EventBuffer(object):
       self._current_timestamp = event_object.timestamp
       self.Flush()
 
-    key = event_object.EqualityString()
+    if self._spill_connection:
+      self._AppendSpilledEvent(event_object)
+      return
+
+    # The equality digest is only needed if there are multiple event objects
+    # with the same timestamp.
+    if not self._buffer_dict:
+      self._buffer_dict[None] = event_object
+      return
+
+    if None in self._buffer_dict:
+      first_event_object = self._buffer_dict.pop(None)
+      self._buffer_dict[first_event_object.EqualityDigest()] = (
+          first_event_object)
+
+    key = event_object.EqualityDigest()
     if key in self._buffer_dict:
       self.JoinEvents(event_object, self._buffer_dict.pop(key))
     self._buffer_dict[key] = event_object
 
+    if len(self._buffer_dict) > self._maximum_number_of_buffered_events:
+      self._SpillEvents()
+
   def Flush(self):
     """Flushes the buffer by sending records to a formatter and prints."""
+    if self._spill_connection:
+      self._FlushSpilledEvents()
+
     if not self._buffer_dict:
       return
 
-    for event_object in self._buffer_dict.values():
-      try:
-        self.formatter.WriteEvent(event_object)
-      except errors.WrongFormatter as exception:
-        logging.error(u'Unable to write event: {:s}'.format(exception))
+    for event_object in self._buffer_dict.itervalues():
+      self._WriteEvent(event_object)
 
-    self._buffer_dict = {}
+    self._buffer_dict = collections.OrderedDict()
 
   def JoinEvents(self, event_a, event_b):
     """Join this EventObject with another one."""
     self.duplicate_counter += 1
+    self.duplicate_counters[getattr(event_a, 'parser', u'N/A')] += 1
     # TODO: Currently we are using the first event pathspec, perhaps that
     # is not the best approach. There is no need to have all the pathspecs
     # inside the combined event, however which one should be chosen is
@@ -15,8 +15,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 """This file contains tests for the output formatter."""
+import hashlib
 import os
 import locale
+import StringIO
 import sys
 import tempfile
 import unittest
@@ -34,6 +36,9 @@ class DummyEvent(object):
     except ValueError:
       self.timestamp = 0
     self.entry = entry
+  def EqualityDigest(self):
+    return hashlib.md5(self.EqualityString().encode('utf-8')).digest()
+
   def EqualityString(self):
     return u';'.join(map(str, [self.timestamp, self.entry]))
 
@@ -67,6 +72,19 @@ class TestOutput(interface.LogOutputFormatter):
     self.filehandle.write(u'</EventFile>\n')
 
 
+class TestLineOutput(interface.FileLogOutputFormatter):
+  """This is a test output module that provides a simple line format."""
+
+  SUPPORTS_PARALLEL_FORMATTING = True
+
+  def EventBody(self, event_object):
+    self.filehandle.WriteLine(u'{0:d},{1:s}\n'.format(
+        event_object.timestamp, event_object.entry))
+
+  def Start(self):
+    self.filehandle.WriteLine(u'timestamp,entry\n')
+
+
 class PlasoOutputUnitTest(unittest.TestCase):
   """The unit test for plaso output formatting."""
 
@@ -151,6 +169,86 @@ class EventBufferTest(unittest.TestCase):
       event_buffer.Append(DummyEvent(123457, u'Now is different'))
       CheckBufferLength(event_buffer, 1)
 
+  def _GetEntries(self, maximum_number_of_buffered_events):
+    """Writes events through an event buffer that removes duplicates.
+
+    Args:
+      maximum_number_of_buffered_events: the maximum number of events with
+                                         the same timestamp that are kept
+                                         in memory.
+
+    Returns:
+      A tuple containing a list of the entries that were written and the
+      event buffer.
+    """
+    output = StringIO.StringIO()
+    event_buffer = interface.EventBuffer(
+        TestLineOutput(None, output), True,
+        maximum_number_of_buffered_events=maximum_number_of_buffered_events)
+
+    for entry in [u'a', u'b', u'c', u'a', u'd', u'b', u'e', u'a']:
+      event_object = DummyEvent(123456, entry)
+      event_object.parser = u'test'
+      event_buffer.Append(event_object)
+
+    event_buffer.Append(DummyEvent(123457, u'f'))
+    event_buffer.End()
+
+    entries = [
+        line.split(',')[1] for line in output.getvalue().split('\n')[1:-1]]
+    return entries, event_buffer
+
+  def testDuplicates(self):
+    """Test that duplicates are merged in memory and in the database."""
+    entries, event_buffer = self._GetEntries(100)
+    self.assertEquals(entries, [u'c', u'd', u'b', u'e', u'a', u'f'])
+    self.assertEquals(event_buffer.duplicate_counter, 3)
+    self.assertEquals(event_buffer.duplicate_counters[u'test'], 3)
+
+    spilled_entries, event_buffer = self._GetEntries(2)
+    self.assertEquals(spilled_entries, entries)
+    self.assertEquals(event_buffer.duplicate_counter, 3)
+    self.assertEquals(event_buffer.duplicate_counters[u'test'], 3)
+
+
+class ParallelEventFormatterTest(unittest.TestCase):
+  """Few unit tests for the ParallelEventFormatter."""
+
+  def _WriteEvents(self, event_formatter, events):
+    """Writes events with an event formatter.
+
+    Args:
+      event_formatter: the event formatter (instance of LogOutputFormatter
+                       or ParallelEventFormatter).
+      events: a list of the events.
+    """
+    event_formatter.Start()
+    for event_object in events:
+      event_formatter.WriteEvent(event_object)
+    event_formatter.End()
+
+  def testWriteEvent(self):
+    """Test that the output is the same as when formatting serially."""
+    events = [
+        DummyEvent(123456 + index, u'Event number {0:d}'.format(index))
+        for index in range(50)]
+
+    serial_output = StringIO.StringIO()
+    self._WriteEvents(TestLineOutput(None, serial_output), events)
+
+    parallel_output = StringIO.StringIO()
+    event_formatter = interface.ParallelEventFormatter(
+        TestLineOutput(None, parallel_output), 3, batch_size=4)
+    self._WriteEvents(event_formatter, events)
+
+    self.assertEquals(len(serial_output.getvalue().split('\n')), 52)
+    self.assertEquals(parallel_output.getvalue(), serial_output.getvalue())
+
+  def testUnsupportedOutputModule(self):
+    """Test that an output module must support parallel formatting."""
+    with self.assertRaises(ValueError):
+      interface.ParallelEventFormatter(TestOutput(StringIO.StringIO()), 2)
+
 
 class OutputFilehandleTest(unittest.TestCase):
   """Few unit tests for the OutputFilehandle."""
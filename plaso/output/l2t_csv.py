@@ -25,7 +25,6 @@ import re
 
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.lib import utils
 from plaso.output import helper
 from plaso.output import interface
@@ -36,6 +35,8 @@ class L2tcsv(interface.FileLogOutputFormatter):
 
   FORMAT_ATTRIBUTE_RE = re.compile('{([^}]+)}')
 
+  SUPPORTS_PARALLEL_FORMATTING = True
+
   def Start(self):
     """Returns a header for the output."""
     # Build a hostname and username dict objects.
@@ -84,8 +85,8 @@ class L2tcsv(interface.FileLogOutputFormatter):
     msg, msg_short = event_formatter.GetMessages(event_object)
     source_short, source_long = event_formatter.GetSources(event_object)
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event_object.timestamp, self.zone)
+    year, month, day_of_month, _, _, _ = (
+        self._timestamp_formatter.CopyToDateTimeValues(event_object.timestamp))
     extras = []
     format_variables = self.FORMAT_ATTRIBUTE_RE.findall(
         event_formatter.format_string)
@@ -119,10 +120,8 @@ class L2tcsv(interface.FileLogOutputFormatter):
           username = check_user
 
     row = (
-        '{0:02d}/{1:02d}/{2:04d}'.format(
-            date_use.month, date_use.day, date_use.year),
-        '{0:02d}:{1:02d}:{2:02d}'.format(
-            date_use.hour, date_use.minute, date_use.second),
+        '{0:02d}/{1:02d}/{2:04d}'.format(month, day_of_month, year),
+        self._timestamp_formatter.CopyToTimeString(event_object.timestamp),
         self.zone,
         helper.GetLegacy(event_object),
         source_short,
@@ -26,7 +26,6 @@ from plaso import formatters
 from plaso.formatters import interface as formatters_interface
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.lib import utils
 from plaso.output import helper
 from plaso.output import interface
@@ -302,11 +301,6 @@ class Mysql4n6(interface.LogOutputFormatter):
     msg, _ = event_formatter.GetMessages(event_object)
     source_short, source_long = event_formatter.GetSources(event_object)
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event_object.timestamp, self.zone)
-    if not date_use:
-      logging.error(u'Unable to process date for entry: {0:s}'.format(msg))
-      return
     extra = []
     format_variables = self.FORMAT_ATTRIBUTE_RE.findall(
         event_formatter.format_string)
@@ -325,8 +319,7 @@ class Mysql4n6(interface.LogOutputFormatter):
         inode = event_object.pathspec.image_inode
 
     date_use_string = u'{0:d}-{1:d}-{2:d} {3:d}:{4:d}:{5:d}'.format(
-        date_use.year, date_use.month, date_use.day, date_use.hour,
-        date_use.minute, date_use.second)
+        *self._timestamp_formatter.CopyToDateTimeValues(event_object.timestamp))
 
     tags = []
     if hasattr(event_object, 'tag') and hasattr(event_object.tag, 'tags'):
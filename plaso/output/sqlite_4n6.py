@@ -16,7 +16,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
-import logging
+import collections
 import os
 import re
 import sys
@@ -27,7 +27,6 @@ from plaso import formatters
 from plaso.formatters import interface as formatters_interface
 from plaso.formatters import manager as formatters_manager
 from plaso.lib import errors
-from plaso.lib import timelib
 from plaso.lib import utils
 from plaso.output import helper
 from plaso.output import interface
@@ -41,10 +40,36 @@ class Sql4n6(interface.LogOutputFormatter):
 
   FORMAT_ATTRIBUTE_RE = re.compile('{([^}]+)}')
 
+  SUPPORTS_PARALLEL_FORMATTING = True
+
   META_FIELDS = [
       'sourcetype', 'source', 'user', 'host', 'MACB', 'color', 'type',
       'record_number']
 
+  # The columns of the log2timeline table in the order of the values
+  # of a row.
+  _COLUMN_NAMES = [
+      'timezone', 'MACB', 'source', 'sourcetype', 'type', 'user', 'host',
+      'description', 'filename', 'inode', 'notes', 'format', 'extra',
+      'datetime', 'reportnotes', 'inreport', 'tag', 'color', 'offset',
+      'store_number', 'store_index', 'vss_store_number', 'URL',
+      'record_number', 'event_identifier', 'event_type', 'source_name',
+      'user_sid', 'computer_name', 'evidence']
+
+  _META_FIELD_COLUMN_INDEXES = [
+      (field, _COLUMN_NAMES.index(field)) for field in META_FIELDS]
+
+  _TAG_COLUMN_INDEX = _COLUMN_NAMES.index('tag')
+
+  _INSERT_QUERY = 'INSERT INTO log2timeline({0:s}) VALUES ({1:s})'.format(
+      ', '.join(_COLUMN_NAMES), ', '.join(['?'] * len(_COLUMN_NAMES)))
+
+  # The number of rows that are inserted with a single executemany.
+  _INSERT_BATCH_SIZE = 10000
+
+  # The number of rows that are inserted in a single transaction.
+  _TRANSACTION_SIZE = 100000
+
   def __init__(self, store, filehandle=sys.stdout, config=None,
                filter_use=None):
     """Constructor for the output module.
@@ -55,7 +80,6 @@ class Sql4n6(interface.LogOutputFormatter):
       config: The configuration object for the module.
       filter_use: The filter object used.
     """
-    # TODO: Add a unit test for this output module.
     super(Sql4n6, self).__init__(store, filehandle, config, filter_use)
     # TODO: move this to an output module interface.
     self.set_status = getattr(config, 'set_status', None)
@@ -84,8 +108,15 @@ class Sql4n6(interface.LogOutputFormatter):
     self.conn.text_factory = str
     self.curs = self.conn.cursor()
 
+    # The database is only consistent after End, hence there is no need
+    # for a rollback journal or to wait for the data to be written to disk.
+    self.curs.execute('PRAGMA journal_mode = MEMORY')
+    self.curs.execute('PRAGMA synchronous = OFF')
+
     # Create table in database.
     if not self.append:
+      # The page size can only be changed before the tables are created.
+      self.curs.execute('PRAGMA page_size = 4096')
       self.curs.execute(
           ('CREATE TABLE log2timeline (timezone TEXT, '
            'MACB TEXT, source TEXT, sourcetype TEXT, type TEXT, '
@@ -124,9 +155,33 @@ class Sql4n6(interface.LogOutputFormatter):
         self.set_status('Created table: l2t_disk')
 
     self.count = 0
+    self._number_of_uncommitted_rows = 0
+    self._rows = []
+
+    # The frequencies of the values of the meta fields and the tags are
+    # maintained while inserting the rows, which is considerably faster
+    # than querying them afterwards.
+    self._frequencies = {}
+    for field in self.META_FIELDS:
+      self._frequencies[field] = collections.Counter()
+    self._tags = []
+
+    if self.append:
+      for field in self.META_FIELDS:
+        self.curs.execute(
+            'SELECT {0:s}s, frequency FROM l2t_{0:s}s'.format(field))
+        for value, frequency in self.curs.fetchall():
+          self._frequencies[field][self._GetFrequencyKey(value)] += frequency
+
+      self.curs.execute('SELECT tag FROM l2t_tags')
+      for tag, in self.curs.fetchall():
+        if tag not in self._tags:
+          self._tags.append(tag)
 
   def End(self):
     """Create indices and commit the transaction."""
+    self._InsertRows()
+
     # Build up indices for the fields specified in the args.
     # It will commit the inserts automatically before creating index.
     if not self.append:
@@ -141,15 +196,18 @@ class Sql4n6(interface.LogOutputFormatter):
       self.set_status('Creating metadata...')
 
     for field in self.META_FIELDS:
-      vals = self._GetDistinctValues(field)
       self.curs.execute('DELETE FROM l2t_{0:s}s'.format(field))
-      for name, freq in vals.items():
-        self.curs.execute((
-            'INSERT INTO l2t_{0:s}s ({1:s}s, frequency) '
-            'VALUES("{2:s}", {3:d}) ').format(field, field, name, freq))
+      self.curs.executemany(
+          'INSERT INTO l2t_{0:s}s ({0:s}s, frequency) VALUES (?, ?)'.format(
+              field), [
+                  (value, frequency)
+                  for value, frequency in self._frequencies[field].iteritems()
+                  if value != ''])
+
     self.curs.execute('DELETE FROM l2t_tags')
-    for tag in self._ListTags():
-      self.curs.execute('INSERT INTO l2t_tags (tag) VALUES (?)', [tag])
+    self.curs.executemany(
+        'INSERT INTO l2t_tags (tag) VALUES (?)', [
+            (tag, ) for tag in self._tags])
 
     if self.set_status:
       self.set_status('Database created.')
@@ -158,32 +216,49 @@ class Sql4n6(interface.LogOutputFormatter):
     self.curs.close()
     self.conn.close()
 
-  def _GetDistinctValues(self, field_name):
-    """Query database for unique field types."""
-    self.curs.execute(
-        u'SELECT {0}, COUNT({0}) FROM log2timeline GROUP BY {0}'.format(
-            field_name))
-    res = {}
-    for row in self.curs.fetchall():
-      if row[0] != '':
-        res[row[0]] = int(row[1])
-    return res
-
-  def _ListTags(self):
-    """Query database for unique tag types."""
-    all_tags = []
-    self.curs.execute(
-        'SELECT DISTINCT tag FROM log2timeline')
-
-    # This cleans up the messy SQL return.
-    for tag_row in self.curs.fetchall():
-      tag_string = tag_row[0]
-      if tag_string:
-        tags = tag_string.split(',')
-        for tag in tags:
-          if tag not in all_tags:
-            all_tags.append(tag)
-    return all_tags
+  def _GetFrequencyKey(self, value):
+    """Retrieves the key of a value in the frequency counters.
+
+       The values are stored in TEXT columns, hence SQLite stores numbers
+       as text and the frequencies of a number and its text are combined.
+
+    Args:
+      value: the value of a meta field.
+
+    Returns:
+      The key of the value.
+    """
+    if isinstance(value, bool):
+      value = int(value)
+
+    if isinstance(value, (int, long)):
+      return u'{0:d}'.format(value)
+
+    if isinstance(value, str):
+      try:
+        return value.decode('utf-8')
+      except UnicodeDecodeError:
+        pass
+
+    return value
+
+  def _InsertRows(self):
+    """Inserts the pending rows into the database."""
+    if not self._rows:
+      return
+
+    self.curs.executemany(self._INSERT_QUERY, self._rows)
+
+    self.count += len(self._rows)
+    self._number_of_uncommitted_rows += len(self._rows)
+    self._rows = []
+
+    if self._number_of_uncommitted_rows >= self._TRANSACTION_SIZE:
+      self.conn.commit()
+      self._number_of_uncommitted_rows = 0
+
+    if self.set_status:
+      self.set_status('Inserting event: {0:d}'.format(self.count))
 
   def StartEvent(self):
     """Do nothing, just override the parent's StartEvent method."""
@@ -199,6 +274,23 @@ class Sql4n6(interface.LogOutputFormatter):
     Args:
       event_object: The event object (EventObject).
 
+    Raises:
+      raise errors.NoFormatterFound: If no event formatter was found.
+    """
+    row = self.FormatEvent(event_object)
+    if row:
+      self.WriteFormattedEvent(row)
+
+  def FormatEvent(self, event_object):
+    """Formats an event object as a row of the 4n6time table.
+
+    Args:
+      event_object: The event object (EventObject).
+
+    Returns:
+      A tuple containing the values of the row or None if the event object
+      cannot be written.
+
     Raises:
       raise errors.NoFormatterFound: If no event formatter was found.
     """
@@ -227,11 +319,6 @@ class Sql4n6(interface.LogOutputFormatter):
     msg, _ = event_formatter.GetMessages(event_object)
     source_short, source_long = event_formatter.GetSources(event_object)
 
-    date_use = timelib.Timestamp.CopyToDatetime(
-        event_object.timestamp, self.zone)
-    if not date_use:
-      logging.error(u'Unable to process date for entry: {0:s}'.format(msg))
-      return
     extra = []
     format_variables = self.FORMAT_ATTRIBUTE_RE.findall(
         event_formatter.format_string)
@@ -248,9 +335,9 @@ class Sql4n6(interface.LogOutputFormatter):
           hasattr(event_object.pathspec, 'image_inode')):
         inode = event_object.pathspec.image_inode
 
-    date_use_string = u'{0:04d}-{1:02d}-{2:02d} {3:02d}:{4:02d}:{5:02d}'.format(
-        date_use.year, date_use.month, date_use.day, date_use.hour,
-        date_use.minute, date_use.second)
+    date_use_string = u'{0:s} {1:s}'.format(
+        self._timestamp_formatter.CopyToDateString(event_object.timestamp),
+        self._timestamp_formatter.CopyToTimeString(event_object.timestamp))
 
     tags = []
     if hasattr(event_object, 'tag'):
@@ -288,24 +375,30 @@ class Sql4n6(interface.LogOutputFormatter):
            getattr(event_object, 'computer_name', '-'),
            self.evidence
           )
+    return row
 
-    self.curs.execute(
-        ('INSERT INTO log2timeline(timezone, MACB, source, '
-         'sourcetype, type, user, host, description, filename, '
-         'inode, notes, format, extra, datetime, reportnotes, inreport,'
-         'tag, color, offset, store_number, store_index, vss_store_number,'
-         'URL, record_number, event_identifier, event_type,'
-         'source_name, user_sid, computer_name, evidence)'
-         ' VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?,'
-         '?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)'), row)
+  def WriteFormattedEvent(self, formatted_event):
+    """Inserts a row that was formatted by FormatEvent into the database.
 
-    self.count += 1
+       The rows are inserted in batches, see _InsertRows.
 
-    # Commit the current transaction every 10000 inserts.
-    if self.count % 10000 == 0:
-      self.conn.commit()
-      if self.set_status:
-        self.set_status('Inserting event: {0:d}'.format(self.count))
+    Args:
+      formatted_event: a tuple containing the values of the row.
+    """
+    self._rows.append(formatted_event)
+
+    for field, column_index in self._META_FIELD_COLUMN_INDEXES:
+      value = formatted_event[column_index]
+      self._frequencies[field][self._GetFrequencyKey(value)] += 1
+
+    taglist = formatted_event[self._TAG_COLUMN_INDEX]
+    if taglist:
+      for tag in taglist.split(','):
+        if tag not in self._tags:
+          self._tags.append(tag)
+
+    if len(self._rows) >= self._INSERT_BATCH_SIZE:
+      self._InsertRows()
 
 
 def GetVSSNumber(event_object):
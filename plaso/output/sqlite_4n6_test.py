@@ -0,0 +1,137 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2012 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Tests for the 4n6time SQLite output class."""
+
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+
+from plaso.formatters import interface as formatters_interface
+from plaso.formatters import manager as formatters_manager
+from plaso.lib import event
+from plaso.lib import eventdata
+from plaso.output import sqlite_4n6
+
+
+class Sql4n6TestEvent(event.EventObject):
+  """Simplified EventObject for testing."""
+  DATA_TYPE = 'test:sqlite_4n6'
+
+  def __init__(self, timestamp, text, tag=None):
+    """Initialize event with data."""
+    super(Sql4n6TestEvent, self).__init__()
+    self.timestamp = timestamp
+    self.timestamp_desc = eventdata.EventTimestamp.WRITTEN_TIME
+    self.hostname = u'ubuntu'
+    self.filename = u'log/syslog.1'
+    self.store_number = 1
+    self.store_index = 1
+    self.text = text
+    if tag:
+      self.tag = event.EventTag()
+      self.tag.tags = [tag]
+
+
+class Sql4n6TestEventFormatter(formatters_interface.ConditionalEventFormatter):
+  """Formatter for the test event."""
+  DATA_TYPE = 'test:sqlite_4n6'
+  FORMAT_STRING_PIECES = [u'{text}']
+
+  SOURCE_SHORT = 'LOG'
+  SOURCE_LONG = 'Syslog'
+
+
+formatters_manager.FormattersManager.RegisterFormatter(Sql4n6TestEventFormatter)
+
+
+class Sql4n6Test(unittest.TestCase):
+  """Contains tests to validate the 4n6time SQLite output module."""
+
+  def setUp(self):
+    """Sets up the needed objects used throughout the test."""
+    self._temporary_directory = tempfile.mkdtemp()
+    self._path = os.path.join(self._temporary_directory, u'4n6time.db')
+
+  def tearDown(self):
+    """Cleans up the needed objects used throughout the test."""
+    shutil.rmtree(self._temporary_directory, True)
+
+  def _WriteEvents(self, event_objects, append=False):
+    """Writes event objects to the database.
+
+    Args:
+      event_objects: a list of the event objects.
+      append: optional boolean value to indicate to append to an existing
+              database.
+    """
+    config = type('Config', (object, ), {'append': append})()
+    output_module = sqlite_4n6.Sql4n6(None, self._path, config)
+    output_module.Start()
+    for event_object in event_objects:
+      output_module.WriteEvent(event_object)
+    output_module.End()
+
+  def _Query(self, query):
+    """Runs a query on the database and returns the rows."""
+    connection = sqlite3.connect(self._path)
+    try:
+      return connection.execute(query).fetchall()
+    finally:
+      connection.close()
+
+  def testWriteEvent(self):
+    """Tests that the rows and the meta data are written."""
+    self._WriteEvents([
+        Sql4n6TestEvent(1340821021000000, u'First line', tag=u'Malware'),
+        Sql4n6TestEvent(1340821022000000, u'Second line'),
+        Sql4n6TestEvent(1340821023000000, u'Third line', tag=u'Malware')])
+
+    rows = self._Query(
+        u'SELECT datetime, description, host, tag FROM log2timeline')
+    self.assertEquals(rows, [
+        (u'2012-06-27 18:17:01', u'First line', u'ubuntu', u'Malware'),
+        (u'2012-06-27 18:17:02', u'Second line', u'ubuntu', u''),
+        (u'2012-06-27 18:17:03', u'Third line', u'ubuntu', u'Malware')])
+
+    self.assertEquals(
+        self._Query(u'SELECT hosts, frequency FROM l2t_hosts'),
+        [(u'ubuntu', 3)])
+    self.assertEquals(
+        self._Query(u'SELECT record_numbers, frequency FROM l2t_record_numbers'),
+        [(u'0', 3)])
+    self.assertEquals(self._Query(u'SELECT tag FROM l2t_tags'), [(u'Malware', )])
+
+    # The frequencies of an existing database are updated when appending.
+    self._WriteEvents(
+        [Sql4n6TestEvent(1340821024000000, u'Fourth line', tag=u'Evil')],
+        append=True)
+
+    self.assertEquals(
+        self._Query(u'SELECT COUNT(*) FROM log2timeline'), [(4, )])
+    self.assertEquals(
+        self._Query(u'SELECT hosts, frequency FROM l2t_hosts'),
+        [(u'ubuntu', 4)])
+    self.assertEquals(
+        self._Query(u'SELECT tag FROM l2t_tags'),
+        [(u'Malware', ), (u'Evil', )])
+
+
+if __name__ == '__main__':
+  unittest.main()
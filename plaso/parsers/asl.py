@@ -192,6 +192,15 @@ class AslParser(interface.BaseParser):
           'value',
           length_field=construct.UBInt32('length')))
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature(cls.ASL_MAGIC, offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract entries from an ASL file.
 
@@ -23,11 +23,17 @@ from dfvfs.lib import definitions as dfvfs_definitions
 
 from plaso.lib import event
 from plaso.lib import utils
+from plaso.serializer import json_serializer
+from plaso.serializer import protobuf_serializer
 
 
 class ParserContext(object):
   """Class that implements the parser context."""
 
+  _EVENT_OBJECT_SERIALIZERS = {
+      'json': json_serializer.JsonEventObjectSerializer,
+      'proto': protobuf_serializer.ProtobufEventObjectSerializer}
+
   def __init__(
       self, event_queue_producer, parse_error_queue_producer, knowledge_base):
     """Initializes a parser context object.
@@ -43,11 +49,13 @@ class ParserContext(object):
     """
     super(ParserContext, self).__init__()
     self._abort = False
+    self._event_object_serializer = None
     self._event_queue_producer = event_queue_producer
     self._filter_object = None
     self._knowledge_base = knowledge_base
     self._mount_path = None
     self._parse_error_queue_producer = parse_error_queue_producer
+    self._serializer_format = None
     self._text_prepend = None
 
     self.number_of_events = 0
@@ -195,6 +203,29 @@ class ParserContext(object):
     if not getattr(event_object, 'query', None) and query:
       event_object.query = query
 
+  def _SerializeEventObject(self, event_object):
+    """Serializes an event object.
+
+    Args:
+      event_object: the event object (instance of EventObject).
+
+    Returns:
+      The serialized event object (instance of SerializedEventObject) or
+      None if the event object could not be serialized.
+    """
+    event_object_data = self._event_object_serializer.WriteSerialized(
+        event_object)
+    if event_object_data is None:
+      return
+
+    return event.SerializedEventObject(
+        event_object.timestamp, event_object_data, self._serializer_format,
+        data_type=getattr(event_object, 'data_type', None),
+        parser=getattr(event_object, 'parser', None),
+        plugin=getattr(event_object, 'plugin', None),
+        hostname=getattr(event_object, 'hostname', None),
+        filename=getattr(event_object, 'filename', None))
+
   def ProduceEvent(
       self, event_object, parser_chain=None, file_entry=None, query=None):
     """Produces an event onto the queue.
@@ -214,6 +245,11 @@ class ParserContext(object):
     if self.MatchesFilter(event_object):
       return
 
+    if self._event_object_serializer:
+      event_object = self._SerializeEventObject(event_object)
+      if event_object is None:
+        return
+
     self._event_queue_producer.ProduceItem(event_object)
     self.number_of_events += 1
 
@@ -255,6 +291,34 @@ class ParserContext(object):
     self.number_of_events = 0
     self.number_of_parse_errors = 0
 
+  def SetEventObjectSerializerFormat(self, serializer_format):
+    """Sets the format used to serialize the produced event objects.
+
+       When set the event objects are serialized before they are produced
+       onto the queue, as serialized event objects (instances of
+       SerializedEventObject).
+
+    Args:
+      serializer_format: a string containing the serializer format, either
+                         "proto" or "json", or None to produce event objects
+                         that are not serialized.
+
+    Raises:
+      ValueError: if the serializer format is not supported.
+    """
+    if serializer_format is None:
+      self._event_object_serializer = None
+
+    elif serializer_format in self._EVENT_OBJECT_SERIALIZERS:
+      self._event_object_serializer = self._EVENT_OBJECT_SERIALIZERS[
+          serializer_format]
+
+    else:
+      raise ValueError(
+          u'Unsupported serializer format: {0:s}.'.format(serializer_format))
+
+    self._serializer_format = serializer_format
+
   def SetFilterObject(self, filter_object):
     """Sets the filter object.
 
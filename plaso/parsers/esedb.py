@@ -57,6 +57,15 @@ class EseDbParser(interface.BasePluginsParser):
     super(EseDbParser, self).__init__()
     self._plugins = EseDbParser.GetPluginObjects()
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature('\xef\xcd\xab\x89', offset=4)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extracts data from an ESE database File.
 
@@ -24,6 +24,7 @@ IIS/676400bc-8969-4aa7-851a-9319490a9bbb.mspx?mfr=true
 """
 
 import logging
+import re
 
 import pyparsing
 
@@ -134,21 +135,144 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
   _LOG_LINE_STRUCTURES['cs(Cookie)'] = URI.setResultsName('cs_cookie')
   _LOG_LINE_STRUCTURES['cs(Referrer)'] = URI.setResultsName('cs_referrer')
 
+  # Define the regular expressions of the fast path that is tried before
+  # the pyparsing log line structure. The expressions match a subset of what
+  # the corresponding pyparsing structures match, hence lines that cannot be
+  # matched are still parsed by pyparsing.
+  _WORD_PATTERN = r'[0-9A-Za-z-]+'
+  _INT_PATTERN = r'[0-9]+|-'
+  _IP_PATTERN = (
+      r'(?:(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])\.){3}'
+      r'(?:25[0-5]|2[0-4][0-9]|1[0-9]{2}|[1-9]?[0-9])|[0-9A-Fa-f:]+|-')
+  _PORT_PATTERN = r'[0-9]{1,6}|-'
+  _URI_PATTERN = r'[0-9A-Za-z/.?&+;_=()\-:,%]+'
+  _DATE_PATTERN = r'[0-9]{4}-[0-9]{2}-[0-9]{2}'
+  _TIME_PATTERN = r'[0-9]{2}:[0-9]{2}:[0-9]{2}'
+
+  # The names of the IP address values, which pyparsing joins into
+  # an Unicode string.
+  _IP_ADDRESS_NAMES = frozenset(['dest_ip', 'source_ip'])
+
+  _LOG_LINE_6_0_PATTERNS = [
+      ('date', _DATE_PATTERN), ('time', _TIME_PATTERN),
+      ('s_sitename', _WORD_PATTERN), ('dest_ip', _IP_PATTERN),
+      ('http_method', _WORD_PATTERN), ('cs_uri_stem', _URI_PATTERN),
+      ('cs_uri_query', _URI_PATTERN), ('dest_port', _PORT_PATTERN),
+      ('cs_username', _WORD_PATTERN), ('source_ip', _IP_PATTERN),
+      ('user_agent', _URI_PATTERN), ('sc_status', _INT_PATTERN),
+      ('sc_substatus', _INT_PATTERN), ('sc_win32_status', _INT_PATTERN)]
+
+  _LOG_LINE_PATTERNS = {
+      'date': ('date', _DATE_PATTERN),
+      'time': ('time', _TIME_PATTERN),
+      's-sitename': ('s_sitename', _WORD_PATTERN),
+      's-ip': ('dest_ip', _IP_PATTERN),
+      'cs-method': ('http_method', _WORD_PATTERN),
+      'cs-uri-stem': ('requested_uri_stem', _URI_PATTERN),
+      'cs-uri-query': ('cs_uri_query', _URI_PATTERN),
+      's-port': ('dest_port', _PORT_PATTERN),
+      'cs-username': ('cs_username', _WORD_PATTERN),
+      'c-ip': ('source_ip', _IP_PATTERN),
+      'cs(User-Agent)': ('user_agent', _URI_PATTERN),
+      'sc-status': ('http_status', _INT_PATTERN),
+      'sc-substatus': ('sc_substatus', _INT_PATTERN),
+      'sc-win32-status': ('sc_win32_status', _INT_PATTERN),
+      's-computername': ('s_computername', _URI_PATTERN),
+      'sc-bytes': ('sent_bytes', _INT_PATTERN),
+      'cs-bytes': ('received_bytes', _INT_PATTERN),
+      'time-taken': ('time_taken', _INT_PATTERN),
+      'cs-version': ('protocol_version', _WORD_PATTERN),
+      'cs-host': ('cs_host', _WORD_PATTERN),
+      'cs(Cookie)': ('cs_cookie', _URI_PATTERN),
+      'cs(Referrer)': ('cs_referrer', _URI_PATTERN)}
+
   # Define the available log line structures. Default to the IIS v. 6.0
   # common format.
   LINE_STRUCTURES = [
       ('comment', text_parser.PyparsingConstants.COMMENT_LINE_HASH),
       ('logline', LOG_LINE_6_0)]
 
+  # The log line structure depends on the fields defined in the log file
+  # hence its fast path is provided by _ParseLine.
+  LINE_STRUCTURE_PATTERNS = {
+      'comment': r'\s*#',
+  }
+
   # Define a signature value for the log file.
   SIGNATURE = '#Software: Microsoft Internet Information Services'
 
   def __init__(self):
     """Initializes a parser object."""
     super(WinIISParser, self).__init__()
+    # The log line structure is changed per file hence use a copy of the
+    # line structures so that it is kept consistent with the fast path.
+    self._line_structures = list(self.LINE_STRUCTURES)
+    self._log_line_regex = self._CompileLogLineRegex(
+        self._LOG_LINE_6_0_PATTERNS)
     self.version = None
     self.software = None
 
+  def _CompileLogLineRegex(self, patterns):
+    """Compiles the regular expression of the log line fast path.
+
+    Args:
+      patterns: a list of tuples of the name and the regular expression of
+                the log line values. A name of None indicates the value is
+                not stored.
+
+    Returns:
+      A compiled regular expression or None if the log line does not have
+      a fast path.
+    """
+    names = set()
+    expressions = []
+    for name, pattern in patterns:
+      if not name:
+        expressions.append(u'(?:{0:s})'.format(pattern))
+        continue
+
+      # pyparsing only stores one of the values with the same name.
+      if name in names:
+        return
+      names.add(name)
+
+      expressions.append(u'(?P<{0:s}>{1:s})'.format(name, pattern))
+
+    if not expressions:
+      return
+
+    # The values must be separated by white space, and the last value must
+    # be followed by white space or the end of the line, in order to only
+    # match values pyparsing would have matched as well.
+    regex = u'[ \t]+'.join(expressions)
+    return re.compile(u'{0:s}(?=[ \t]|$)'.format(regex))
+
+  def _ParseLine(self, line):
+    """Parses a line with the first line structure that matches.
+
+    Args:
+      line: A single line from the text file.
+
+    Returns:
+      A tuple containing the key of the line structure and the parsed
+      structure or (None, None) if none of the line structures matches.
+    """
+    if (self.use_fast_path and self._log_line_regex and
+        not line.startswith(u'#')):
+      match = self._log_line_regex.match(line)
+      if match:
+        structure = match.groupdict()
+        for name, value in structure.iteritems():
+          if name == 'date':
+            structure[name] = tuple(map(int, value.split(u'-')))
+          elif name == 'time':
+            structure[name] = tuple(map(int, value.split(u':')))
+          elif name in self._IP_ADDRESS_NAMES:
+            structure[name] = unicode(value)
+        return 'logline', structure
+
+    return super(WinIISParser, self)._ParseLine(line)
+
   def VerifyStructure(self, unused_parser_context, line):
     """Verify that this file is an IIS log file.
 
@@ -202,14 +326,26 @@ class WinIISParser(text_parser.PyparsingSingleLineTextParser):
     # common format.
     elif comment.startswith(u'Fields'):
       log_line = pyparsing.Empty()
+      log_line_patterns = []
       for member in comment[7:].split():
         log_line += self._LOG_LINE_STRUCTURES.get(member, self.URI)
+        log_line_patterns.append(
+            self._LOG_LINE_PATTERNS.get(member, (None, self._URI_PATTERN)))
       # TODO: self._line_structures is a work-around and this needs
       # a structural fix.
       self._line_structures[1] = ('logline', log_line)
+      self._log_line_regex = self._CompileLogLineRegex(log_line_patterns)
 
   def _ParseLogLine(self, structure):
-    """Parse a single log line and return an EventObject."""
+    """Parse a single log line and return an EventObject.
+
+    Args:
+      structure: A pyparsing.ParseResults object or a dictionary of the
+                 log line values matched by the fast path.
+
+    Returns:
+      An event object (instance of IISEventObject) or None.
+    """
     date = structure.get('date', None)
     time = structure.get('time', None)
 
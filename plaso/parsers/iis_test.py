@@ -92,5 +92,64 @@ class WinIISUnitTest(test_lib.ParserTestCase):
 
     self._TestGetMessageStrings(event_object, expected_msg, expected_msg_short)
 
+  def _ParseLines(self, parser_object, lines):
+    """Parses lines and returns the attributes of the resulting events.
+
+    Args:
+      parser_object: the parser object (instance of WinIISParser).
+      lines: a list of lines.
+
+    Returns:
+      A list of dictionaries of the event attributes.
+    """
+    event_values = []
+    for line in lines:
+      # pylint: disable=protected-access
+      key, structure = parser_object._ParseLine(line.strip())
+      if not structure:
+        event_values.append(None)
+        continue
+
+      event_object = parser_object.ParseRecord(None, key, structure)
+      if event_object:
+        values = event_object.GetValues()
+        # The UUID differs per event object.
+        del values['uuid']
+        event_values.append(values)
+
+    return event_values
+
+  def testParseLine(self):
+    """Tests that the fast path and pyparsing produce the same events."""
+    test_file = self._GetTestFilePath(['iis.log'])
+    with open(test_file, 'rb') as file_object:
+      lines = file_object.readlines()
+
+    # Lines of the default IIS 6.0 format, including lines that are not
+    # matched by the fast path.
+    default_lines = [
+        (b'2013-07-30 00:00:00 SITE fe80::1 GET /index.htm - 80 - '
+         b'10.10.10.100 Mozilla/4.0 200 0 0'),
+        (b'2013-07-30 00:00:00 SITE 010.10.10.100 GET /index.htm - 80 - '
+         b'10.10.10.100 Mozilla/4.0 200 0 0'),
+        (b'2013-07-30 00:00:00 - - - - - - - - - - - -'),
+        (b'2013-07-30 00:00:00 SITE 10.10.10.100 GET /index.htm - 80 - '
+         b'10.10.10.100 Mozilla/4.0 200 0 0 trailing')]
+
+    parser_object = iis.WinIISParser()
+    # pylint: disable=protected-access
+    self.assertIsNotNone(parser_object._log_line_regex)
+    fast_path_values = self._ParseLines(parser_object, default_lines)
+    fast_path_values.extend(self._ParseLines(parser_object, lines))
+
+    parser_object = iis.WinIISParser()
+    parser_object.use_fast_path = False
+    expected_values = self._ParseLines(parser_object, default_lines)
+    expected_values.extend(self._ParseLines(parser_object, lines))
+
+    self.assertEquals(len(fast_path_values), 15)
+    self.assertEquals(fast_path_values, expected_values)
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -27,6 +27,47 @@ import abc
 from plaso.parsers import manager
 
 
+class FormatSignature(object):
+  """Class that defines a format signature.
+
+  A format signature is a byte pattern at a fixed offset in a file, that
+  identifies the file as being in a format supported by a parser.
+  """
+
+  def __init__(self, pattern, offset=0):
+    """Initializes the format signature.
+
+    Args:
+      pattern: a binary string containing the signature pattern.
+      offset: optional offset of the pattern. A negative offset is relative
+              to the end of the file. The default is 0.
+    """
+    super(FormatSignature, self).__init__()
+    self.offset = offset
+    self.pattern = pattern
+
+  def Matches(self, header_data, footer_data):
+    """Determines if the signature matches the file data.
+
+    Args:
+      header_data: a binary string containing data from the start of the file.
+      footer_data: a binary string containing data from the end of the file.
+
+    Returns:
+      A boolean value indicating if the signature matches.
+    """
+    if self.offset >= 0:
+      data = header_data
+      data_offset = self.offset
+    else:
+      data = footer_data
+      data_offset = len(footer_data) + self.offset
+      if data_offset < 0:
+        return False
+
+    return data[data_offset:data_offset + len(self.pattern)] == self.pattern
+
+
 class BaseParser(object):
   """Class that implements the parser object interface."""
 
@@ -75,6 +116,17 @@ class BaseParser(object):
     """
     raise NotImplementedError
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature) or None
+      if the parser does not define format signatures, meaning the parser
+      should be applied to every file.
+    """
+    return
+
   @classmethod
   def SupportsPlugins(cls):
     """Determines if a parser supports plugins.
@@ -451,6 +451,17 @@ class KeychainParser(interface.BaseParser):
       table_offsets.append(table_offset + self.KEYCHAIN_DB_HEADER.sizeof())
     return table_offsets
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [
+        interface.FormatSignature(
+            cls.KEYCHAIN_MAGIC_HEADER, offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a Keychain file.
 
@@ -93,6 +93,27 @@ class ParsersManager(object):
 
     return includes, excludes
 
+  @classmethod
+  def GetFormatSignatures(cls, parser_filter_string=None):
+    """Retrieves the format signatures of the registered parsers.
+
+    Args:
+      parser_filter_string: Optional parser filter string. The default is None.
+
+    Returns:
+      A dictionary containing the format signatures (list of instances of
+      FormatSignature) per parser name. Parsers that do not define format
+      signatures are not included.
+    """
+    format_signatures = {}
+    for parser_name, parser_class in cls.GetParsers(
+        parser_filter_string=parser_filter_string):
+      parser_format_signatures = parser_class.GetFormatSignatures()
+      if parser_format_signatures:
+        format_signatures[parser_name] = parser_format_signatures
+
+    return format_signatures
+
   @classmethod
   def GetParserNames(cls, parser_filter_string=None):
     """Retrieves the parser names.
@@ -170,6 +170,17 @@ class MsiecfParser(interface.BaseParser):
       parser_context.ProduceEvent(
           event_object, parser_chain=parser_chain, file_entry=file_entry)
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [
+        interface.FormatSignature(
+            'Client UrlCache MMF Ver ', offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a MSIE Cache File (MSIECF).
 
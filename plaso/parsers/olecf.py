@@ -48,6 +48,19 @@ class OleCfParser(interface.BasePluginsParser):
         self._default_plugin = self._plugins.pop(list_index)
         break
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [
+        interface.FormatSignature(
+            '\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1', offset=0),
+        interface.FormatSignature(
+            '\x0e\x11\xfc\x0d\xd0\xcf\x11\x0e', offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extracts data from an OLE Compound File (OLECF).
 
@@ -188,6 +188,15 @@ class BinaryCookieParser(interface.BaseParser):
         except errors.WrongPlugin:
           pass
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature('cook', offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a Safari Binary Cookie file.
 
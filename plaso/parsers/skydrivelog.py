@@ -103,6 +103,10 @@ class SkyDriveLogParser(text_parser.PyparsingSingleLineTextParser):
       ('no_header_single_line', SDL_NO_HEADER_SINGLE_LINE),
   ]
 
+  LINE_STRUCTURE_PATTERNS = {
+      'logline': r'\s*\d{2}\s*-\s*\d{2}\s*-\s*\d{4}',
+  }
+
   def __init__(self):
     """Initializes a parser object."""
     super(SkyDriveLogParser, self).__init__()
@@ -19,10 +19,14 @@
 
 import logging
 import os
+import shutil
 import tempfile
 
 import sqlite3
 
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
 from plaso.lib import errors
 from plaso.parsers import interface
 from plaso.parsers import manager
@@ -87,13 +91,26 @@ class SQLiteCache(plugins.BasePluginCache):
 
 
 class SQLiteDatabase(object):
-  """A simple wrapper for opening up a SQLite database."""
+  """A simple wrapper for opening up a SQLite database.
+
+  The database is staged once into a temporary directory, preferably on
+  a memory backed file system, together with its write-ahead log (WAL) or
+  rollback journal if present. The staged copy is shared by all the plugins
+  and removed when the database is closed.
+  """
 
   # Magic value for a SQLite database.
   MAGIC = 'SQLite format 3'
 
   _READ_BUFFER_SIZE = 65536
 
+  # The suffixes of the files SQLite uses alongside of the database.
+  _JOURNAL_FILE_SUFFIXES = ['-wal', '-journal']
+
+  # Directories on memory backed file systems that are preferred for staging
+  # the database when they have sufficient free space.
+  _MEMORY_BACKED_DIRECTORIES = ['/dev/shm']
+
   def __init__(self, file_entry):
     """Initializes the database object.
 
@@ -105,6 +122,7 @@ class SQLiteDatabase(object):
     self._file_entry = file_entry
     self._open = False
     self._tables = []
+    self._temp_directory = u''
     self._temp_file_name = ''
 
   def __exit__(self, unused_type, unused_value, unused_traceback):
@@ -131,23 +149,111 @@ class SQLiteDatabase(object):
 
     return self._tables
 
+  def _CopyFileObject(self, file_object, path, data=b''):
+    """Copies the data of a file-like object to a file.
+
+    Args:
+      file_object: the file-like object to copy the data from.
+      path: the path of the file to copy the data to.
+      data: optional data that was already read from the file-like object.
+            The default is an empty string.
+    """
+    with open(path, 'wb') as file_object_copy:
+      if not data:
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+      while data:
+        file_object_copy.write(data)
+        data = file_object.read(self._READ_BUFFER_SIZE)
+
+  def _CopyJournalFiles(self):
+    """Copies the write-ahead log and rollback journal files if present."""
+    path_spec = self._file_entry.path_spec
+    location = getattr(path_spec, 'location', None)
+    if not location:
+      return
+
+    for suffix in self._JOURNAL_FILE_SUFFIXES:
+      # We need to pass only used arguments to the path specification
+      # factory otherwise it will raise.
+      kwargs = {}
+      if path_spec.parent:
+        kwargs['parent'] = path_spec.parent
+      kwargs['location'] = u'{0:s}{1:s}'.format(location, suffix)
+
+      journal_path_spec = path_spec_factory.Factory.NewPathSpec(
+          path_spec.type_indicator, **kwargs)
+
+      # Use the resolver context of the database file entry so that the
+      # journal files are opened through the same file system cache.
+      # pylint: disable=protected-access
+      resolver_context = getattr(self._file_entry, '_resolver_context', None)
+
+      try:
+        journal_file_entry = path_spec_resolver.Resolver.OpenFileEntry(
+            journal_path_spec, resolver_context=resolver_context)
+      except RuntimeError as exception:
+        logging.debug(
+            u'Unable to open journal file: {0:s} with error: {1:s}'.format(
+                kwargs['location'], exception))
+        journal_file_entry = None
+
+      if not journal_file_entry:
+        continue
+
+      journal_file_object = journal_file_entry.GetFileObject()
+      try:
+        self._CopyFileObject(
+            journal_file_object, u'{0:s}{1:s}'.format(
+                self._temp_file_name, suffix))
+      finally:
+        journal_file_object.close()
+
+  def _GetTemporaryDirectory(self, file_size):
+    """Determines the directory to stage the database in.
+
+    Args:
+      file_size: the size of the database file.
+
+    Returns:
+      The path of a memory backed directory with sufficient free space or
+      None to use the default temporary directory.
+    """
+    for directory in self._MEMORY_BACKED_DIRECTORIES:
+      if not os.path.isdir(directory) or not os.access(directory, os.W_OK):
+        continue
+
+      try:
+        file_system_information = os.statvfs(directory)
+      except (AttributeError, OSError):
+        continue
+
+      free_space = (
+          file_system_information.f_bavail * file_system_information.f_frsize)
+
+      # Leave space for the journal files and other users of the directory.
+      if free_space > 2 * file_size:
+        return directory
+
   def Close(self):
-    """Close the database connection and clean up the temporary file."""
+    """Close the database connection and clean up the temporary files."""
     if not self._open:
       return
 
     self._database.close()
 
     try:
-      os.remove(self._temp_file_name)
+      shutil.rmtree(self._temp_directory)
     except (OSError, IOError) as exception:
       logging.warning((
           u'Unable to remove temporary copy: {0:s} of SQLite database: {1:s} '
           u'with error: {2:s}').format(
-              self._temp_file_name, self._file_entry.name, exception))
+              self._temp_directory, self._file_entry.name, exception))
 
+    self._cursor = None
     self._tables = []
     self._database = None
+    self._temp_directory = u''
     self._temp_file_name = ''
     self._open = False
 
@@ -155,71 +261,68 @@ class SQLiteDatabase(object):
     """Opens up a database connection and build a list of table names."""
     file_object = self._file_entry.GetFileObject()
 
-    # TODO: Remove this when the classifier gets implemented
-    # and used. As of now, there is no check made against the file
-    # to verify it's signature, thus all files are sent here, meaning
-    # that this method assumes everything is a SQLite file and starts
-    # copying the content of the file into memory, which is not good
-    # for very large files.
-    file_object.seek(0, os.SEEK_SET)
-
-    data = file_object.read(len(self.MAGIC))
+    try:
+      file_object.seek(0, os.SEEK_SET)
+
+      data = file_object.read(len(self.MAGIC))
+
+      if data != self.MAGIC:
+        raise IOError(
+            u'File {0:s} not a SQLite database. (invalid signature)'.format(
+                self._file_entry.name))
+
+      # TODO: Change this into a proper implementation using APSW
+      # and virtual filesystems when that will be available.
+      # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
+      # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
+      # Until then, just copy the file into a temporary directory and
+      # parse it.
+      file_size = file_object.get_size()
+      self._temp_directory = tempfile.mkdtemp(
+          dir=self._GetTemporaryDirectory(file_size))
+      self._temp_file_name = os.path.join(self._temp_directory, u'database')
+
+      self._CopyFileObject(file_object, self._temp_file_name, data=data)
+
+      # Note that SQLite uses the journal files when the database is opened,
+      # which requires them to be named after the database.
+      self._CopyJournalFiles()
+
+    except (IOError, OSError):
+      if self._temp_directory:
+        shutil.rmtree(self._temp_directory, True)
+        self._temp_directory = u''
+      raise
 
-    if data != self.MAGIC:
+    finally:
       file_object.close()
-      raise IOError(
-          u'File {0:s} not a SQLite database. (invalid signature)'.format(
-              self._file_entry.name))
-
-    # TODO: Current design copies the entire file into a buffer
-    # that is parsed by each SQLite parser. This is not very efficient,
-    # especially when many SQLite parsers are ran against a relatively
-    # large SQLite database. This temporary file that is created should
-    # be usable by all SQLite parsers so the file should only be read
-    # once in memory and then deleted when all SQLite parsers have completed.
-
-    # TODO: Change this into a proper implementation using APSW
-    # and virtual filesystems when that will be available.
-    # Info: http://apidoc.apsw.googlecode.com/hg/vfs.html#vfs and
-    # http://apidoc.apsw.googlecode.com/hg/example.html#example-vfs
-    # Until then, just copy the file into a tempfile and parse it.
-
-    # Note that data is filled here with the file header data and
-    # that with will explicitly close the temporary files and thus
-    # making sure it is available for sqlite3.connect().
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
-      self._temp_file_name = temp_file.name
-      while data:
-        temp_file.write(data)
-        data = file_object.read(self._READ_BUFFER_SIZE)
 
+    # Mark the database as open so that Close cleans up the temporary files
+    # if the database cannot be read.
     self._database = sqlite3.connect(self._temp_file_name)
+    self._open = True
+
     try:
       self._database.row_factory = sqlite3.Row
       self._cursor = self._database.cursor()
-    except sqlite3.DatabaseError as exception:
-      logging.debug(
-          u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
-              self._file_entry.name, exception))
-      raise
 
-    # Verify the table by reading in all table names and compare it to
-    # the list of required tables.
-    try:
+      # Memory map the staged copy to prevent the data being copied again
+      # into the SQLite page cache.
+      self._cursor.execute(u'PRAGMA mmap_size={0:d}'.format(file_size))
+
+      # Read the table names once, so that the plugins can be matched
+      # against the tables without querying the database.
       sql_results = self._cursor.execute(
           'SELECT name FROM sqlite_master WHERE type="table"')
+      self._tables = [row[0] for row in sql_results]
+
     except sqlite3.DatabaseError as exception:
       logging.debug(
           u'Unable to parse SQLite database: {0:s} with error: {1:s}'.format(
               self._file_entry.name, exception))
+      self.Close()
       raise
 
-    self._tables = []
-    for row in sql_results:
-      self._tables.append(row[0])
-
-    self._open = True
-
 
 class SQLiteParser(interface.BasePluginsParser):
   """A SQLite parser for Plaso."""
@@ -237,6 +340,15 @@ class SQLiteParser(interface.BasePluginsParser):
     self._plugins = SQLiteParser.GetPluginObjects()
     self.db = None
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature(SQLiteDatabase.MAGIC, offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Parses an SQLite database.
 
@@ -264,7 +376,15 @@ class SQLiteParser(interface.BasePluginsParser):
       parser_chain = self._BuildParserChain(parser_chain)
       # Create a cache in which the resulting tables are cached.
       cache = SQLiteCache()
+      tables = frozenset(database.tables)
       for plugin_object in self._plugins:
+        # Only dispatch the plugins of which the required tables are present.
+        if not tables >= plugin_object.REQUIRED_TABLES:
+          logging.debug(
+              u'Plugin: {0:s} skipped for database: {1:s}'.format(
+                  plugin_object.NAME, file_entry.name))
+          continue
+
         try:
           plugin_object.Process(
               parser_context, file_entry=file_entry, parser_chain=parser_chain,
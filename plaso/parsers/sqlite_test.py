@@ -17,8 +17,13 @@
 # limitations under the License.
 """Tests for the SQLite database parser."""
 
+import os
 import unittest
 
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
 from plaso.parsers import sqlite
 # Register plugins.
 from plaso.parsers import sqlite_plugins  # pylint: disable=unused-import
@@ -59,5 +64,26 @@ class SQLiteParserTest(unittest.TestCase):
     self.assertTrue('firefox_history' in plugin_names)
 
 
+
+class SQLiteDatabaseTest(unittest.TestCase):
+  """Tests for the SQLite database wrapper."""
+
+  def testOpenClose(self):
+    """Tests the Open and Close functions."""
+    test_file = os.path.join('test_data', 'application_usage.sqlite')
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=test_file)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    database = sqlite.SQLiteDatabase(file_entry)
+    database.Open()
+    temp_directory = database._temp_directory
+
+    self.assertTrue(os.path.isdir(temp_directory))
+    self.assertEquals(database.tables, [u'application_usage'])
+
+    database.Close()
+    self.assertFalse(os.path.exists(temp_directory))
+
 if __name__ == '__main__':
   unittest.main()
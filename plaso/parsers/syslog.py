@@ -19,6 +19,7 @@
 
 import datetime
 import logging
+import re
 
 from plaso.events import text_events
 from plaso.lib import lexer
@@ -60,6 +61,26 @@ class SyslogParser(text_parser.SlowLexicalTextParser):
       lexer.Token('S[.]+', '(.+)', 'ParseString', ''),
       ]
 
+  # Regular expression that matches a complete single line in the INITIAL
+  # state, equivalent to the tokens above. Lines that are not matched, e.g.
+  # lines that are followed by a continuation line, are processed by the
+  # tokens. The line must be followed by another character to be able to
+  # determine it is not followed by a continuation line. The regular
+  # expression is compiled with the same flags as the tokens, which are case
+  # insensitive since lexer.Token defaults to re.I.
+  _LINE_REGEX = re.compile(
+      r'(Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec) '
+      r'\s?(\d{1,2})\s+'
+      r'([0-9:\.]+) '
+      r'(?!---)([^\s]+) '
+      r'([^\:\n]+)'
+      r'([^\n]*)\n(?=[^\t])',
+      re.DOTALL | re.M | re.S | re.U | re.I)
+
+  # Token that is returned when a line was matched by the line regular
+  # expression.
+  _LINE_TOKEN = lexer.Token('INITIAL', _LINE_REGEX.pattern, None, 'INITIAL')
+
   def __init__(self):
     """Initializes a syslog parser object."""
     super(SyslogParser, self).__init__(local_zone=True)
@@ -95,6 +116,58 @@ class SyslogParser(text_parser.SlowLexicalTextParser):
 
     return timestamp.year
 
+  def _SetReporterAndPid(self, value):
+    """Sets the reporter and process identifier (PID) attributes.
+
+    Args:
+      value: the string containing the reporter and optional PID.
+    """
+    # TODO: Change this logic and rather add more Tokens that
+    # fully cover all variations of the various PID stages.
+    if value[-1] == ']':
+      splits = value.split('[')
+      if len(splits) == 2:
+        self.attributes['reporter'], pid = splits
+      else:
+        pid = splits[-1]
+        self.attributes['reporter'] = '['.join(splits[:-1])
+      try:
+        self.attributes['pid'] = int(pid[:-1])
+      except ValueError:
+        self.attributes['pid'] = 0
+    else:
+      self.attributes['reporter'] = value
+
+  def NextToken(self):
+    """Return the next token.
+
+    In the INITIAL state a complete line is matched at once, if possible,
+    instead of by the individual tokens.
+    """
+    if self.state != 'INITIAL' or self.GetBufferSize() < 512:
+      # Let the lexer feed its buffer first.
+      return super(SyslogParser, self).NextToken()
+
+    match = self._LINE_REGEX.match(self._buffer, self._buffer_offset)
+    if not match:
+      return super(SyslogParser, self).NextToken()
+
+    self._ConsumeBuffer(match.end() - self._buffer_offset)
+
+    self.attributes['imonth'] = int(
+        timelib.MONTH_DICT.get(match.group(1).lower(), 1))
+    self.attributes['iday'] = int(match.group(2))
+    self.attributes['time'] = match.group(3)
+    self.attributes['hostname'] = match.group(4)
+    self._SetReporterAndPid(match.group(5))
+
+    body = match.group(6)
+    if body:
+      self.attributes['body'] += utils.GetUnicodeString(body)
+
+    self.line_ready = True
+    return self._LINE_TOKEN
+
   def ParseLine(self, parser_context):
     """Parse a single line from the syslog file.
 
@@ -154,22 +227,7 @@ class SyslogParser(text_parser.SlowLexicalTextParser):
     Args:
       match: The regular expression match object.
     """
-    # TODO: Change this logic and rather add more Tokens that
-    # fully cover all variations of the various PID stages.
-    line = match.group(1)
-    if line[-1] == ']':
-      splits = line.split('[')
-      if len(splits) == 2:
-        self.attributes['reporter'], pid = splits
-      else:
-        pid = splits[-1]
-        self.attributes['reporter'] = '['.join(splits[:-1])
-      try:
-        self.attributes['pid'] = int(pid[:-1])
-      except ValueError:
-        self.attributes['pid'] = 0
-    else:
-      self.attributes['reporter'] = line
+    self._SetReporterAndPid(match.group(1))
 
   def ParseString(self, match=None, **unused_kwargs):
     """Parses a (body text) string.
@@ -17,15 +17,25 @@
 # limitations under the License.
 """Tests for the syslog parser."""
 
+import StringIO
 import unittest
 
 # pylint: disable=unused-import
 from plaso.formatters import syslog as syslog_formatter
+from plaso.lib import lexer
 from plaso.lib import timelib_test
 from plaso.parsers import syslog
 from plaso.parsers import test_lib
 
 
+class SyslogParserWithoutFastPath(syslog.SyslogParser):
+  """Syslog parser that only parses lines with the lexer tokens."""
+
+  def NextToken(self):
+    """Return the next token."""
+    return lexer.SelfFeederMixIn.NextToken(self)
+
+
 class SyslogUnitTest(test_lib.ParserTestCase):
   """Tests for the syslog parser."""
 
@@ -71,6 +81,59 @@ class SyslogUnitTest(test_lib.ParserTestCase):
         '2013-03-23 23:01:18')
     self.assertEquals(event_objects[8].timestamp, expected_timestamp)
 
+  def _ParseLines(self, parser_object, data):
+    """Parses lines and returns the attributes of the resulting lines.
+
+    Args:
+      parser_object: the parser object (instance of SyslogParser).
+      data: a string containing the lines.
+
+    Returns:
+      A tuple of a list of dictionaries of the line attributes and the number
+      of lines that were matched at once by the line regular expression.
+    """
+    parser_object.file_object = StringIO.StringIO(data)
+    parser_object.buffer = ''
+
+    line_values = []
+    number_of_fast_path_lines = 0
+    while True:
+      token = parser_object.NextToken()
+      # pylint: disable=protected-access
+      if token is parser_object._LINE_TOKEN:
+        number_of_fast_path_lines += 1
+
+      if parser_object.line_ready:
+        line_values.append(dict(parser_object.attributes))
+        parser_object.ClearValues()
+
+      if token is None:
+        break
+
+    return line_values, number_of_fast_path_lines
+
+  def testNextToken(self):
+    """Tests that the fast path and the tokens produce the same lines."""
+    test_file = self._GetTestFilePath(['syslog'])
+    with open(test_file, 'rb') as file_object:
+      data = file_object.read()
+
+    # The lines are repeated so that the buffer contains at least 512 bytes
+    # for most of them and the month of the last lines is not capitalized.
+    data = b''.join([data, data, data.lower()])
+
+    line_values, number_of_fast_path_lines = self._ParseLines(
+        syslog.SyslogParser(), data)
+    self.assertGreater(number_of_fast_path_lines, 0)
+
+    expected_line_values, number_of_fast_path_lines = self._ParseLines(
+        SyslogParserWithoutFastPath(), data)
+    self.assertEquals(number_of_fast_path_lines, 0)
+
+    self.assertEquals(len(line_values), len(expected_line_values))
+    for values, expected_values in zip(line_values, expected_line_values):
+      self.assertEquals(values, expected_values)
+
 
 if __name__ == '__main__':
   unittest.main()
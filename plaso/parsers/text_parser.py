@@ -26,6 +26,7 @@ import abc
 import csv
 import logging
 import os
+import re
 
 from dfvfs.helpers import text_file
 import pyparsing
@@ -204,7 +205,7 @@ class SlowLexicalTextParser(interface.BaseParser, lexer.SelfFeederMixIn):
 
       if self.state == 'INITIAL':
         self.entry_offset = getattr(self, 'next_entry_offset', 0)
-        self.next_entry_offset = file_object.tell() - len(self.buffer)
+        self.next_entry_offset = file_object.tell() - self.GetBufferSize()
 
       if not file_verified and self.error >= self.MAX_LINES * 2:
         logging.debug(
@@ -661,6 +662,204 @@ class PyparsingConstants(object):
       pyparsing.nums, min=1, max=5).setParseAction(PyParseIntCast)
 
 
+class BufferedLineReader(object):
+  """Class that reads lines from a file-like object in blocks of data.
+
+  Reading a file-like object in large blocks and splitting the blocks into
+  lines in bulk is considerably faster than reading the file-like object line
+  by line. The offsets of the lines are tracked from the sizes of the lines,
+  relative to the offset of the file-like object when the reader was created.
+  """
+
+  DEFAULT_BLOCK_SIZE = 1024 * 1024
+
+  def __init__(self, file_object, block_size=None, encoding=None):
+    """Initializes the buffered line reader object.
+
+    Args:
+      file_object: the file-like object.
+      block_size: optional size of the blocks of data that are read. The
+                  default is None, which represents DEFAULT_BLOCK_SIZE.
+      encoding: optional encoding of the lines. The default is None, which
+                represents the lines should not be decoded.
+    """
+    super(BufferedLineReader, self).__init__()
+    self._block_size = block_size or self.DEFAULT_BLOCK_SIZE
+    self._decoded_lines = []
+    self._encoding = encoding
+    self._end_of_file = False
+    self._file_object = file_object
+    self._line_index = 0
+    self._lines = []
+    self._remaining_data = []
+    self._remaining_data_size = 0
+
+    if self._encoding:
+      # Encoding two end-of-line characters and only keeping the size of
+      # one prevents a byte-order mark from ending up in the separator.
+      end_of_line = u'\n'.encode(self._encoding)
+      end_of_line_size = (
+          len(u'\n\n'.encode(self._encoding)) - len(end_of_line))
+      self._end_of_line = end_of_line[-end_of_line_size:]
+    else:
+      self._end_of_line = b'\n'
+
+    self.line_offset = 0
+    self.offset = 0
+
+  def _DecodeLine(self, line):
+    """Decodes a line.
+
+    Args:
+      line: a binary string containing the line.
+
+    Returns:
+      A Unicode string containing the decoded line or the binary string if
+      the line could not be decoded.
+    """
+    if not self._encoding:
+      return line
+
+    try:
+      return line.decode(self._encoding)
+    except UnicodeDecodeError:
+      return line
+
+  def _ReadBlock(self, maximum_size=None):
+    """Reads blocks of data until at least one line is available.
+
+    Args:
+      maximum_size: optional maximum number of bytes of data without an
+                    end-of-line to read. If exceeded the data is returned
+                    as a partial line. The default is None, which represents
+                    no limit.
+
+    Returns:
+      A boolean value indicating whether lines are available.
+    """
+    end_of_line_size = len(self._end_of_line)
+
+    while not self._end_of_file:
+      data = self._file_object.read(self._block_size)
+      if not data:
+        self._end_of_file = True
+        if not self._remaining_data:
+          break
+
+        # The last line of the file does not end with an end-of-line.
+        lines = [b''.join(self._remaining_data)]
+        self._remaining_data = []
+        self._remaining_data_size = 0
+
+      else:
+        # The end-of-line can be split between the previous and this block.
+        previous_data = b''
+        if self._remaining_data and end_of_line_size > 1:
+          previous_data = self._remaining_data[-1][1 - end_of_line_size:]
+
+        data_size = b''.join([previous_data, data]).rfind(self._end_of_line)
+        if data_size < 0:
+          self._remaining_data.append(data)
+          self._remaining_data_size += len(data)
+          if not maximum_size or self._remaining_data_size < maximum_size:
+            continue
+
+          # Return the maximum size of the data read so far as a partial line,
+          # the remainder of the data is returned by the next read.
+          lines_data = b''.join(self._remaining_data)
+          lines = [lines_data[:maximum_size]]
+
+          self._remaining_data = [lines_data[maximum_size:]]
+          self._remaining_data_size = len(self._remaining_data[0])
+          if not self._remaining_data_size:
+            self._remaining_data = []
+
+        else:
+          data_size += end_of_line_size - len(previous_data)
+          self._remaining_data.append(data[:data_size])
+          lines_data = b''.join(self._remaining_data)
+
+          self._remaining_data = []
+          self._remaining_data_size = len(data) - data_size
+          if self._remaining_data_size:
+            self._remaining_data.append(data[data_size:])
+
+          lines = lines_data.split(self._end_of_line)
+          # The data ends with an end-of-line hence the last line is empty.
+          lines.pop()
+          lines = [b''.join([line, self._end_of_line]) for line in lines]
+
+      self._lines = lines
+      self._line_index = 0
+
+      if self._encoding:
+        # Decode the lines of the block at once and fall back to decoding
+        # the lines individually if that fails.
+        try:
+          decoded_lines = b''.join(lines).decode(self._encoding).split(u'\n')
+        except UnicodeDecodeError:
+          decoded_lines = None
+
+        if decoded_lines is not None:
+          last_decoded_line = decoded_lines.pop()
+          decoded_lines = [
+              u''.join([line, u'\n']) for line in decoded_lines]
+          if last_decoded_line:
+            decoded_lines.append(last_decoded_line)
+
+        if decoded_lines is None or len(decoded_lines) != len(lines):
+          decoded_lines = [self._DecodeLine(line) for line in lines]
+
+        self._decoded_lines = decoded_lines
+
+      return True
+
+    return False
+
+  def ReadLine(self, maximum_size=None):
+    """Reads a line.
+
+    Args:
+      maximum_size: optional maximum number of bytes of the line to read.
+                    The remainder of a longer line is returned by the next
+                    read. The default is None, which represents no limit.
+
+    Returns:
+      A string containing the line, including the end-of-line character,
+      or an empty string if no more lines are available. If an encoding
+      was specified the line is a Unicode string unless it could not be
+      decoded.
+    """
+    if (self._line_index >= len(self._lines) and
+        not self._ReadBlock(maximum_size=maximum_size)):
+      return b''
+
+    line_index = self._line_index
+    line = self._lines[line_index]
+
+    if maximum_size and len(line) > maximum_size:
+      self._lines[line_index] = line[maximum_size:]
+      line = line[:maximum_size]
+
+      if self._encoding:
+        self._decoded_lines[line_index] = self._DecodeLine(
+            self._lines[line_index])
+        decoded_line = self._DecodeLine(line)
+
+    else:
+      self._line_index += 1
+
+      if self._encoding:
+        decoded_line = self._decoded_lines[line_index]
+
+    self.line_offset = self.offset
+    self.offset += len(line)
+
+    if self._encoding:
+      return decoded_line
+    return line
+
+
 class PyparsingSingleLineTextParser(interface.BaseParser):
   """Single line text parser based on the pyparsing library."""
 
@@ -676,6 +875,20 @@ class PyparsingSingleLineTextParser(interface.BaseParser):
   # The value is the actual pyparsing structure.
   LINE_STRUCTURES = []
 
+  # Optional regular expressions per line structure key, that are used as
+  # a fast path to determine which line structure to parse a line with.
+  # A line is only parsed with a line structure if its regular expression
+  # matches the start of the line. Hence the regular expression should match
+  # every line the corresponding line structure can parse. Line structures
+  # without a regular expression are always tried.
+  LINE_STRUCTURE_PATTERNS = {}
+
+  # Define whether the regular expression fast path is used. If this value
+  # needs to be changed for a specific parser object, e.g. to compare the
+  # parsing results with and without the fast path, it can be done by
+  # modifying the self.use_fast_path attribute.
+  USE_FAST_PATH = True
+
   # In order for the tool to not read too much data into a buffer to evaluate
   # whether or not the parser is the right one for this file or not we
   # specifically define a maximum amount of bytes a single line can occupy. This
@@ -696,54 +909,89 @@ class PyparsingSingleLineTextParser(interface.BaseParser):
     """Initializes the pyparsing single-line text parser object."""
     super(PyparsingSingleLineTextParser, self).__init__()
     self.encoding = self.ENCODING
+    self.use_fast_path = self.USE_FAST_PATH
     self._current_offset = 0
     # TODO: self._line_structures is a work-around and this needs
     # a structural fix.
     self._line_structures = self.LINE_STRUCTURES
+    self._line_structure_patterns = {}
+    for key, pattern in self.LINE_STRUCTURE_PATTERNS.iteritems():
+      self._line_structure_patterns[key] = re.compile(pattern)
+
+  def _ParseLine(self, line):
+    """Parses a line with the first line structure that matches.
+
+    Args:
+      line: A single line from the text file.
+
+    Returns:
+      A tuple containing the key of the line structure and the parsed
+      structure (instance of pyparsing.ParseResults) or (None, None) if
+      none of the line structures matches.
+    """
+    for key, structure in self._line_structures:
+      pattern = None
+      if self.use_fast_path:
+        pattern = self._line_structure_patterns.get(key, None)
+      if pattern and not pattern.match(line):
+        continue
+
+      try:
+        parsed_structure = structure.parseString(line)
+      except pyparsing.ParseException:
+        continue
+
+      if parsed_structure:
+        return key, parsed_structure
+
+    return None, None
 
   def _ReadLine(
-      self, parser_context, file_entry, text_file_object, max_len=0,
-      quiet=False, depth=0):
+      self, parser_context, file_entry, line_reader, max_len=0,
+      quiet=False, maximum_number_of_empty_lines=None):
     """Read a single line from a text file and return it back.
 
+    Empty lines are skipped.
+
     Args:
       parser_context: A parser context object (instance of ParserContext).
       file_entry: A file entry object (instance of dfvfs.FileEntry).
-      text_file_object: A text file object (instance of dfvfs.TextFile).
+      line_reader: A line reader object (instance of BufferedLineReader).
       max_len: If defined determines the maximum number of bytes a single line
                can take.
       quiet: If True then a decode warning is not displayed.
-      depth: A threshold of how many newlines we can encounter before bailing
-             out.
+      maximum_number_of_empty_lines: Optional threshold of how many empty
+                                     lines we can encounter before bailing
+                                     out. The default is None, which
+                                     represents no limit.
 
     Returns:
       A single line read from the file-like object, or the maximum number of
       characters (if max_len defined and line longer than the defined size).
+      None is returned if no more lines are available.
     """
-    if max_len:
-      line = text_file_object.readline(max_len)
-    else:
-      line = text_file_object.readline()
-
-    if not line:
-      return
+    number_of_empty_lines = 0
+    while True:
+      line = line_reader.ReadLine(maximum_size=max_len)
+      if not line:
+        return
 
-    # If line is empty, skip it and go on.
-    if line == '\n' or line == '\r\n':
-      # Max 40 new lines in a row before we bail out.
-      if depth == 40:
-        return ''
+      line = line.strip()
+      if line:
+        break
 
-      return self._ReadLine(
-          parser_context, file_entry, text_file_object, max_len=max_len,
-          depth=depth + 1)
+      number_of_empty_lines += 1
+      if (maximum_number_of_empty_lines is not None and
+          number_of_empty_lines > maximum_number_of_empty_lines):
+        return
 
-    if not self.encoding:
-      return line.strip()
+    # The line reader returns a binary string if the line could not be
+    # decoded, or if the encoding was changed after the reader was created.
+    if not self.encoding or isinstance(line, unicode):
+      return line
 
     try:
-      decoded_line = line.decode(self.encoding)
-      return decoded_line.strip()
+      return line.decode(self.encoding)
     except UnicodeDecodeError:
       if not quiet:
         logging.warning((
@@ -751,7 +999,7 @@ class PyparsingSingleLineTextParser(interface.BaseParser):
             u'file: {2:s}').format(
                 repr(line[1:30]), self.encoding,
                 parser_context.GetDisplayName(file_entry)))
-      return line.strip()
+      return line
 
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a text file using a pyparsing definition.
@@ -778,11 +1026,13 @@ class PyparsingSingleLineTextParser(interface.BaseParser):
           u'Line structure undeclared, unable to proceed.')
 
     file_object.seek(0, os.SEEK_SET)
-    text_file_object = text_file.TextFile(file_object)
+    line_reader = BufferedLineReader(file_object, encoding=self.encoding)
 
+    # Max 40 empty lines in a row before we bail out on the first line.
     line = self._ReadLine(
-        parser_context, file_entry, text_file_object,
-        max_len=self.MAX_LINE_LENGTH, quiet=True)
+        parser_context, file_entry, line_reader,
+        max_len=self.MAX_LINE_LENGTH, quiet=True,
+        maximum_number_of_empty_lines=40)
     if not line:
       raise errors.UnableToParseFile(u'Not a text file.')
 
@@ -804,22 +1054,10 @@ class PyparsingSingleLineTextParser(interface.BaseParser):
     # event creation in this parser.
     parser_chain = self._BuildParserChain(parser_chain)
 
-    # Set the offset to the beginning of the file.
-    self._current_offset = 0
     # Read every line in the text file.
     while line:
-      parsed_structure = None
-      use_key = None
-      # Try to parse the line using all the line structures.
-      for key, structure in self.LINE_STRUCTURES:
-        try:
-          parsed_structure = structure.parseString(line)
-        except pyparsing.ParseException:
-          pass
-        if parsed_structure:
-          use_key = key
-          break
-
+      self._current_offset = line_reader.line_offset
+      use_key, parsed_structure = self._ParseLine(line)
       if parsed_structure:
         parsed_event = self.ParseRecord(
             parser_context, use_key, parsed_structure)
@@ -830,8 +1068,7 @@ class PyparsingSingleLineTextParser(interface.BaseParser):
       else:
         logging.warning(u'Unable to parse log line: {0:s}'.format(line))
 
-      self._current_offset = text_file_object.get_offset()
-      line = self._ReadLine(parser_context, file_entry, text_file_object)
+      line = self._ReadLine(parser_context, file_entry, line_reader)
 
     file_object.close()
 
@@ -880,23 +1117,40 @@ class EncodedTextReader(object):
       encoding: optional encoding. The default is None.
     """
     super(EncodedTextReader, self).__init__()
-    self._buffer = ''
     self._buffer_size = buffer_size
     self._current_offset = 0
     self._encoding = encoding
+    self._file_object = None
+    self._line_reader = None
 
+    # The encoded end-of-line characters are needed to strip the carriage
+    # returns of lines that could not be decoded and are returned as
+    # the original raw string.
     if self._encoding:
-      self._new_line = u'\n'.encode(self._encoding)
-      self._carriage_return = u'\r'.encode(self._encoding)
+      self._new_line = self._EncodeCharacter(u'\n')
+      self._carriage_return = self._EncodeCharacter(u'\r')
     else:
       self._new_line = '\n'
       self._carriage_return = '\r'
 
-    self._new_line_length = len(self._new_line)
-    self._carriage_return_length = len(self._carriage_return)
-
     self.lines = u''
 
+  def _EncodeCharacter(self, character):
+    """Encodes a single character without a byte-order mark.
+
+    Args:
+      character: a Unicode string containing the character.
+
+    Returns:
+      A binary string containing the encoded character.
+    """
+    # Encoding the character twice and only keeping the size of one prevents
+    # a byte-order mark from ending up in the encoded character.
+    encoded_character = character.encode(self._encoding)
+    encoded_character_size = (
+        len((character * 2).encode(self._encoding)) - len(encoded_character))
+    return encoded_character[-encoded_character_size:]
+
   def _ReadLine(self, file_object):
     """Reads a line from the file object.
 
@@ -906,34 +1160,34 @@ class EncodedTextReader(object):
     Returns:
       A string containing the line.
     """
-    if len(self._buffer) < self._buffer_size:
-      self._buffer = ''.join([
-          self._buffer, file_object.read(self._buffer_size)])
-
-    line, new_line, self._buffer = self._buffer.partition(self._new_line)
-    if not line and not new_line:
-      line = self._buffer
-      self._buffer = ''
+    if not self._line_reader or file_object is not self._file_object:
+      self._file_object = file_object
+      self._line_reader = BufferedLineReader(
+          file_object, block_size=self._buffer_size, encoding=self._encoding)
+
+    # If a parser specifically indicates specific encoding the line reader
+    # decodes the line. If that fails it falls back to the original raw string.
+    # A line that exceeds the buffer size is read in parts.
+    line = self._line_reader.ReadLine(maximum_size=self._buffer_size)
+    self._current_offset = self._line_reader.offset
+
+    if isinstance(line, unicode):
+      new_line = u'\n'
+      carriage_return = u'\r'
+    else:
+      new_line = self._new_line
+      carriage_return = self._carriage_return
 
-    self._current_offset += len(line)
+    has_new_line = line.endswith(new_line)
+    if has_new_line:
+      line = line[:-len(new_line)]
 
     # Strip carriage returns from the text.
-    if line.endswith(self._carriage_return):
-      line = line[:-self._carriage_return_length]
+    if line.endswith(carriage_return):
+      line = line[:-len(carriage_return)]
 
-    if new_line:
-      line = ''.join([line, self._new_line])
-      self._current_offset += self._new_line_length
-
-    # If a parser specifically indicates specific encoding we need
-    # to handle the buffer as it is an encoded string.
-    # If it fails we fail back to the original raw string.
-    if self._encoding:
-      try:
-        line = line.decode(self._encoding)
-      except UnicodeDecodeError:
-        # TODO: it might be better to raise here.
-        pass
+    if has_new_line:
+      line = ''.join([line, new_line])
 
     return line
 
@@ -972,8 +1226,9 @@ class EncodedTextReader(object):
 
   def Reset(self):
     """Resets the encoded text reader."""
-    self._buffer = ''
     self._current_offset = 0
+    self._file_object = None
+    self._line_reader = None
 
     self.lines = u''
 
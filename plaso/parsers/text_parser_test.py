@@ -17,6 +17,7 @@
 # limitations under the License.
 """This file contains the tests for the generic text parser."""
 
+import io
 import unittest
 
 import pyparsing
@@ -83,6 +84,25 @@ class TestTextParser(text_parser.SlowLexicalTextParser):
     return event_object
 
 
+class TestPyparsingSingleLineTextParser(
+    text_parser.PyparsingSingleLineTextParser):
+  """Implement a single line text parser object with line structure patterns."""
+  NAME = 'test_single_line_text'
+
+  LINE_STRUCTURES = [
+      ('comment', text_parser.PyparsingConstants.COMMENT_LINE_HASH),
+      ('logline', text_parser.PyparsingConstants.DATE_TIME)]
+
+  LINE_STRUCTURE_PATTERNS = {
+      'logline': r'\s*\d{4}-'}
+
+  def ParseRecord(self, unused_parser_context, unused_key, unused_structure):
+    return
+
+  def VerifyStructure(self, unused_parser_context, unused_line):
+    return True
+
+
 class TextParserTest(test_lib.ParserTestCase):
   """An unit test for the plaso parser library."""
 
@@ -180,5 +200,132 @@ class PyParserTest(test_lib.ParserTestCase):
     self.assertEquals(len(parsed_line), 2)
 
 
+class BufferedLineReaderTest(unittest.TestCase):
+  """Tests for the buffered line reader object."""
+
+  def testReadLine(self):
+    """Tests the ReadLine function."""
+    file_object = io.BytesIO(b'first line\r\nsecond line\n\nlast line')
+    line_reader = text_parser.BufferedLineReader(file_object, block_size=4)
+
+    self.assertEquals(line_reader.ReadLine(), b'first line\r\n')
+    self.assertEquals(line_reader.line_offset, 0)
+
+    self.assertEquals(line_reader.ReadLine(maximum_size=6), b'second')
+    self.assertEquals(line_reader.line_offset, 12)
+    self.assertEquals(line_reader.ReadLine(), b' line\n')
+    self.assertEquals(line_reader.line_offset, 18)
+
+    self.assertEquals(line_reader.ReadLine(), b'\n')
+    self.assertEquals(line_reader.ReadLine(), b'last line')
+    self.assertEquals(line_reader.line_offset, 25)
+    self.assertEquals(line_reader.offset, 34)
+
+    self.assertEquals(line_reader.ReadLine(), b'')
+
+  def testReadLineWithEncoding(self):
+    """Tests the ReadLine function with an encoding."""
+    file_object = io.BytesIO(
+        b'\xef\xbb\xbfcaf\xc3\xa9\nbad \xff\nlast\n')
+    line_reader = text_parser.BufferedLineReader(
+        file_object, encoding='utf-8-sig')
+
+    self.assertEquals(line_reader.ReadLine(), u'caf\xe9\n')
+
+    # A line that cannot be decoded is returned as a binary string.
+    line = line_reader.ReadLine()
+    self.assertEquals(line, b'bad \xff\n')
+    self.assertFalse(isinstance(line, unicode))
+
+    self.assertEquals(line_reader.ReadLine(), u'last\n')
+    self.assertEquals(line_reader.line_offset, 15)
+    self.assertEquals(line_reader.ReadLine(), b'')
+
+    # The end-of-line is split between blocks.
+    file_object = io.BytesIO(u'ab\ncd'.encode('utf-16-le'))
+    line_reader = text_parser.BufferedLineReader(
+        file_object, block_size=3, encoding='utf-16-le')
+
+    self.assertEquals(line_reader.ReadLine(), u'ab\n')
+    self.assertEquals(line_reader.ReadLine(), u'cd')
+    self.assertEquals(line_reader.ReadLine(), b'')
+
+  def testReadLineWithoutEndOfLine(self):
+    """Tests the ReadLine function on data without an end-of-line."""
+    file_object = io.BytesIO(b'\x00' * 64 * 1024 * 1024)
+    line_reader = text_parser.BufferedLineReader(file_object)
+
+    line = line_reader.ReadLine(maximum_size=400)
+    self.assertEquals(line, b'\x00' * 400)
+    self.assertLessEqual(
+        file_object.tell(), text_parser.BufferedLineReader.DEFAULT_BLOCK_SIZE)
+
+    self.assertEquals(line_reader.ReadLine(maximum_size=400), b'\x00' * 400)
+    self.assertEquals(line_reader.offset, 800)
+
+
+class EncodedTextReaderTest(unittest.TestCase):
+  """Tests for the encoded text reader object."""
+
+  def testReadLine(self):
+    """Tests the ReadLine function."""
+    file_object = io.BytesIO(b'first line\r\nsecond line\r\nlast line\r')
+    text_reader = text_parser.EncodedTextReader(buffer_size=16)
+
+    self.assertEquals(text_reader.ReadLine(file_object), b'first line')
+    self.assertEquals(text_reader.ReadLine(file_object), b'second line')
+    self.assertEquals(text_reader.ReadLine(file_object), b'last line')
+    self.assertEquals(text_reader.ReadLine(file_object), b'')
+
+  def testReadLineWithEncoding(self):
+    """Tests the ReadLine function with an encoding."""
+    file_object = io.BytesIO(
+        u'first\r\n'.encode('utf-16-le') + b'\x00\xd8\r\x00\n\x00' +
+        u'last\r'.encode('utf-16-le'))
+    text_reader = text_parser.EncodedTextReader(encoding='utf-16-le')
+
+    # pylint: disable=protected-access
+    self.assertEquals(text_reader._ReadLine(file_object), u'first\n')
+
+    # A line that cannot be decoded is returned as the original raw string
+    # of which the encoded carriage return is stripped.
+    line = text_reader._ReadLine(file_object)
+    self.assertEquals(line, b'\x00\xd8\n\x00')
+    self.assertFalse(isinstance(line, unicode))
+
+    self.assertEquals(text_reader._ReadLine(file_object), u'last')
+
+  def testReadLineWithoutEndOfLine(self):
+    """Tests the ReadLine function on data without an end-of-line."""
+    file_object = io.BytesIO(b'\x00' * 64 * 1024 * 1024)
+    text_reader = text_parser.EncodedTextReader()
+
+    line = text_reader.ReadLine(file_object)
+    self.assertEquals(line[:4], b'\x00' * 4)
+    self.assertLessEqual(file_object.tell(), 2048)
+
+
+class PyparsingSingleLineTextParserTest(test_lib.ParserTestCase):
+  """Tests for the single line text parser."""
+
+  def testParseLine(self):
+    """Tests the _ParseLine function."""
+    parser_object = TestPyparsingSingleLineTextParser()
+
+    # pylint: disable=protected-access
+    key, parsed_structure = parser_object._ParseLine(
+        '2014-02-23 13:56:01')
+    self.assertEquals(key, 'logline')
+    self.assertEquals(len(parsed_structure), 2)
+
+    key, parsed_structure = parser_object._ParseLine('# A comment.')
+    self.assertEquals(key, 'comment')
+
+    # A line that does not match the pattern of the log line structure.
+    key, parsed_structure = parser_object._ParseLine('23-02-2014 13:56:01')
+    self.assertEquals(key, None)
+    self.assertEquals(parsed_structure, None)
+
+
 if __name__ == '__main__':
   unittest.main()
@@ -134,6 +134,15 @@ class WinEvtParser(interface.BaseParser):
       parser_context.ProduceEvent(
           event_object, parser_chain=parser_chain, file_entry=file_entry)
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature('LfLe', offset=4)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a Windows EventLog (EVT) file.
 
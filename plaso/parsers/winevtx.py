@@ -107,6 +107,15 @@ class WinEvtxParser(interface.BaseParser):
   NAME = 'winevtx'
   DESCRIPTION = u'Parser for Windows XML EventLog (EVTX) files.'
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature('ElfFile\x00', offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a Windows XML EventLog (EVTX) file.
 
@@ -73,6 +73,11 @@ class WinFirewallParser(text_parser.PyparsingSingleLineTextParser):
       ('logline', LOG_LINE),
   ]
 
+  LINE_STRUCTURE_PATTERNS = {
+      'comment': r'\s*#',
+      'logline': r'\s*\d{4}\s*-\s*\d{2}\s*-\s*\d{2}',
+  }
+
   DATA_TYPE = 'windows:firewall:log_entry'
 
   def __init__(self):
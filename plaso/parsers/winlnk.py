@@ -73,6 +73,18 @@ class WinLnkParser(interface.BaseParser):
   NAME = 'lnk'
   DESCRIPTION = u'Parser for Windows Shortcut (LNK) files.'
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [
+        interface.FormatSignature(
+            '\x4c\x00\x00\x00\x01\x14\x02\x00\x00\x00\x00\x00\xc0\x00'
+            '\x00\x00\x00\x00\x00\x46', offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a Windows Shortcut (LNK) file.
 
@@ -377,6 +377,15 @@ class WinPrefetchParser(interface.BaseParser):
 
     return device_path
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature(cls.FILE_SIGNATURE, offset=4)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extracts events from a Windows Prefetch file.
 
@@ -234,6 +234,15 @@ class WinRegistryParser(interface.BasePluginsParser):
       plugins_list.AddPlugin(plugin_class.REG_TYPE, plugin_class)
     return plugins_list
 
+  @classmethod
+  def GetFormatSignatures(cls):
+    """Retrieves the format signatures of the parser.
+
+    Returns:
+      A list of format signatures (instances of FormatSignature).
+    """
+    return [interface.FormatSignature('regf', offset=0)]
+
   def Parse(self, parser_context, file_entry, parser_chain=None):
     """Extract data from a Windows Registry file.
 
@@ -143,6 +143,12 @@ class XChatLogParser(text_parser.PyparsingSingleLineTextParser):
       ('header_signature', HEADER_SIGNATURE),
   ]
 
+  LINE_STRUCTURE_PATTERNS = {
+      'logline': r'\s*\S{3}\s+\d',
+      'header': r'\s*\*{4}',
+      'header_signature': r'\s*\*{4}',
+  }
+
   def __init__(self):
     """Initializes a XChatLog parser object."""
     super(XChatLogParser, self).__init__()
@@ -518,6 +518,166 @@ class ProtobufEventObjectSerializer(interface.EventObjectSerializer):
       logging.error(u'Unable to serialize event object.')
 
 
+class ProtobufLazyEventObject(event.EventObject):
+  """Class that implements an event object that is decoded on demand.
+
+  The cheap scalar values of the protobuf are set when the event object
+  is created. The other attribute values, such as the path specification,
+  the tag, dictionaries, lists and the values stored in the protobuf
+  attributes field, are only decoded when the attribute is first accessed.
+  """
+
+  def __init__(self):
+    """Initializes the lazy event object."""
+    super(ProtobufLazyEventObject, self).__init__()
+    # Dictionary containing the attribute name as key and a tuple of
+    # the decode function and the protobuf value as the value.
+    self._lazy_attributes = {}
+
+  def __delattr__(self, attribute_name):
+    """Deletes an attribute."""
+    lazy_attributes = self.__dict__.get('_lazy_attributes', {})
+    if attribute_name in lazy_attributes:
+      del lazy_attributes[attribute_name]
+      if attribute_name not in self.__dict__:
+        return
+
+    super(ProtobufLazyEventObject, self).__delattr__(attribute_name)
+
+  def __getattr__(self, attribute_name):
+    """Decodes the value of an attribute that was not accessed before.
+
+    Args:
+      attribute_name: the name of the attribute.
+
+    Returns:
+      The decoded attribute value.
+
+    Raises:
+      AttributeError: if the attribute is not defined.
+    """
+    lazy_attributes = self.__dict__.get('_lazy_attributes', {})
+    if attribute_name not in lazy_attributes:
+      raise AttributeError(attribute_name)
+
+    decode_function, proto_value = lazy_attributes.pop(attribute_name)
+    attribute_value = decode_function(proto_value)
+    self.__dict__[attribute_name] = attribute_value
+    return attribute_value
+
+  def __getstate__(self):
+    """Returns the state of the event object with all attributes decoded."""
+    for attribute_name in list(self._lazy_attributes.keys()):
+      getattr(self, attribute_name)
+
+    state = dict(self.__dict__)
+    del state['_lazy_attributes']
+    return state
+
+  def __setstate__(self, state):
+    """Restores the state of the event object."""
+    self.__dict__.update(state)
+    self.__dict__['_lazy_attributes'] = {}
+
+  def GetAttributes(self):
+    """Return a list of all defined attributes."""
+    attributes = set(self.__dict__.keys())
+    attributes.discard('_lazy_attributes')
+    attributes.update(self._lazy_attributes.keys())
+    return attributes
+
+  def SetLazyAttribute(self, attribute_name, decode_function, proto_value):
+    """Sets an attribute that is decoded when it is first accessed.
+
+    Args:
+      attribute_name: the name of the attribute.
+      decode_function: the function that decodes the protobuf value.
+      proto_value: the protobuf value.
+    """
+    self.__dict__.pop(attribute_name, None)
+    self._lazy_attributes[attribute_name] = (decode_function, proto_value)
+
+
+class ProtobufLazyEventObjectSerializer(ProtobufEventObjectSerializer):
+  """Class that implements the protobuf lazy event object serializer.
+
+  The event objects read by this serializer only decode attribute values
+  when they are accessed, see ProtobufLazyEventObject.
+  """
+
+  @classmethod
+  def _ReadSerializedAttributeValue(cls, proto_attribute):
+    """Reads the value of a protobuf attribute.
+
+    Args:
+      proto_attribute: a protobuf attribute object containing the serialized
+                       form.
+
+    Returns:
+      The attribute value.
+    """
+    _, attribute_value = ProtobufEventAttributeSerializer.ReadSerializedObject(
+        proto_attribute)
+    return attribute_value
+
+  @classmethod
+  def ReadSerializedObject(cls, proto):
+    """Reads an event object from serialized form.
+
+    Args:
+      proto: a protobuf object containing the serialized form (instance of
+             plaso_storage_pb2.EventObject).
+
+    Returns:
+      An event object (instance of ProtobufLazyEventObject).
+    """
+    event_object = ProtobufLazyEventObject()
+    event_object.data_type = proto.data_type
+
+    for proto_attribute, value in proto.ListFields():
+      if proto_attribute.name == 'source_short':
+        event_object.source_short = cls._SOURCE_SHORT_FROM_PROTO_MAP[value]
+
+      elif proto_attribute.name == 'pathspec':
+        event_object.SetLazyAttribute(
+            'pathspec', cls._path_spec_serializer.ReadSerialized, value)
+
+      elif proto_attribute.name == 'tag':
+        event_object.SetLazyAttribute(
+            'tag', ProtobufEventTagSerializer.ReadSerializedObject, value)
+
+      elif proto_attribute.name == 'attributes':
+        continue
+
+      elif isinstance(value, message.Message):
+        if value.DESCRIPTOR.full_name.endswith('.Dict'):
+          decode_function = (
+              ProtobufEventAttributeSerializer.ReadSerializedDictObject)
+        elif value.DESCRIPTOR.full_name.endswith('.Array'):
+          decode_function = (
+              ProtobufEventAttributeSerializer.ReadSerializedListObject)
+        else:
+          decode_function = cls._ReadSerializedAttributeValue
+
+        event_object.SetLazyAttribute(
+            proto_attribute.name, decode_function, value)
+
+      else:
+        setattr(event_object, proto_attribute.name, value)
+
+    # The plaso_storage_pb2.EventObject protobuf contains a field named
+    # attributes which technically not a Dict but behaves similar.
+    for proto_attribute in proto.attributes:
+      attribute_name = u''
+      if proto_attribute.HasField('key'):
+        attribute_name = proto_attribute.key
+
+      event_object.SetLazyAttribute(
+          attribute_name, cls._ReadSerializedAttributeValue, proto_attribute)
+
+    return event_object
+
+
 class ProtobufEventTagSerializer(interface.EventTagSerializer):
   """Class that implements the protobuf event tag serializer."""
 
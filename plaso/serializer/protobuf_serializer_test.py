@@ -145,6 +145,42 @@ class ProtobufEventObjectSerializerTest(unittest.TestCase):
     self.assertFalse(hasattr(event_object, 'null_value'))
 
 
+class ProtobufLazyEventObjectSerializerTest(ProtobufEventObjectSerializerTest):
+  """Tests for the protobuf lazy event object serializer object."""
+
+  def testReadSerialized(self):
+    """Test the read serialized functionality."""
+    serializer = protobuf_serializer.ProtobufLazyEventObjectSerializer
+    event_object = serializer.ReadSerialized(self._proto_string)
+
+    expected_attributes = set([
+        'a_tuple', 'data_type', 'integer', 'my_dict', 'my_list', 'string',
+        'timestamp', 'timestamp_desc', 'unicode_string', 'uuid',
+        'zero_integer'])
+    self.assertEquals(event_object.GetAttributes(), expected_attributes)
+
+    # Values stored in the attributes field are decoded on first access.
+    self.assertFalse('integer' in event_object.__dict__)
+    self.assertEquals(event_object.integer, 34)
+    self.assertTrue('integer' in event_object.__dict__)
+
+    self.assertEquals(event_object.my_dict['list'], [u'sf', 234])
+    self.assertEquals(len(event_object.a_tuple), 4)
+    self.assertFalse(hasattr(event_object, 'empty_string'))
+
+    serializer = protobuf_serializer.ProtobufEventObjectSerializer
+    expected_event_object = serializer.ReadSerialized(self._proto_string)
+
+    self.assertEquals(
+        event_object.GetValues(), expected_event_object.GetValues())
+    self.assertEquals(
+        event_object.EqualityString(), expected_event_object.EqualityString())
+
+    del event_object.my_list
+    self.assertFalse(hasattr(event_object, 'my_list'))
+    self.assertFalse('my_list' in event_object.GetAttributes())
+
+
 class ProtobufEventTagSerializerTest(unittest.TestCase):
   """Tests for the protobuf event tag serializer object."""
 
@@ -0,0 +1,184 @@
+#!/usr/bin/python
+# -*- coding: utf-8 -*-
+#
+# Copyright 2014 The Plaso Project Authors.
+# Please see the AUTHORS file for details on individual authors.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#    http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""A simple tool that benchmarks a single line text parser.
+
+The tool parses one or more text files with a single parser, once with the
+regular expression fast path enabled and once with it disabled, and prints
+the throughput of both runs.
+"""
+
+import argparse
+import logging
+import os
+import sys
+import time
+
+from dfvfs.lib import definitions as dfvfs_definitions
+from dfvfs.path import factory as path_spec_factory
+from dfvfs.resolver import resolver as path_spec_resolver
+
+from plaso import parsers   # pylint: disable=unused-import
+from plaso.artifacts import knowledge_base
+from plaso.engine import queue
+from plaso.engine import single_process
+from plaso.lib import errors
+from plaso.parsers import context
+from plaso.parsers import manager as parsers_manager
+from plaso.parsers import text_parser
+
+
+class EventObjectCountingQueueConsumer(queue.EventObjectQueueConsumer):
+  """Class that implements an event object queue consumer that counts."""
+
+  def __init__(self, event_queue):
+    """Initializes the event object queue consumer.
+
+    Args:
+      event_queue: the event object queue (instance of Queue).
+    """
+    super(EventObjectCountingQueueConsumer, self).__init__(event_queue)
+    self.number_of_event_objects = 0
+
+  def _ConsumeEventObject(self, unused_event_object, **unused_kwargs):
+    """Consumes an event object callback for ConsumeEventObjects."""
+    self.number_of_event_objects += 1
+
+
+def ParseFiles(parser_object, paths):
+  """Parses files with a parser object.
+
+  Args:
+    parser_object: the parser object (instance of
+                   PyparsingSingleLineTextParser).
+    paths: a list of paths of the files to parse.
+
+  Returns:
+    A tuple containing the number of seconds it took to parse the files,
+    the number of lines and the number of event objects.
+  """
+  event_queue = single_process.SingleProcessQueue()
+  event_queue_consumer = EventObjectCountingQueueConsumer(event_queue)
+  parse_error_queue = single_process.SingleProcessQueue()
+
+  parser_context = context.ParserContext(
+      queue.ItemQueueProducer(event_queue),
+      queue.ItemQueueProducer(parse_error_queue),
+      knowledge_base.KnowledgeBase())
+
+  number_of_lines = 0
+  elapsed_time = 0.0
+  for path in paths:
+    with open(path, 'rb') as file_object:
+      number_of_lines += sum(1 for _ in file_object)
+
+    path_spec = path_spec_factory.Factory.NewPathSpec(
+        dfvfs_definitions.TYPE_INDICATOR_OS, location=path)
+    file_entry = path_spec_resolver.Resolver.OpenFileEntry(path_spec)
+
+    start_time = time.time()
+    try:
+      parser_object.Parse(parser_context, file_entry)
+    except errors.UnableToParseFile as exception:
+      logging.warning(u'Unable to parse file: {0:s} with error: {1:s}'.format(
+          path, exception))
+    elapsed_time += time.time() - start_time
+
+    # Drain the queue so the event objects do not accumulate in memory.
+    event_queue_consumer.ConsumeEventObjects()
+
+  return (
+      elapsed_time, number_of_lines,
+      event_queue_consumer.number_of_event_objects)
+
+
+def PrintResults(description, elapsed_time, number_of_lines, data_size):
+  """Prints the throughput of a benchmark run.
+
+  Args:
+    description: the description of the run.
+    elapsed_time: the number of seconds the run took.
+    number_of_lines: the number of lines that were parsed.
+    data_size: the number of bytes that were parsed.
+  """
+  if elapsed_time <= 0.0:
+    elapsed_time = 0.000001
+
+  print u'{0:s}: {1:.3f} seconds, {2:.1f} lines/sec, {3:.3f} MiB/sec'.format(
+      description, elapsed_time, number_of_lines / elapsed_time,
+      data_size / (1024.0 * 1024.0 * elapsed_time))
+
+
+def Main():
+  """Start the tool."""
+  arg_parser = argparse.ArgumentParser(description=(
+      u'Benchmarks a single line text parser with and without the regular '
+      u'expression fast path.'))
+
+  arg_parser.add_argument(
+      'parser_name', metavar='PARSER_NAME', action='store', type=unicode,
+      help=u'The name of the single line text parser, e.g. "winfirewall".')
+
+  arg_parser.add_argument(
+      'paths', metavar='PATH', action='store', nargs='+',
+      help=u'The path of a text file to parse.')
+
+  options = arg_parser.parse_args()
+
+  parser_objects = parsers_manager.ParsersManager.GetParserObjects(
+      parser_filter_string=options.parser_name)
+  parser_objects = [
+      parser_object for parser_object in parser_objects
+      if parser_object.NAME == options.parser_name]
+
+  if not parser_objects:
+    print u'No such parser: {0:s}'.format(options.parser_name)
+    return False
+
+  parser_object = parser_objects[0]
+  if not isinstance(
+      parser_object, text_parser.PyparsingSingleLineTextParser):
+    print u'Not a single line text parser: {0:s}'.format(options.parser_name)
+    return False
+
+  data_size = sum(os.path.getsize(path) for path in options.paths)
+
+  elapsed_time, number_of_lines, number_of_event_objects = ParseFiles(
+      parser_object, options.paths)
+  PrintResults(u'Fast path', elapsed_time, number_of_lines, data_size)
+
+  parser_object.use_fast_path = False
+  elapsed_time, number_of_lines, slow_number_of_event_objects = ParseFiles(
+      parser_object, options.paths)
+  PrintResults(u'Without fast path', elapsed_time, number_of_lines, data_size)
+
+  if number_of_event_objects != slow_number_of_event_objects:
+    print (
+        u'WARNING: number of event objects differs: {0:d} with and {1:d} '
+        u'without the fast path.').format(
+            number_of_event_objects, slow_number_of_event_objects)
+    return False
+
+  print u'Number of event objects: {0:d}'.format(number_of_event_objects)
+  return True
+
+
+if __name__ == '__main__':
+  if not Main():
+    sys.exit(1)
+  else:
+    sys.exit(0)